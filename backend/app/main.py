@@ -1,9 +1,76 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import wait
+from contextlib import asynccontextmanager
+from typing import List
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
-from app.scoring.pipeline_v2 import evaluate_transcript_v2
+from app.models import BatchEvaluationResponse, BatchItemResult
+from app.scoring.pipeline_v2 import (
+    evaluate_transcript_v2_async, evaluate_batch_v2, BATCH_WORKERS, ENABLE_SEMANTIC, PIPELINE_VERSION,
+    validation_error
+)
+from app.scoring.registry import parse_metrics
+from app.scoring.result_cache import cache_key, cacheable, get_result_cache
+from app.scoring.history import HISTORY_MAX_PAGE, decode_cursor, get_history_store, stream_page
+from app.scoring.analytics import countable, get_cohort_store
+from app.scoring.compact import (
+    COMPACT_MEDIA_TYPE, COMPRESS_MIN_BYTES, DEFAULT_FIELDS, dumps, encode_body, get_schema, parse_fields,
+    select_fields, to_compact, wants_compact
+)
+from app.scoring.rubric_loader import get_rubric_registry
+from app.scoring.executors import AdmissionLimiter, RETRY_AFTER_SECONDS
+from app.scoring.workers import SCORING_WORKERS, WORKER_JOB_TIMEOUT, get_worker_pool
+from app.scoring.grammar import get_grammar_pool, grammar_cache_stats
+from app.scoring.warmup import scoring_engines
+from app.scoring.live import LiveSession
+from app.scoring.telemetry import (
+    CONTENT_TYPE, EVALUATIONS, HTTP_REQUESTS, HTTP_SECONDS, REGISTRY, StatsGauges, observe_evaluation
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm every engine in parallel in the background; /api/v2/ready reports progress
+    app.state.warmup = scoring_engines(ENABLE_SEMANTIC, SCORING_WORKERS)
+    app.state.warmup.start()
+    get_rubric_registry().start()
+    if get_cohort_store() and get_history_store():
+        # Rebuild cohort analytics from stored evaluations; new ones are added as they happen
+        threading.Thread(target=get_cohort_store().hydrate, args=(get_history_store(), time.time()),
+                         name="analytics-hydrate", daemon=True).start()
+    yield
+    get_rubric_registry().stop()
+    if SCORING_WORKERS > 0:
+        get_worker_pool().close()
+    get_grammar_pool().close()
+    if get_history_store():
+        get_history_store().close()  # writes rows still queued
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+admission = AdmissionLimiter()
 
-app = FastAPI(title="Communication Scoring API", version="2.1.0")
+# Engine pool gauges, read from each component's stats() at scrape time
+REGISTRY.register(StatsGauges("scoring_grammar_pool", "LanguageTool pool", lambda: get_grammar_pool().stats()))
+REGISTRY.register(StatsGauges("scoring_grammar_cache", "Sentence grammar cache", grammar_cache_stats))
+REGISTRY.register(StatsGauges("scoring_admission", "Admission limiter", admission.stats))
+REGISTRY.register(StatsGauges("scoring_result_cache", "Result cache",
+                              lambda: get_result_cache().stats() if get_result_cache() else None))
+REGISTRY.register(StatsGauges("scoring_history", "Evaluation history writer",
+                              lambda: get_history_store().stats() if get_history_store() else None))
+REGISTRY.register(StatsGauges("scoring_analytics", "Cohort analytics store",
+                              lambda: get_cohort_store().stats() if get_cohort_store() else None))
+if SCORING_WORKERS > 0:
+    REGISTRY.register(StatsGauges("scoring_workers", "Scoring worker pool", lambda: get_worker_pool().stats()))
+if ENABLE_SEMANTIC:
+    from app.scoring.semantic import embedding_cache_stats
+    REGISTRY.register(StatsGauges("scoring_embedding_cache", "Transcript embedding cache", embedding_cache_stats))
+
+app = FastAPI(title="Communication Scoring API", version="2.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,20 +80,370 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw path, keeps label cardinality bounded
+    route = request.scope.get("route")
+    path = route.path if route else "unmatched"
+    HTTP_REQUESTS.inc(method=request.method, route=path, status=str(response.status_code))
+    HTTP_SECONDS.observe(time.perf_counter() - start, route=path)
+    return response
+
 class EvalRequest(BaseModel):
     transcript: str
     duration_seconds: float | None = None
+    # Latency budget for the heavy metrics; defaults to SCORING_DEADLINE_MS
+    deadline_ms: float | None = Field(default=None, gt=0)
+    # History labels; default to the name / class extracted from the transcript
+    student: str | None = None
+    school_class: str | None = None
+
+class ScoreRequest(BaseModel):
+    transcript: str
+
+class EvalBatchRequest(BaseModel):
+    items: List[EvalRequest]
+
+def record_evaluation(result, txt: str, req: EvalRequest, cached: bool = False) -> None:
+    """Queue the evaluation for the history store (never blocks) and add fresh ones to cohort analytics."""
+    store = get_history_store()
+    if store:
+        store.record(result, txt, req.student, req.school_class, cached)
+    cohort = get_cohort_store()
+    # A cache hit is a resubmission, not a new evaluation; counting it would inflate the cohort
+    if cohort and not cached and countable(result):
+        cohort.add(result, req.student, req.school_class)
+
+def with_timings(result, timings: bool):
+    """Per-stage timings are returned only when requested (?timings=true)."""
+    return result if timings or result.timings is None else result.model_copy(update={"timings": None})
+
+def metric_selection(metrics: str | None = Query(None, description="Comma-separated metric ids; default all")):
+    """?metrics=clarity,vocabulary -> sorted metric ids (None = every metric); 400 on unknown ids."""
+    try:
+        return parse_metrics(metrics)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+class OutputOptions:
+    """Response format (?format=json|compact or Accept), ?fields= selection and ?timings=."""
+
+    def __init__(self, request: Request, format: str | None = Query(None, pattern="^(json|compact)$"),
+                 fields: str | None = None, timings: bool = False):
+        self.compact = wants_compact(format, request.headers.get("accept"))
+        try:
+            self.fields = parse_fields(fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        self.timings = timings
+        self.accept_encoding = request.headers.get("accept-encoding")
+
+    def render(self, result) -> dict:
+        if self.compact:
+            fields = self.fields
+            if self.timings:
+                fields = (fields or DEFAULT_FIELDS) | {"timings"}
+            return to_compact(result, fields)
+        return select_fields(with_timings(result, self.timings), self.fields)
+
+    def response(self, payload) -> Response:
+        # Fast encoder plus gzip / zstd negotiation instead of FastAPI's default JSON encoding
+        return self._response(*encode_body(dumps(payload), self.accept_encoding))
+
+    async def response_async(self, payload) -> Response:
+        """response() for async handlers: large bodies are compressed off the event loop."""
+        body = dumps(payload)
+        if len(body) < COMPRESS_MIN_BYTES:
+            return self._response(body, None)
+        return self._response(*await asyncio.to_thread(encode_body, body, self.accept_encoding))
+
+    def _response(self, body: bytes, encoding: str | None) -> Response:
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type=COMPACT_MEDIA_TYPE if self.compact else "application/json",
+                        headers=headers)
 
 @app.get("/api/v2/health")
 def health():
-    return {"status": "ok", "version": "2.1.0"}
+    return {
+        "status": "ok",
+        "version": "2.1.0",
+        "grammar_pool": get_grammar_pool().stats(),
+        "grammar_cache": grammar_cache_stats(),
+        "admission": admission.stats(),
+        "workers": get_worker_pool().stats() if SCORING_WORKERS > 0 else None,
+        "result_cache": get_result_cache().stats() if get_result_cache() else None,
+        "rubric": get_rubric_registry().stats(),
+        "history": get_history_store().stats() if get_history_store() else None,
+        "analytics": get_cohort_store().stats() if get_cohort_store() else None,
+    }
+
+@app.get("/api/v2/ready")
+def ready(request: Request):
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None:
+        return JSONResponse(status_code=503, content={"ready": False, "engines": {}})
+    report = warmup.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/v2/schema/compact")
+def compact_schema(request: Request):
+    """Decoding table for compact responses; changes only when schema_version does."""
+    schema = get_schema()
+    headers = {"ETag": f'"{schema["schema_version"]}"', "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(dumps(schema), media_type="application/json", headers=headers)
 
 @app.post("/api/v2/evaluate")
-def evaluate(req: EvalRequest):
+async def evaluate(req: EvalRequest, out: OutputOptions = Depends(), selected=Depends(metric_selection)):
+    txt = req.transcript.strip()
+    error = validation_error(txt)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    cache = get_result_cache()
+    key = cache_key(txt, req.duration_seconds, PIPELINE_VERSION, ENABLE_SEMANTIC, selected)
+    if cache:
+        # Off the event loop: the sqlite backend does disk I/O
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            EVALUATIONS.inc(source="cache")
+            record_evaluation(cached, txt, req, cached=True)
+            return await out.response_async(out.render(cached))
+    # Shed load instead of queueing without bound
+    if not admission.try_acquire():
+        raise HTTPException(status_code=503, detail="Server at capacity; retry shortly.",
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    try:
+        if SCORING_WORKERS > 0:
+            future = get_worker_pool().submit(txt, req.duration_seconds, req.deadline_ms, selected)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), WORKER_JOB_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="Scoring worker did not respond in time.")
+        else:
+            result = await evaluate_transcript_v2_async(txt, req.duration_seconds, req.deadline_ms, selected)
+    finally:
+        admission.release()
+    observe_evaluation(result)
+    record_evaluation(result, txt, req)
+    if cache and cacheable(result):
+        await asyncio.to_thread(cache.put, key, result)
+    return await out.response_async(out.render(result))
+
+def valid_duration(value) -> bool:
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value) and value >= 0)
+
+@app.websocket("/api/v2/live")
+async def live(websocket: WebSocket):
+    """
+    Incremental scoring for in-progress speech. Client messages:
+    {"text": "<appended fragment>", "duration_seconds": <elapsed>, "final": false}.
+    Each message gets an "update" with the running metrics; a final message
+    also gets a "final" message with the full evaluation, then the socket closes.
+    When the server is at capacity the socket is closed with 1013 (try again later).
+    """
+    await websocket.accept()
+    # One admission slot per session: its updates and final evaluation all run on the shared executors
+    if not admission.try_acquire():
+        await websocket.close(code=1013, reason="Server at capacity; retry shortly.")
+        return
+    session = LiveSession()
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                message = None
+            if not isinstance(message, dict) or not isinstance(message.get("text", ""), str):
+                await websocket.send_json({"type": "error", "detail": "Expected a JSON object with a string 'text'."})
+                continue
+            fragment = message.get("text", "")
+            duration = message.get("duration_seconds")
+            if duration is not None and not valid_duration(duration):
+                await websocket.send_json({"type": "error",
+                                           "detail": "duration_seconds must be a non-negative number."})
+                continue
+            final = bool(message.get("final"))
+            try:
+                await websocket.send_json(await session.update(fragment, duration, final))
+            except ValueError as exc:
+                await websocket.send_json({"type": "error", "detail": str(exc)})
+                await websocket.close(code=1009)
+                return
+            if final:
+                txt = session.text.strip()
+                error = validation_error(txt)
+                if error:
+                    await websocket.send_json({"type": "error", "detail": error})
+                else:
+                    result = await evaluate_transcript_v2_async(txt, duration)
+                    await websocket.send_json({"type": "final", "result": result.model_dump(mode="json")})
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        admission.release()
+
+def score_uncached(valid: list, selected) -> list:
+    """Outcomes (EvaluationResponse or Exception) for (index, transcript, duration, deadline) items."""
+    if not valid:
+        return []
+    if SCORING_WORKERS > 0:
+        futures = [get_worker_pool().submit(txt, duration, deadline, selected) for _, txt, duration, deadline in valid]
+        # Bounded: a job lost with its worker must not pin this thread
+        done, _ = wait(futures, timeout=WORKER_JOB_TIMEOUT)
+        return [(f.exception() or f.result()) if f in done
+                else TimeoutError(f"no result within {WORKER_JOB_TIMEOUT:g} s") for f in futures]
+    return evaluate_batch_v2([(txt, duration, deadline) for _, txt, duration, deadline in valid], metrics=selected)
+
+# The handler returns an encoded Response, so both formats are documented here rather than validated
+BATCH_RESPONSES = {200: {
+    "model": BatchEvaluationResponse,
+    "description": "JSON by default; the compact format with ?format=compact or its Accept type.",
+    "content": {COMPACT_MEDIA_TYPE: {"schema": {
+        "type": "object",
+        "description": "Compact batch; decode results with /api/v2/schema/compact.",
+        "properties": {
+            "sv": {"type": "string", "description": "Compact schema_version"},
+            "r": {"type": "array", "description": "Compact result, or {\"e\": error}, per item in order",
+                  "items": {"type": "object"}},
+            "ok": {"type": "integer", "description": "Items that succeeded"},
+            "fail": {"type": "integer", "description": "Items that failed"},
+            "ms": {"type": "integer", "description": "Batch time in milliseconds"},
+        },
+        "required": ["sv", "r", "ok", "fail", "ms"],
+    }}},
+}}
+
+@app.post("/api/v2/evaluate/batch", responses=BATCH_RESPONSES)
+def evaluate_batch(req: EvalBatchRequest, out: OutputOptions = Depends(), selected=Depends(metric_selection)):
+    if not req.items:
+        raise HTTPException(status_code=400, detail="Batch is empty.")
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items).")
+    start = time.perf_counter()
+    cache = get_result_cache()
+    results = [BatchItemResult(index=i) for i in range(len(req.items))]
+    valid = []
+    for i, item in enumerate(req.items):
+        txt = item.transcript.strip()
+        error = validation_error(txt)
+        if error:
+            results[i].error = error
+            continue
+        key = cache_key(txt, item.duration_seconds, PIPELINE_VERSION, ENABLE_SEMANTIC, selected)
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            EVALUATIONS.inc(source="cache")
+            record_evaluation(cached, txt, item, cached=True)
+            results[i].result = cached
+        else:
+            valid.append((i, txt, item.duration_seconds, item.deadline_ms))
+    # A batch holds one admission slot per evaluation it runs at once (capped so it fits when idle)
+    weight = min(len(valid), SCORING_WORKERS if SCORING_WORKERS > 0 else BATCH_WORKERS, admission.limit)
+    if weight and not admission.try_acquire(weight):
+        raise HTTPException(status_code=503, detail="Server at capacity; retry shortly.",
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    try:
+        outcomes = score_uncached(valid, selected)
+    finally:
+        if weight:
+            admission.release(weight)
+    for (i, txt, duration, _), outcome in zip(valid, outcomes):
+        if isinstance(outcome, Exception):
+            results[i].error = f"Evaluation failed: {outcome}"
+        else:
+            observe_evaluation(outcome)
+            record_evaluation(outcome, txt, req.items[i])
+            results[i].result = outcome
+            if cache and cacheable(outcome):
+                cache.put(cache_key(txt, duration, PIPELINE_VERSION, ENABLE_SEMANTIC, selected), outcome)
+    failed = sum(1 for r in results if r.error)
+    performance_ms = int((time.perf_counter() - start) * 1000)
+    if out.compact:
+        return out.response({
+            "sv": get_schema()["schema_version"],
+            "r": [out.render(r.result) if r.result else {"e": r.error} for r in results],
+            "ok": len(results) - failed, "fail": failed, "ms": performance_ms,
+        })
+    return out.response({
+        "results": [{"index": r.index, "result": out.render(r.result) if r.result else None, "error": r.error}
+                    for r in results],
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "performance_ms": performance_ms,
+    })
+
+def history_store():
+    store = get_history_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Evaluation history is disabled (HISTORY_BACKEND=none).")
+    return store
+
+@app.get("/api/v2/history")
+def history(student: str | None = None, school_class: str | None = None,
+            transcript_hash: str | None = None, since: float | None = None, until: float | None = None,
+            cursor: str | None = None, limit: int = Query(100, ge=1, le=HISTORY_MAX_PAGE), full: bool = False):
+    """
+    Newest-first evaluations, streamed. since / until are Unix timestamps;
+    pass next_cursor back as cursor for the next page. full=true includes
+    each stored EvaluationResponse.
+    """
+    store = history_store()
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+    rows = store.query(student, school_class, transcript_hash, since, until, cursor, limit, full)
+    return StreamingResponse(stream_page(rows, limit, full), media_type="application/json")
+
+@app.get("/api/v2/history/{evaluation_id}")
+def history_item(evaluation_id: int):
+    result = history_store().get(evaluation_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found.")
+    return Response(content=result, media_type="application/json")
+
+def cohort_store():
+    store = get_cohort_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Analytics are disabled (ANALYTICS_ENABLED=false).")
+    return store
+
+@app.get("/api/v2/analytics/cohort")
+def analytics_cohort(school_class: str | None = None, student: str | None = None,
+                     since: float | None = None, until: float | None = None, percentiles: str = "25,50,75,90"):
+    """Score distributions, band frequencies and most-missed must-have concepts for a cohort."""
+    try:
+        points = [float(p) for p in percentiles.split(",") if p]
+    except ValueError:
+        points = None
+    if not points or any(not 0 < p <= 100 for p in points):
+        raise HTTPException(status_code=400, detail="percentiles must be comma-separated values in (0, 100].")
+    return cohort_store().cohort(school_class, student, since, until, points)
+
+@app.get("/api/v2/analytics/classes")
+def analytics_classes():
+    return {"classes": cohort_store().classes_overview(), "store": cohort_store().stats()}
+
+@app.post("/api/v1/score")
+def score(req: ScoreRequest):
     txt = req.transcript.strip()
     if not txt:
         raise HTTPException(status_code=400, detail="Transcript is empty.")
-    if len(txt.split()) < 10:
-        raise HTTPException(status_code=400, detail="Transcript too short for meaningful scoring (>=10 words required).")
-    result = evaluate_transcript_v2(txt, req.duration_seconds)
-    return result
\ No newline at end of file
+    # Pin one rubric version for the whole request, even if a reload lands mid-way
+    snapshot = get_rubric_registry().current()
+    result = snapshot.compiled.score(txt)
+    result.rubric_version = snapshot.version
+    return result
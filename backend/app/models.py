@@ -1,6 +1,46 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
+class ScoringConfig(BaseModel):
+    keyword_weight: float = 0.4
+    semantic_weight: float = 0.4
+    length_weight: float = 0.2
+
+class RubricCriterion(BaseModel):
+    id: str
+    name: str
+    description: str
+    keywords: List[str] = []
+    weight: float = 1.0
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    enabled: bool = True
+    scoring_config: ScoringConfig = ScoringConfig()
+
+class Rubric(BaseModel):
+    criteria: List[RubricCriterion]
+
+class CriterionScore(BaseModel):
+    id: str
+    name: str
+    weight: float
+    keyword_score: float
+    semantic_score: float
+    length_score: float
+    combined_score: float
+    weighted_score: float
+    keywords_found: List[str]
+    keywords_missing: List[str]
+    feedback: str
+    alignment_band: str
+
+class ScoreResponse(BaseModel):
+    overall_score: float
+    word_count: int
+    criteria: List[CriterionScore]
+    transcript_preview: str
+    rubric_version: Optional[str] = None
+
 class MetricScore(BaseModel):
     id: str
     name: str
@@ -26,4 +66,18 @@ class EvaluationResponse(BaseModel):
     transcript_preview: str
     version: str = "2.1.0"
     performance_ms: Optional[int] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None  # per-stage milliseconds
+    timed_out: List[str] = []  # heavy metrics that missed the deadline
+    selected_metrics: Optional[List[str]] = None  # ?metrics= subset; None = every registered metric
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
+
+class BatchEvaluationResponse(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+    performance_ms: Optional[int] = None
\ No newline at end of file
@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+from types import MappingProxyType
+from .utils import NON_ALNUM_RE
+
+SENTENCE_RE = re.compile(r'[^.!?]+')
+TOKEN_RE = re.compile(r'\S+')
+
+
+def lower_aligned(text: str) -> str:
+    """text.lower() with one character per input character, so offsets stay valid."""
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    # e.g. "İ".lower() is "i̇" (two code points); keep only the base letter
+    return "".join(c.lower()[0] for c in text)
+
+
+class TranscriptAnalysis:
+    """
+    Immutable per-request view of a transcript.
+    Lowercasing, normalization, tokenization and sentence splitting happen
+    once here; derived results (extraction, concept matches) are memoized
+    through `cached` so metrics never repeat work on the same request.
+    """
+    __slots__ = ("text", "lower", "normalized", "tokens", "token_spans", "token_counts",
+                 "sentence_spans", "_cache")
+
+    def __init__(self, text: str):
+        lower = lower_aligned(text)
+        normalized = NON_ALNUM_RE.sub(' ', lower)
+        # normalization keeps offsets, so token spans index into `text` too
+        matches = list(TOKEN_RE.finditer(normalized))
+        tokens = tuple(m.group() for m in matches)
+        spans = []
+        for m in SENTENCE_RE.finditer(text):
+            seg = m.group()
+            stripped = seg.strip()
+            if stripped:
+                start = m.start() + len(seg) - len(seg.lstrip())
+                spans.append((start, start + len(stripped)))
+        init = object.__setattr__
+        init(self, "text", text)
+        init(self, "lower", lower)
+        init(self, "normalized", normalized)
+        init(self, "tokens", tokens)
+        init(self, "token_spans", tuple(m.span() for m in matches))
+        init(self, "token_counts", MappingProxyType(Counter(tokens)))
+        init(self, "sentence_spans", tuple(spans))
+        init(self, "_cache", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TranscriptAnalysis is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("TranscriptAnalysis is immutable")
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sentences(self) -> list:
+        return [self.text[s:e] for s, e in self.sentence_spans]
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_spans)
+
+    def cached(self, key: str, compute):
+        """Return compute(self), evaluated at most once per analysis."""
+        if key not in self._cache:
+            self._cache[key] = compute(self)
+        return self._cache[key]
+
+
+def analyze(text) -> TranscriptAnalysis:
+    return text if isinstance(text, TranscriptAnalysis) else TranscriptAnalysis(text)
@@ -0,0 +1,322 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+import numpy as np
+from .metrics import MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS
+from .pipeline_v2 import METRICS  # registry with the built-in metrics
+
+# In-memory cohort analytics (environment variable); hydrated from the history store when enabled
+ANALYTICS_ENABLED = os.getenv("ANALYTICS_ENABLED", "true").lower() == "true"
+
+MUST_CONCEPTS = list(MUST_HAVE_CONCEPTS)
+GOOD_CONCEPTS = list(GOOD_TO_HAVE_CONCEPTS)
+# Rubric scores are whole points (max 110), so scores, totals and band codes fit in uint8
+# and a 256-bin histogram per metric gives exact percentiles
+SCORE_BINS = 256
+MAX_BANDS = 32  # per metric; code 0 = metric has no band
+# Rows buffered before a background fold into the columns (queries fold first)
+FOLD_BATCH = 256
+
+
+def countable(result) -> bool:
+    """Whether an evaluation (response or stored result dict) belongs in cohort distributions."""
+    if isinstance(result, dict):
+        return not result.get("timed_out") and not result.get("selected_metrics")
+    # Degraded (timed-out) or partial (?metrics=) scores would skew distributions
+    return not result.timed_out and not result.selected_metrics
+
+
+class _Codes:
+    """Dictionary encoding of labels to small integer codes (0 = None)."""
+
+    def __init__(self, limit: int | None = None):
+        self.labels = [None]
+        self._index = {None: 0}
+        self.limit = limit
+
+    def code(self, label) -> int:
+        code = self._index.get(label)
+        if code is None:
+            if self.limit and len(self.labels) >= self.limit:
+                return 0
+            code = self._index[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def get(self, label):
+        return self._index.get(label)
+
+
+def evaluation_facts(metrics, created: float, student: str | None, school_class: str | None,
+                     metric_ids: list | None = None) -> tuple:
+    """Analytics row from (metric id, raw score, details) triples of one evaluation (registry order by default)."""
+    metric_ids = METRICS.ids() if metric_ids is None else metric_ids
+    scores, bands = {}, {}
+    must, good = 0, 0
+    for metric_id, score, details in metrics:
+        scores[metric_id] = score
+        bands[metric_id] = details.get("band", details.get("level"))
+        if metric_id == "keywords":
+            found = set(details.get("must_found", ()))
+            must = sum(1 << i for i, c in enumerate(MUST_CONCEPTS) if c in found)
+            found = set(details.get("good_found", ()))
+            good = sum(1 << i for i, c in enumerate(GOOD_CONCEPTS) if c in found)
+    return (created, student, school_class, [scores.get(m, 0) for m in metric_ids],
+            [bands.get(m) for m in metric_ids], must, good)
+
+
+def response_facts(result, created: float, student: str | None = None, school_class: str | None = None,
+                   metric_ids: list | None = None) -> tuple:
+    return evaluation_facts([(m.id, m.raw_score, m.details) for m in result.metrics], created,
+                            student or result.extracted.name, school_class or result.extracted.school_class,
+                            metric_ids)
+
+
+class _Summary:
+    """Additive aggregates for a set of rows; merged batch by batch with bincount."""
+    __slots__ = ("count", "score_sum", "score_sq", "score_hist", "total_hist", "band_counts",
+                 "must_found", "good_found")
+
+    def __init__(self, m: int):
+        self.count = 0
+        self.score_sum = np.zeros(m, np.int64)
+        self.score_sq = np.zeros(m, np.int64)
+        self.score_hist = np.zeros((m, SCORE_BINS), np.int64)
+        self.total_hist = np.zeros(SCORE_BINS, np.int64)
+        self.band_counts = np.zeros((m, MAX_BANDS), np.int64)
+        self.must_found = np.zeros(len(MUST_CONCEPTS), np.int64)
+        self.good_found = np.zeros(len(GOOD_CONCEPTS), np.int64)
+
+    def add(self, scores: np.ndarray, bands: np.ndarray, must: np.ndarray, good: np.ndarray) -> "_Summary":
+        if not len(scores):
+            return self
+        m = scores.shape[1]
+        wide = scores.astype(np.int64)
+        offsets = np.arange(m) * SCORE_BINS
+        self.count += len(scores)
+        self.score_sum += wide.sum(axis=0)
+        self.score_sq += (wide * wide).sum(axis=0)
+        self.score_hist += np.bincount((wide + offsets).ravel(), minlength=m * SCORE_BINS).reshape(m, SCORE_BINS)
+        self.total_hist += np.bincount(np.minimum(wide.sum(axis=1), SCORE_BINS - 1), minlength=SCORE_BINS)
+        band_offsets = np.arange(m) * MAX_BANDS
+        self.band_counts += np.bincount((bands.astype(np.int64) + band_offsets).ravel(),
+                                        minlength=m * MAX_BANDS).reshape(m, MAX_BANDS)
+        self.must_found += ((must[:, None] >> np.arange(len(MUST_CONCEPTS))) & 1).sum(axis=0)
+        self.good_found += ((good[:, None].astype(np.int64) >> np.arange(len(GOOD_CONCEPTS))) & 1).sum(axis=0)
+        return self
+
+
+def hist_percentiles(hist: np.ndarray, count: int, percentiles) -> dict:
+    """Nearest-rank percentiles from an integer histogram."""
+    cumulative = np.cumsum(hist)
+    ranks = np.maximum(1, np.ceil(np.asarray(percentiles, float) / 100 * count)).astype(np.int64)
+    values = np.searchsorted(cumulative, ranks)
+    return {f"p{p:g}": int(v) for p, v in zip(percentiles, values)}
+
+
+def hist_stats(hist: np.ndarray, count: int, total: float, sq: float, percentiles) -> dict:
+    mean = total / count
+    return {"mean": round(mean, 3), "std": round(float(np.sqrt(max(0.0, sq / count - mean * mean))), 3),
+            **hist_percentiles(hist, count, percentiles)}
+
+
+class CohortStore:
+    """
+    Columnar, NumPy-backed store of per-evaluation scores for cohort
+    dashboards. Each row is ~44 bytes: uint8 scores and band codes per
+    metric, concept presence as bitmasks and dictionary-encoded
+    class / student ids. Appends are buffered and folded in batches into the
+    columns and per-class summaries (sums, score and band histograms,
+    concept counts), so unfiltered class queries cost O(metrics × bins)
+    regardless of row count; queries filtered by student or time scan the
+    columns with vectorized masks. Appends never take the store lock (they
+    are safe to call from the event loop); a folder thread and queries do.
+    Tracks the metrics registered when the store is created.
+    """
+
+    def __init__(self, capacity: int = 4096, metric_ids: list | None = None):
+        self.metric_ids = METRICS.ids() if metric_ids is None else list(metric_ids)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.loading = False
+        self.classes = _Codes()
+        self.students = _Codes()
+        self.band_codes = [_Codes(MAX_BANDS) for _ in self.metric_ids]
+        self._summaries = {}  # class code -> _Summary; -1 = every class
+        self._pending = deque()
+        self._fold_wanted = threading.Event()
+        self._folder = None
+        self._folder_lock = threading.Lock()  # guards folder start-up only, never held long
+        m = len(self.metric_ids)
+        self._columns = {
+            "created": np.zeros(capacity, np.float64),
+            "class": np.zeros(capacity, np.int32),
+            "student": np.zeros(capacity, np.int32),
+            "scores": np.zeros((capacity, m), np.uint8),
+            "bands": np.zeros((capacity, m), np.uint8),
+            "must": np.zeros(capacity, np.uint16),
+            "good": np.zeros(capacity, np.uint32),
+        }
+
+    def _reserve(self, extra: int) -> None:
+        capacity = len(self._columns["created"])
+        if self.size + extra <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.size + extra)
+        for name, column in self._columns.items():
+            grown = np.zeros((new_capacity,) + column.shape[1:], column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def add(self, result, student: str | None = None, school_class: str | None = None,
+            created: float | None = None) -> None:
+        self.add_many([response_facts(result, created or time.time(), student, school_class, self.metric_ids)])
+
+    def add_many(self, facts: list) -> None:
+        """Append evaluation_facts() rows without locking; folded into columns and summaries in batches."""
+        self._pending.extend(facts)  # deque appends are atomic
+        if len(self._pending) >= FOLD_BATCH:
+            if self._folder is None:
+                self._start_folder()
+            self._fold_wanted.set()
+
+    def _start_folder(self) -> None:
+        with self._folder_lock:
+            if self._folder is None:
+                self._folder = threading.Thread(target=self._fold_loop, name="analytics-fold", daemon=True)
+                self._folder.start()
+
+    def _fold_loop(self) -> None:
+        while True:
+            self._fold_wanted.wait()
+            self._fold_wanted.clear()
+            with self._lock:
+                self._fold()
+
+    def _fold(self) -> None:
+        """Move buffered rows into the columns and summaries; caller holds the lock."""
+        k = len(self._pending)
+        if not k:
+            return
+        facts = [self._pending.popleft() for _ in range(k)]
+        created = np.fromiter((f[0] for f in facts), np.float64, k)
+        classes = np.fromiter((self.classes.code(f[2]) for f in facts), np.int32, k)
+        students = np.fromiter((self.students.code(f[1]) for f in facts), np.int32, k)
+        scores = np.clip(np.rint(np.array([f[3] for f in facts], np.float64)), 0, 255).astype(np.uint8)
+        bands = np.array([[codes.code(b) for codes, b in zip(self.band_codes, f[4])] for f in facts], np.uint8)
+        must = np.fromiter((f[5] for f in facts), np.uint16, k)
+        good = np.fromiter((f[6] for f in facts), np.uint32, k)
+
+        self._reserve(k)
+        rows = slice(self.size, self.size + k)
+        for name, values in (("created", created), ("class", classes), ("student", students),
+                             ("scores", scores), ("bands", bands), ("must", must), ("good", good)):
+            self._columns[name][rows] = values
+        self.size += k
+
+        m = len(self.metric_ids)
+        self._summaries.setdefault(-1, _Summary(m)).add(scores, bands, must, good)
+        for code in np.unique(classes):
+            mask = classes == code
+            self._summaries.setdefault(int(code), _Summary(m)).add(
+                scores[mask], bands[mask], must[mask], good[mask])
+
+    def _scan(self, class_code: int | None, student: str | None, since: float | None,
+              until: float | None) -> _Summary:
+        cols = {name: column[:self.size] for name, column in self._columns.items()}
+        mask = np.ones(self.size, bool)
+        if class_code is not None:
+            mask &= cols["class"] == class_code
+        if student is not None:
+            mask &= cols["student"] == (self.students.get(student) or -1)
+        if since is not None:
+            mask &= cols["created"] >= since
+        if until is not None:
+            mask &= cols["created"] < until
+        return _Summary(len(self.metric_ids)).add(
+            cols["scores"][mask], cols["bands"][mask], cols["must"][mask], cols["good"][mask])
+
+    def cohort(self, school_class: str | None = None, student: str | None = None,
+               since: float | None = None, until: float | None = None,
+               percentiles=(25, 50, 75, 90)) -> dict:
+        """Per-metric mean / std / percentiles, band frequencies and most-missed concepts."""
+        start = time.perf_counter()
+        with self._lock:
+            self._fold()
+            class_code = None
+            if school_class is not None:
+                class_code = self.classes.get(school_class)
+                if class_code is None:
+                    class_code = -2  # unknown class: empty result
+            if student is None and since is None and until is None:
+                key = -1 if class_code is None else class_code
+                summary, source = self._summaries.get(key) or _Summary(len(self.metric_ids)), "summary"
+            else:
+                summary, source = self._scan(class_code, student, since, until), "scan"
+            report = self._report(summary, percentiles)
+        report.update(source=source, performance_ms=round((time.perf_counter() - start) * 1000, 3))
+        return report
+
+    def _report(self, s: _Summary, percentiles) -> dict:
+        if s.count == 0:
+            return {"count": 0, "metrics": {}, "total_score": None, "missing_concepts": []}
+        metrics = {}
+        for i, metric_id in enumerate(self.metric_ids):
+            labels = self.band_codes[i].labels
+            metrics[metric_id] = {
+                **hist_stats(s.score_hist[i], s.count, s.score_sum[i], s.score_sq[i], percentiles),
+                "bands": {labels[b]: int(s.band_counts[i, b])
+                          for b in np.flatnonzero(s.band_counts[i]) if b and b < len(labels)},
+            }
+        values = np.arange(SCORE_BINS)
+        total = hist_stats(s.total_hist, s.count, float(s.total_hist @ values),
+                           float(s.total_hist @ (values * values)), percentiles)
+        missing = s.count - s.must_found
+        order = np.argsort(-missing, kind="stable")
+        return {
+            "count": s.count,
+            "metrics": metrics,
+            "total_score": total,
+            "missing_concepts": [{"concept": MUST_CONCEPTS[i], "missing": int(missing[i]),
+                                  "rate": round(float(missing[i]) / s.count, 4)} for i in order],
+            "good_to_have_found": {c: int(n) for c, n in zip(GOOD_CONCEPTS, s.good_found)},
+        }
+
+    def classes_overview(self) -> list:
+        """Evaluation count and mean total score per class, from the running summaries."""
+        values = np.arange(SCORE_BINS)
+        with self._lock:
+            self._fold()
+            return [{"school_class": self.classes.labels[code], "count": s.count,
+                     "mean_total": round(float(s.total_hist @ values) / s.count, 3)}
+                    for code, s in sorted(self._summaries.items()) if code >= 0 and s.count]
+
+    def stats(self) -> dict:
+        return {"rows": self.size, "pending": len(self._pending), "classes": len(self.classes.labels) - 1,
+                "students": len(self.students.labels) - 1, "loading": self.loading,
+                "bytes": sum(c[:self.size].nbytes for c in self._columns.values())}
+
+    def hydrate(self, history, until: float, batch_size: int = 5000) -> None:
+        """Load evaluations stored before `until` from the history store."""
+        self.loading = True
+        try:
+            for rows in history.scan(until=until, batch_size=batch_size):
+                facts = []
+                for created, student, school_class, result in rows:
+                    result = json.loads(result)
+                    if not countable(result):  # same rule as live evaluations
+                        continue
+                    metrics = ((m["id"], m["raw_score"], m["details"]) for m in result["metrics"])
+                    facts.append(evaluation_facts(metrics, created, student, school_class, self.metric_ids))
+                self.add_many(facts)
+        finally:
+            self.loading = False
+
+
+@lru_cache(maxsize=1)
+def get_cohort_store():
+    """Process-wide cohort store, or None when ANALYTICS_ENABLED=false."""
+    return CohortStore() if ANALYTICS_ENABLED else None
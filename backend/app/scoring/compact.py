@@ -0,0 +1,185 @@
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from app.models import EvaluationResponse
+from .constants import CONCEPT_ANCHORS
+from .metrics import MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS
+from .pipeline_v2 import ENABLE_SEMANTIC, METRICS, PIPELINE_VERSION
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+try:
+    import zstandard
+except ImportError:  # zstd is offered only when installed
+    zstandard = None
+
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
+COMPACT_MEDIA_TYPE = "application/vnd.scoring.compact+json"
+
+# Band / level labels per metric, in code order; unknown labels are sent as strings
+METRIC_BANDS = {
+    "salutation": ["none", "normal", "good", "excellent"],
+    "keywords": [],
+    "flow": [],
+    "speech_rate": ["unknown", "too slow", "slow", "ideal", "fast", "too fast"],
+    "grammar": ["<0.3", "0.3–0.49", "0.5–0.69", "0.7–0.89", ">0.9", "timed_out"],
+    "vocabulary": ["0–0.29", "0.3–0.49", "0.5–0.69", "0.7–0.89", "0.9–1.0"],
+    "clarity": ["13+", "10–12", "7–9", "4–6", "0–3"],
+    "engagement": ["<0.3", "0.3–0.49", "0.5–0.69", "0.7–0.89", ">=0.9", "timed_out"],
+    "concept": ["<0.50", "0.50–0.59", "0.60–0.69", "0.70–0.79", "≥0.80", "disabled", "pending", "timed_out"],
+}
+# Headline measurement per metric (details key), sent as the third element of each metric entry
+METRIC_VALUES = {
+    "salutation": None, "keywords": None, "flow": "order_followed", "speech_rate": "wpm",
+    "grammar": "errors", "vocabulary": "ttr", "clarity": "rate_percent",
+    "engagement": "pos_probability", "concept": "average_similarity",
+}
+MUST_CONCEPTS = list(MUST_HAVE_CONCEPTS)
+GOOD_CONCEPTS = list(GOOD_TO_HAVE_CONCEPTS)
+# Selectable response fields -> compact key
+FIELDS = {
+    "total_score": "t", "max_total": "mt", "word_count": "w", "sentence_count": "s",
+    "duration_seconds": "d", "wpm": "wpm", "metrics": "m", "concepts": "c", "extracted": "x",
+    "timed_out": "to", "version": "v", "performance_ms": "ms",
+    "feedback": "fb", "transcript_preview": "p", "notes": "n", "timings": "tm",
+}
+# Sent unless requested with ?fields= (the client already has the transcript)
+OPTIONAL_FIELDS = {"feedback", "transcript_preview", "notes", "timings"}
+DEFAULT_FIELDS = frozenset(FIELDS) - OPTIONAL_FIELDS
+
+_BAND_CODES = {metric: {band: i for i, band in enumerate(bands)} for metric, bands in METRIC_BANDS.items()}
+
+
+@lru_cache(maxsize=1)
+def _schema(registry_version: int) -> dict:
+    schema = {
+        "fields": FIELDS,
+        "metric_entry": ["raw_score", "band", "value"],
+        "metrics": [{"id": spec.id, "name": spec.name, "bands": METRIC_BANDS.get(spec.id, []),
+                     "value": METRIC_VALUES.get(spec.id)} for spec in METRICS.all()],
+        "concepts": {"bitmask_order": [MUST_CONCEPTS, GOOD_CONCEPTS]},
+        "extracted": ["name", "age", "school_class"],
+        "concept_anchors": CONCEPT_ANCHORS if ENABLE_SEMANTIC else [],
+        "pipeline_version": PIPELINE_VERSION,
+    }
+    # Content-derived version: clients cache the schema until this changes
+    schema["schema_version"] = hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:12]
+    return schema
+
+
+def get_schema() -> dict:
+    """Decoding table for the metrics currently registered; rebuilt when a plugin registers."""
+    return _schema(METRICS.version)
+
+
+@lru_cache(maxsize=1)
+def _metric_index(registry_version: int) -> dict:
+    return {metric_id: i for i, metric_id in enumerate(METRICS.ids())}
+
+
+def parse_fields(fields: str | None) -> frozenset | None:
+    """?fields=a,b -> selected field names (None = defaults); raises ValueError on unknown names."""
+    if not fields:
+        return None
+    selected = frozenset(f.strip() for f in fields.split(",") if f.strip())
+    unknown = selected - FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return selected
+
+
+def _mask(names, order: list) -> int:
+    names = set(names)
+    return sum(1 << i for i, c in enumerate(order) if c in names)
+
+
+def to_compact(result: EvaluationResponse, fields: frozenset | None = None) -> dict:
+    """
+    Short-key encoding of an EvaluationResponse, decoded with get_schema():
+    metrics are [raw_score, band code, value] in registry order (for a ?metrics=
+    subset, "mi" lists their schema indexes) and concept presence is a pair
+    of bitmasks, so no static text is repeated.
+    """
+    fields = DEFAULT_FIELDS if fields is None else fields
+    index = _metric_index(METRICS.version)
+    out = {"sv": get_schema()["schema_version"]}
+    if "total_score" in fields: out["t"] = result.total_score
+    if "max_total" in fields: out["mt"] = result.max_total
+    if "word_count" in fields: out["w"] = result.word_count
+    if "sentence_count" in fields: out["s"] = result.sentence_count
+    if "duration_seconds" in fields: out["d"] = result.duration_seconds
+    if "wpm" in fields: out["wpm"] = result.wpm
+    if "metrics" in fields:
+        entries = []
+        for m in result.metrics:
+            band = m.details.get("band", m.details.get("level"))
+            value_key = METRIC_VALUES.get(m.id)
+            entries.append([m.raw_score, _BAND_CODES.get(m.id, {}).get(band, band),
+                            m.details.get(value_key) if value_key else None])
+        out["m"] = entries
+        indexes = [index.get(m.id, m.id) for m in result.metrics]
+        if indexes != list(range(len(index))):
+            out["mi"] = indexes
+    keywords = next((m.details for m in result.metrics if m.id == "keywords"), None)
+    if "concepts" in fields and keywords is not None:
+        out["c"] = [_mask(keywords.get("must_found", ()), MUST_CONCEPTS),
+                    _mask(keywords.get("good_found", ()), GOOD_CONCEPTS)]
+    if "extracted" in fields:
+        x = result.extracted
+        out["x"] = [x.name, x.age, x.school_class]
+    if "timed_out" in fields and result.timed_out:
+        out["to"] = [index.get(m, m) for m in result.timed_out]
+    if "version" in fields: out["v"] = result.version
+    if "performance_ms" in fields: out["ms"] = result.performance_ms
+    if "feedback" in fields: out["fb"] = [m.feedback for m in result.metrics]
+    if "transcript_preview" in fields: out["p"] = result.transcript_preview
+    if "notes" in fields: out["n"] = result.notes
+    if "timings" in fields and result.timings is not None: out["tm"] = result.timings
+    return out
+
+
+def select_fields(result: EvaluationResponse, fields: frozenset | None) -> dict:
+    """Full-format response restricted to the selected top-level fields."""
+    if fields is None:
+        return result.model_dump(mode="json")
+    # concepts / feedback only exist inside metrics in the full format
+    return result.model_dump(mode="json", include={f for f in fields if f in EvaluationResponse.model_fields})
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def wants_compact(format: str | None, accept: str | None) -> bool:
+    if format:
+        return format == "compact"
+    return COMPACT_MEDIA_TYPE in (accept or "")
+
+
+def _accepted(accept_encoding: str | None) -> set:
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def encode_body(body: bytes, accept_encoding: str | None) -> tuple:
+    """(body, Content-Encoding or None): zstd when accepted and installed, else gzip."""
+    if len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    accepted = _accepted(accept_encoding)
+    if zstandard is not None and "zstd" in accepted:
+        return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+    if "gzip" in accepted or "*" in accepted:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
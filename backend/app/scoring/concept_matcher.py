@@ -0,0 +1,62 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+WORD_RE = re.compile(r"\w+")
+# A pattern is indexable when it starts with \b + a literal word that is
+# followed by a non-word construct (space, \s, \b, apostrophe) or ends.
+LEADING_WORD_RE = re.compile(r"^\\b([A-Za-z]+)(?=$| |\\s|\\b|')")
+
+
+def leading_word(pattern: str) -> Optional[str]:
+    m = LEADING_WORD_RE.match(pattern)
+    return m.group(1).lower() if m else None
+
+
+class ConceptMatcher:
+    """
+    Matches every concept's regex patterns with a single tokenizing pass.
+
+    Patterns are compiled once and indexed by their leading literal word.
+    One scan over the text maps each word to its start offsets; each pattern
+    is then only tried (anchored) where its leading word occurs, instead of
+    scanning the whole transcript once per pattern. Patterns without a
+    literal leading word fall back to a regular search.
+    """
+
+    def __init__(self, concepts: Dict[str, List[str]], flags: int = re.IGNORECASE):
+        self.concepts = tuple(concepts)
+        self._entries = []  # (concept, compiled pattern, leading word or None)
+        for concept, patterns in concepts.items():
+            for p in patterns:
+                self._entries.append((concept, re.compile(p, flags), leading_word(p)))
+        self._words = frozenset(word for _, _, word in self._entries if word)
+
+    def find(self, text: str) -> Dict[str, Span]:
+        """Span of the first match of every concept present in `text`."""
+        positions: Dict[str, List[int]] = {}
+        words = self._words
+        for m in WORD_RE.finditer(text):
+            word = m.group().lower()
+            if word in words:
+                positions.setdefault(word, []).append(m.start())
+
+        found: Dict[str, Span] = {}
+        for concept, pattern, word in self._entries:
+            best = found.get(concept)
+            if word is None:
+                hit = pattern.search(text)
+                span = hit.span() if hit else None
+            else:
+                span = None
+                for pos in positions.get(word, ()):
+                    if best and pos >= best[0]:
+                        break
+                    hit = pattern.match(text, pos)
+                    if hit:
+                        span = hit.span()
+                        break
+            if span and (best is None or span[0] < best[0]):
+                found[concept] = span
+        return found
@@ -26,4 +26,21 @@ GOOD_TO_HAVE_KEYWORDS = [
 FILLER_WORDS = [
     "um", "uh", "like", "you know", "so", "actually", "basically",
     "right", "i mean", "well", "kinda", "sort of", "okay", "hmm", "ah"
-]
\ No newline at end of file
+]
+
+# Fillers that are ordinary words after these tokens ("I like coding")
+FILLER_EXCEPTIONS = {
+    "like": ["i", "we", "you", "they", "he", "she"],
+}
+
+# Semantic coverage anchors (semantic.py); kept here so listing them loads no model stack
+CONCEPT_ANCHORS = [
+    "A clear greeting",
+    "States name and class or educational level",
+    "Mentions school",
+    "Shares family or personal background",
+    "Includes hobby or interest",
+    "Mentions aspiration or goal",
+    "Provides unique or fun fact",
+    "Polite closing thanking audience"
+]
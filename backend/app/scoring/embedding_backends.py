@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+import numpy as np
+
+# Embedding backend configuration (environment variables)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()  # torch | onnx
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "models/all-MiniLM-L6-v2-onnx")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "model_int8.onnx")
+# Intra-op threads per ONNX session (0 = onnxruntime default)
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))
+# all-MiniLM-L6-v2 was trained with 256 word pieces; longer inputs are truncated
+ONNX_MAX_LENGTH = int(os.getenv("ONNX_MAX_LENGTH", "256"))
+
+
+class TorchBackend:
+    """Full-precision PyTorch SentenceTransformer."""
+
+    name = "torch"
+
+    def __init__(self, model_id: str, offline: bool = False):
+        if offline:
+            # Must be set before huggingface_hub is first imported
+            os.environ.setdefault("HF_HUB_OFFLINE", "1")
+            os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_id)
+
+    def encode(self, texts: list) -> np.ndarray:
+        return np.asarray(self.model.encode(list(texts)), dtype=np.float32)
+
+
+def mean_pool(hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Attention-masked mean over tokens: (batch × seq × dim) → (batch × dim)."""
+    mask = mask[..., None].astype(np.float32)
+    return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxBackend:
+    """
+    Int8-quantized ONNX export of the sentence-transformer run on onnxruntime
+    (see scripts/export_onnx.py). Needs only onnxruntime + tokenizers, not torch.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, model_file: str = ONNX_MODEL_FILE,
+                 threads: int = ONNX_THREADS, max_length: int = ONNX_MAX_LENGTH):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        directory = Path(model_dir)
+        self.tokenizer = Tokenizer.from_file(str(directory / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(directory / model_file), options,
+                                            providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: list) -> np.ndarray:
+        batch = self.tokenizer.encode_batch(list(texts))
+        feeds = {
+            "input_ids": np.array([e.ids for e in batch], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in batch], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in batch], dtype=np.int64),
+        }
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        return mean_pool(hidden, feeds["attention_mask"])
+
+
+def load_backend(name: str, model_id: str, offline: bool = False):
+    if name == "torch":
+        return TorchBackend(model_id, offline=offline)
+    if name == "onnx":
+        return OnnxBackend()
+    raise ValueError(f"Unknown EMBEDDING_BACKEND {name!r}; expected 'torch' or 'onnx'.")
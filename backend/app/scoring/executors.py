@@ -0,0 +1,53 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from .grammar import GRAMMAR_POOL_SIZE
+
+# Dedicated, bounded executors (environment variables)
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "2"))
+GRAMMAR_IO_WORKERS = int(os.getenv("GRAMMAR_IO_WORKERS", str(GRAMMAR_POOL_SIZE * 2)))
+MAX_INFLIGHT_EVALUATIONS = int(os.getenv("MAX_INFLIGHT_EVALUATIONS", "32"))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "2"))
+
+
+@lru_cache(maxsize=1)
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """CPU-heavy work: sentence embeddings, VADER."""
+    return ThreadPoolExecutor(max_workers=max(1, EMBED_WORKERS), thread_name_prefix="scoring-cpu")
+
+
+@lru_cache(maxsize=1)
+def get_io_executor() -> ThreadPoolExecutor:
+    """Blocking calls to the LanguageTool servers."""
+    return ThreadPoolExecutor(max_workers=max(1, GRAMMAR_IO_WORKERS), thread_name_prefix="scoring-io")
+
+
+class AdmissionLimiter:
+    """
+    Caps concurrent evaluations without queueing: try_acquire fails
+    immediately when full so the caller can shed load (503 + Retry-After).
+    Because admission is bounded, executor queues are bounded too.
+    """
+
+    def __init__(self, limit: int = MAX_INFLIGHT_EVALUATIONS):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, weight: int = 1) -> bool:
+        """Admit `weight` evaluations at once (e.g. a batch); all or nothing."""
+        with self._lock:
+            if self.in_flight + weight > self.limit:
+                self.rejected += 1
+                return False
+            self.in_flight += weight
+            return True
+
+    def release(self, weight: int = 1) -> None:
+        with self._lock:
+            self.in_flight -= weight
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "in_flight": self.in_flight, "rejected": self.rejected}
@@ -1,5 +1,6 @@
 import re
 from typing import Optional
+from .analysis import TranscriptAnalysis
 
 NAME_REGEX = re.compile(r"\bmy name is ([A-Z][a-zA-Z]*)\b", re.IGNORECASE)
 GENERIC_INTRO = re.compile(r"\bmyself ([A-Z][a-zA-Z]*)\b", re.IGNORECASE)
@@ -7,7 +8,12 @@ AGE_REGEX = re.compile(r"\bI am (\d{1,2}) years? old\b", re.IGNORECASE)
 CLASS_REGEX = re.compile(r"class\s+(\d{1,2}\w?)\b", re.IGNORECASE)
 SCHOOL_REGEX = re.compile(r"\bfrom ([A-Z][a-zA-Z0-9\s]*(School|Academy|College))\b")
 
-def extract_name(text: str) -> Optional[str]:
+# Each extractor accepts raw text or a TranscriptAnalysis; with an analysis
+# the result is computed once and shared by keyword_presence and the pipeline.
+
+def extract_name(text: str | TranscriptAnalysis) -> Optional[str]:
+    if isinstance(text, TranscriptAnalysis):
+        return text.cached("extract_name", lambda a: extract_name(a.text))
     m = NAME_REGEX.search(text)
     if m:
         return m.group(1)
@@ -16,24 +22,33 @@ def extract_name(text: str) -> Optional[str]:
         return m2.group(1)
     return None
 
-def extract_age(text: str) -> Optional[int]:
+def extract_age(text: str | TranscriptAnalysis) -> Optional[int]:
+    if isinstance(text, TranscriptAnalysis):
+        return text.cached("extract_age", lambda a: extract_age(a.text))
     m = AGE_REGEX.search(text)
     if m:
         return int(m.group(1))
     return None
 
-def extract_class(text: str) -> Optional[str]:
+def extract_class(text: str | TranscriptAnalysis) -> Optional[str]:
+    if isinstance(text, TranscriptAnalysis):
+        return text.cached("extract_class", lambda a: extract_class(a.text))
     m = CLASS_REGEX.search(text)
     if m:
         return m.group(1)
     return None
 
-def extract_school_class_phrase(text: str) -> Optional[str]:
+def extract_school_class_phrase(text: str | TranscriptAnalysis) -> Optional[str]:
+    if isinstance(text, TranscriptAnalysis):
+        return text.cached("extract_school_class_phrase",
+                           lambda a: _school_class_phrase(a.text, extract_class(a)))
+    return _school_class_phrase(text, extract_class(text))
+
+def _school_class_phrase(text: str, cls: Optional[str]) -> Optional[str]:
     school = SCHOOL_REGEX.search(text)
-    cls = CLASS_REGEX.search(text)
     parts = []
     if school:
         parts.append(school.group(1))
     if cls:
-        parts.append(f"Class {cls.group(1)}")
-    return ", ".join(parts) if parts else None
\ No newline at end of file
+        parts.append(f"Class {cls}")
+    return ", ".join(parts) if parts else None
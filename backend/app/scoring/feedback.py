@@ -4,7 +4,9 @@ def build_feedback(found, missing, semantic_score, length_score, min_words, max_
         parts.append(f"Found: {', '.join(found)}.")
     if missing:
         parts.append(f"Missing: {', '.join(missing)}.")
-    if semantic_score >= 0.8:
+    if semantic_score is None:
+        pass  # semantic scoring disabled
+    elif semantic_score >= 0.8:
         parts.append("Strong alignment.")
     elif semantic_score >= 0.6:
         parts.append("Moderate alignment; consider refining phrasing.")
@@ -14,4 +16,13 @@ def build_feedback(found, missing, semantic_score, length_score, min_words, max_
         parts.append(f"Below minimum ({word_count}/{min_words}). Add detail.")
     if max_words and word_count > max_words:
         parts.append(f"Above maximum ({word_count}/{max_words}). Tighten wording.")
-    return " ".join(parts)
\ No newline at end of file
+    return " ".join(parts)
+
+def band(semantic_score) -> str:
+    if semantic_score is None:
+        return "disabled"
+    if semantic_score >= 0.8:
+        return "Strong"
+    if semantic_score >= 0.6:
+        return "Moderate"
+    return "Low"
\ No newline at end of file
@@ -0,0 +1,248 @@
+import bisect
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import NamedTuple
+from .cache import LRUCache
+
+# Pool configuration (environment variables)
+GRAMMAR_LANGUAGE = os.getenv("GRAMMAR_LANGUAGE", "en-US")
+GRAMMAR_POOL_SIZE = int(os.getenv("GRAMMAR_POOL_SIZE", "2"))
+GRAMMAR_LEASE_TIMEOUT = float(os.getenv("GRAMMAR_LEASE_TIMEOUT", "5"))
+GRAMMAR_RESTART_BACKOFF = float(os.getenv("GRAMMAR_RESTART_BACKOFF", "30"))
+# Sentence-level result cache and max sentences per LanguageTool call
+GRAMMAR_CACHE_SIZE = int(os.getenv("GRAMMAR_CACHE_SIZE", "8192"))
+GRAMMAR_CHUNK_SENTENCES = int(os.getenv("GRAMMAR_CHUNK_SENTENCES", "8"))
+
+
+class GrammarUnavailable(RuntimeError):
+    """Raised when no healthy LanguageTool instance can be leased."""
+
+
+def _language_tool_factory():
+    from language_tool_python import LanguageTool
+    return LanguageTool(GRAMMAR_LANGUAGE)
+
+
+class GrammarPool:
+    """
+    Fixed-size pool of LanguageTool instances.
+    Each slot holds a running instance or None (dead / failed to start).
+    Dead slots are restarted on lease, at most once per backoff window.
+    """
+
+    def __init__(self, size: int = GRAMMAR_POOL_SIZE, lease_timeout: float = GRAMMAR_LEASE_TIMEOUT,
+                 factory=_language_tool_factory, restart_backoff: float = GRAMMAR_RESTART_BACKOFF):
+        self.size = max(1, size)
+        self.lease_timeout = lease_timeout
+        self.restart_backoff = restart_backoff
+        self._factory = factory
+        self._slots = queue.Queue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._started = False
+        self._waiting = 0
+        self._alive = 0
+        self._last_failure = None
+        self.restarts = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            # Fresh queue: instances leased before a close() never return to it
+            self._slots = slots = queue.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            slots.put(self._spawn())
+
+    def close(self) -> None:
+        """Close idle instances now; leased ones are closed when they are returned."""
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+        while True:
+            try:
+                self._close(self._slots.get_nowait())
+            except queue.Empty:
+                break
+
+    def _return(self, slots: queue.Queue, tool) -> None:
+        with self._lock:
+            if self._started and slots is self._slots:
+                slots.put(tool)
+                return
+        self._close(tool)  # leased across a close(): its JVM would otherwise leak
+
+    def _spawn(self):
+        if self._last_failure is not None and time.monotonic() - self._last_failure < self.restart_backoff:
+            return None
+        try:
+            tool = self._factory()
+        except Exception:
+            with self._lock:
+                self.failures += 1
+                self._last_failure = time.monotonic()
+            return None
+        with self._lock:
+            self._alive += 1
+            self._last_failure = None
+        return tool
+
+    def _close(self, tool) -> None:
+        if tool is None:
+            return
+        with self._lock:
+            self._alive -= 1
+        closer = getattr(tool, "close", None)
+        if closer:
+            try:
+                closer()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _healthy(tool) -> bool:
+        # Local LanguageTool servers expose their JVM process as `_server`
+        server = getattr(tool, "_server", None)
+        return server is None or server.poll() is None
+
+    @contextmanager
+    def lease(self, timeout: float | None = None):
+        self.start()
+        with self._lock:
+            self._waiting += 1
+            slots = self._slots
+        try:
+            tool = slots.get(timeout=self.lease_timeout if timeout is None else timeout)
+        except queue.Empty:
+            raise GrammarUnavailable("Timed out waiting for a LanguageTool instance.")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if tool is None or not self._healthy(tool):
+            if tool is not None:
+                self._close(tool)
+            tool = self._spawn()
+            if tool is None:
+                self._return(slots, None)
+                raise GrammarUnavailable("LanguageTool instance could not be started.")
+            with self._lock:
+                self.restarts += 1
+
+        try:
+            yield tool
+        except Exception:
+            # Instance state is unknown after a failed check; replace it on next lease
+            self._close(tool)
+            tool = None
+            raise
+        finally:
+            self._return(slots, tool)
+
+    def check(self, text: str, timeout: float | None = None) -> list:
+        with self.lease(timeout) as tool:
+            return tool.check(text)
+
+    def stats(self) -> dict:
+        idle = self._slots.qsize()
+        return {
+            "size": self.size,
+            "alive": self._alive,
+            "idle": idle,
+            "in_use": self.size - idle if self._started else 0,
+            "queue_depth": self._waiting,
+            "restarts": self.restarts,
+            "failures": self.failures,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_grammar_pool() -> GrammarPool:
+    return GrammarPool()
+
+
+class GrammarMatch(NamedTuple):
+    """Compact LanguageTool match (same attribute names), offsets relative to its sentence."""
+    ruleId: str
+    rule_issue_type: str
+    offset: int
+    errorLength: int
+
+
+# Normalized sentence -> tuple of GrammarMatch
+_SENTENCE_CACHE = LRUCache(GRAMMAR_CACHE_SIZE)
+
+
+def normalize_sentence(sentence: str) -> str:
+    return " ".join(sentence.split())
+
+
+@lru_cache(maxsize=1)
+def get_chunk_executor() -> ThreadPoolExecutor:
+    """Runs chunk checks in parallel, one per pooled LanguageTool instance."""
+    return ThreadPoolExecutor(max_workers=GRAMMAR_POOL_SIZE, thread_name_prefix="grammar-chunk")
+
+
+def _check_chunk(pool: GrammarPool, sentences: list) -> list:
+    """One LanguageTool call for a chunk; matches are split back per sentence."""
+    starts, offset = [], 0
+    for sentence in sentences:
+        starts.append(offset)
+        offset += len(sentence) + 1
+    per_sentence = [[] for _ in sentences]
+    for m in pool.check(" ".join(sentences)):
+        index = max(0, min(len(starts) - 1, bisect.bisect_right(starts, m.offset) - 1))
+        per_sentence[index].append(GrammarMatch(
+            getattr(m, "ruleId", ""), getattr(m, "rule_issue_type", "other"),
+            m.offset - starts[index], getattr(m, "errorLength", 0)))
+    return [tuple(matches) for matches in per_sentence]
+
+
+def check_sentences(sentences: list, pool: GrammarPool | None = None,
+                    chunk_sentences: int = GRAMMAR_CHUNK_SENTENCES) -> list:
+    """
+    GrammarMatch tuples for each sentence. Sentences are looked up by their
+    normalized text; only distinct misses reach LanguageTool, in chunks checked
+    in parallel across the pool. Raises if LanguageTool is unavailable.
+    """
+    pool = pool or get_grammar_pool()
+    keys = [normalize_sentence(s) for s in sentences]
+    found = {}
+    misses = []
+    for key in keys:
+        if key in found or not key:
+            continue
+        cached = _SENTENCE_CACHE.get(key)
+        if cached is None:
+            found[key] = None
+            misses.append(key)
+        else:
+            found[key] = cached
+    if misses:
+        size = max(1, min(chunk_sentences, math.ceil(len(misses) / pool.size)))
+        chunks = [misses[i:i + size] for i in range(0, len(misses), size)]
+        if len(chunks) == 1:
+            results = [_check_chunk(pool, chunks[0])]
+        else:
+            results = list(get_chunk_executor().map(lambda chunk: _check_chunk(pool, chunk), chunks))
+        for chunk, matches in zip(chunks, results):
+            for key, sentence_matches in zip(chunk, matches):
+                _SENTENCE_CACHE.put(key, sentence_matches)
+                found[key] = sentence_matches
+    return [found.get(key) or () for key in keys]
+
+
+def grammar_cache_stats() -> dict:
+    return _SENTENCE_CACHE.stats()
+
+
+def clear_grammar_cache() -> None:
+    _SENTENCE_CACHE.clear()
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from app.models import EvaluationResponse
+
+# Evaluation history configuration (environment variables)
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "none")  # sqlite | none
+HISTORY_PATH = os.getenv("HISTORY_PATH", "history.sqlite3")
+# Write-behind batching: one transaction per HISTORY_BATCH_SIZE rows or HISTORY_FLUSH_MS
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "500"))
+HISTORY_FLUSH_MS = float(os.getenv("HISTORY_FLUSH_MS", "200"))
+# Pending rows before new ones are dropped (requests never wait on the writer)
+HISTORY_QUEUE_SIZE = int(os.getenv("HISTORY_QUEUE_SIZE", "10000"))
+HISTORY_MAX_PAGE = 1000
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS evaluations ("
+    "id INTEGER PRIMARY KEY, created REAL NOT NULL, student TEXT, class TEXT, "
+    "transcript_hash TEXT NOT NULL, total_score REAL NOT NULL, max_total REAL NOT NULL, "
+    "word_count INTEGER NOT NULL, version TEXT NOT NULL, result TEXT NOT NULL, "
+    "cached INTEGER NOT NULL DEFAULT 0)",
+    # Every index ends in created (+ the implicit rowid) so filtered pages
+    # come back in order straight from the index, without a sort
+    "CREATE INDEX IF NOT EXISTS idx_eval_student ON evaluations(student, created)",
+    "CREATE INDEX IF NOT EXISTS idx_eval_class ON evaluations(class, created)",
+    "CREATE INDEX IF NOT EXISTS idx_eval_created ON evaluations(created)",
+    "CREATE INDEX IF NOT EXISTS idx_eval_hash ON evaluations(transcript_hash, created)",
+)
+SUMMARY_COLUMNS = ("id", "created", "student", "class", "transcript_hash",
+                   "total_score", "max_total", "word_count", "version", "cached")
+FILTERS = {"student": "student", "school_class": "class", "transcript_hash": "transcript_hash"}
+
+
+def transcript_hash(transcript: str) -> str:
+    return hashlib.sha256(" ".join(transcript.split()).encode("utf-8")).hexdigest()
+
+
+def encode_cursor(created: float, row_id: int) -> str:
+    return f"{created!r}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    created, row_id = cursor.split(":")
+    return float(created), int(row_id)
+
+
+class HistoryStore:
+    """
+    SQLite (WAL) evaluation history with write-behind batching: record() only
+    enqueues; a writer thread serializes and inserts queued rows, one
+    transaction per batch. When the queue is full new rows are dropped
+    (and counted) rather than slowing down scoring.
+    """
+
+    def __init__(self, path: str = HISTORY_PATH, batch_size: int = HISTORY_BATCH_SIZE,
+                 flush_ms: float = HISTORY_FLUSH_MS, queue_size: int = HISTORY_QUEUE_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_ms = flush_ms
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._conn = self._connect()
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(evaluations)")}
+        if "cached" not in columns:  # files created before cache hits were flagged
+            self._conn.execute("ALTER TABLE evaluations ADD COLUMN cached INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; fsync per checkpoint
+        return conn
+
+    def start(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+                self._writer.start()
+
+    def record(self, result: EvaluationResponse, transcript: str,
+               student: str | None = None, school_class: str | None = None, cached: bool = False) -> bool:
+        """Queue one evaluation (cached: served from the result cache); False if the queue is full."""
+        self.start()
+        try:
+            self._queue.put_nowait((time.time(), result, transcript, student, school_class, cached))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _row(self, item: tuple) -> tuple:
+        created, result, transcript, student, school_class, cached = item
+        return (created, student or result.extracted.name, school_class or result.extracted.school_class,
+                transcript_hash(transcript), result.total_score, result.max_total, result.word_count,
+                result.version, result.model_dump_json(exclude={"timings"}), int(cached))
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            flush_at = time.monotonic() + self.flush_ms / 1000
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._insert(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _insert(self, batch: list) -> None:
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO evaluations (created, student, class, transcript_hash, total_score, "
+                    "max_total, word_count, version, result, cached) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(item) for item in batch])
+            self.written += len(batch)
+            self.batches += 1
+        except Exception:
+            self.failed += len(batch)
+
+    def flush(self) -> None:
+        """Block until every queued row has been written (tests, shutdown)."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)  # after the rows already queued
+            writer.join()
+
+    def query(self, student: str | None = None, school_class: str | None = None,
+              transcript_hash: str | None = None, since: float | None = None,
+              until: float | None = None, cursor: str | None = None,
+              limit: int = 100, full: bool = False):
+        """
+        Newest-first rows (summary columns, plus the stored result JSON text
+        when full) matching the filters, as a lazy iterator. Pagination is
+        keyset on (created, id): pass the last row's encode_cursor() to get the
+        next page, so deep pages cost the same as the first.
+        """
+        clauses, params = [], []
+        for arg, value in (("student", student), ("school_class", school_class),
+                           ("transcript_hash", transcript_hash)):
+            if value is not None:
+                clauses.append(f"{FILTERS[arg]} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(until)
+        if cursor:
+            clauses.append("(created, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        columns = ", ".join(SUMMARY_COLUMNS + (("result",) if full else ()))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = f"SELECT {columns} FROM evaluations {where}ORDER BY created DESC, id DESC LIMIT ?"
+        params.append(max(1, min(limit, HISTORY_MAX_PAGE)))
+        # a connection per query: WAL readers never block (or wait on) the writer
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params)
+            while chunk := rows.fetchmany(256):
+                yield from chunk
+        finally:
+            conn.close()
+
+    def scan(self, until: float | None = None, batch_size: int = 5000):
+        """Batches of (created, student, class, result JSON) rows in insertion order; cache hits are skipped."""
+        conn = self._connect()
+        last_id = 0
+        try:
+            while True:
+                rows = conn.execute(
+                    "SELECT id, created, student, class, result FROM evaluations "
+                    "WHERE id > ? AND created < ? AND NOT cached ORDER BY id LIMIT ?",
+                    (last_id, until if until is not None else float("inf"), batch_size)).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield [row[1:] for row in rows]
+        finally:
+            conn.close()
+
+    def get(self, row_id: int) -> str | None:
+        """Stored result JSON of one evaluation."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT result FROM evaluations WHERE id = ?", (row_id,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def stats(self) -> dict:
+        return {"backend": "sqlite", "queued": self._queue.qsize(), "written": self.written,
+                "batches": self.batches, "dropped": self.dropped, "failed": self.failed}
+
+
+def stream_page(rows, limit: int, full: bool = False):
+    """
+    JSON text chunks of {"items": [...], "next_cursor": ...} for query() rows,
+    produced row by row; stored result JSON is spliced in without re-parsing.
+    """
+    yield '{"items":['
+    count, last = 0, None
+    for row in rows:
+        summary = json.dumps(dict(zip(SUMMARY_COLUMNS, row)))
+        if full:
+            summary = summary[:-1] + ',"result":' + row[len(SUMMARY_COLUMNS)] + "}"
+        yield ("," if count else "") + summary
+        count, last = count + 1, row
+    next_cursor = encode_cursor(last[1], last[0]) if last is not None and count >= limit else None
+    yield f'],"count":{count},"next_cursor":{json.dumps(next_cursor)}}}'
+
+
+@lru_cache(maxsize=1)
+def get_history_store():
+    """Configured history store, or None when HISTORY_BACKEND=none."""
+    if HISTORY_BACKEND == "sqlite":
+        return HistoryStore()
+    return None
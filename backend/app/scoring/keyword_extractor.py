@@ -1,5 +1,5 @@
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Set, Tuple
 
 def normalize(text: str) -> str:
     return re.sub(r'[^a-zA-Z0-9\s]', ' ', text.lower())
@@ -18,4 +18,36 @@ def keyword_match(transcript: str, keywords: List[str]) -> Tuple[List[str], List
 def keyword_score(found: List[str], total: int) -> float:
     if total == 0:
         return 1.0
-    return len(found) / total
\ No newline at end of file
+    return len(found) / total
+
+class KeywordMatcher:
+    """
+    All keywords of a rubric matched against one tokenization of the transcript.
+    A keyword is present when its normalized tokens appear contiguously, which
+    is what the per-keyword word-boundary search over normalize() checked.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._phrases = {}
+        for kw in keywords:
+            low = kw.lower().strip()
+            # punctuation never survives normalize(), so such keywords cannot match
+            if low and not re.search(r'[^a-z0-9\s]', low):
+                self._phrases[kw] = tuple(low.split())
+        self._targets = set(self._phrases.values())
+        self._lengths = sorted({len(p) for p in self._targets})
+
+    def present(self, tokens: List[str]) -> Set[str]:
+        """Keywords (original spelling) found in the token stream."""
+        grams = set()
+        for n in self._lengths:
+            for i in range(len(tokens) - n + 1):
+                gram = tuple(tokens[i:i + n])
+                if gram in self._targets:
+                    grams.add(gram)
+        return {kw for kw, phrase in self._phrases.items() if phrase in grams}
+
+    def split(self, present: Set[str], keywords: List[str]) -> Tuple[List[str], List[str]]:
+        found = [kw for kw in keywords if kw in present]
+        missing = [kw for kw in keywords if kw not in present]
+        return found, missing
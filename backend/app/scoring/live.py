@@ -0,0 +1,272 @@
+import asyncio
+import os
+import re
+import time
+from collections import Counter
+from itertools import islice
+from typing import Dict
+from app.models import MetricScore
+from .analysis import SENTENCE_RE, TOKEN_RE, TranscriptAnalysis
+from .executors import get_cpu_executor, get_io_executor
+from .grammar import check_sentences, get_grammar_pool
+from .metrics import (
+    CONCEPT_MATCHER, MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS,
+    SALUTATION_PHRASES, CLOSING_PHRASES, BASIC_CONCEPTS,
+    keyword_presence_from_matches, salutation_phrases, salutation_from_phrases,
+    flow_from_positions, speech_rate_metric, count_grammar_errors, grammar_from_errors,
+    grammar_unavailable, vocabulary_from_counts, find_fillers, filler_metric_from_spans,
+    sentiment_from_scores
+)
+from .pipeline_v2 import ENABLE_SEMANTIC, METRIC_NAMES, build_feedback, conceptual_coverage
+from .utils import ensure_vader
+
+# Max transcript length (characters) accepted by one live session
+LIVE_MAX_CHARS = int(os.getenv("LIVE_MAX_CHARS", "100000"))
+# Words after which an unterminated segment is closed anyway (unpunctuated ASR text)
+LIVE_MAX_OPEN_WORDS = int(os.getenv("LIVE_MAX_OPEN_WORDS", "40"))
+
+TERMINATOR_RE = re.compile(r'[.!?]')
+EXTRACTORS = {
+    concept: definition["extraction"]
+    for group in (MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS)
+    for concept, definition in group.items() if definition.get("extraction")
+}
+
+
+def _first(a: int, b: int) -> int:
+    return b if a == -1 or (b != -1 and b < a) else a
+
+
+class _Segment:
+    """Light-metric facts for one sentence segment, with offsets into the full transcript."""
+    __slots__ = ("text", "end", "words", "tokens", "fillers", "concepts", "salutations",
+                 "salutation_idx", "closing_idx", "pos")
+
+    def __init__(self, text: str, offset: int):
+        a = TranscriptAnalysis(text)
+        low = a.lower
+        self.text = text.strip()
+        self.end = offset + len(text.rstrip())
+        self.words = a.word_count
+        self.tokens = a.token_counts
+        self.fillers = [{**f, "start": f["start"] + offset, "end": f["end"] + offset} for f in find_fillers(a)]
+        self.concepts = {c: (s + offset, e + offset) for c, (s, e) in CONCEPT_MATCHER.find(text).items()}
+        for concept, extractor in EXTRACTORS.items():
+            if concept not in self.concepts and extractor(a):
+                self.concepts[concept] = None
+        self.salutations = salutation_phrases(low)
+        indices = [low.find(p) for p in SALUTATION_PHRASES if p in low]
+        self.salutation_idx = min(indices) + offset if indices else -1
+        closing = max(low.rfind(c) for c in CLOSING_PHRASES)
+        self.closing_idx = closing + offset if closing != -1 else -1
+        self.pos = ensure_vader().polarity_scores(text)["pos"] if self.words else 0.0
+
+
+class LiveSession:
+    """
+    Running metric state for a transcript that arrives in fragments.
+
+    Each completed sentence is folded into the state exactly once; the open
+    (unterminated) sentence is re-analysed per update, so an update costs time
+    proportional to the new text plus the open sentence rather than the whole
+    transcript. An open sentence is closed after LIVE_MAX_OPEN_WORDS words,
+    which bounds that cost for unpunctuated text. Grammar and semantic checks
+    run only on newly completed sentences. Engagement is the word-weighted mean of per-sentence VADER
+    scores and semantic coverage keeps each anchor's best sentence, so live
+    values approximate the full evaluation returned at the end.
+    """
+
+    def __init__(self, semantic: bool = ENABLE_SEMANTIC):
+        self.semantic = semantic
+        self.text = ""
+        self.updates = 0
+        self._closed = 0  # offset just past the last completed sentence
+        self.word_count = 0
+        self.sentence_count = 0
+        self.token_counts = Counter()
+        self.fillers = []
+        self.concepts: Dict = {}
+        self.salutations = set()
+        self.salutation_idx = -1
+        self.closing_idx = -1
+        self.pos_weighted = 0.0
+        self.grammar_errors = 0
+        self.grammar_words = 0
+        self.grammar_ok = True
+        self.anchor_best = None  # per-anchor best similarity
+        self.anchor_sentences = None
+        self.embedded_sentences = 0
+
+    def append(self, fragment: str) -> list:
+        """Add a fragment; returns the sentences it completed."""
+        if len(self.text) + len(fragment) > LIVE_MAX_CHARS:
+            raise ValueError(f"Transcript exceeds {LIVE_MAX_CHARS} characters.")
+        scan_from = len(self.text)
+        self.text += fragment
+        completed = []
+        last = None
+        for last in TERMINATOR_RE.finditer(self.text, scan_from):
+            pass
+        if last is not None:
+            completed = self._fold_region(self._closed, last.end())
+            self._closed = last.end()
+        return completed + self._close_long_segments()
+
+    def _close_long_segments(self) -> list:
+        """Fold the open text in LIVE_MAX_OPEN_WORDS-word segments, leaving a shorter open tail."""
+        completed = []
+        while True:
+            words = list(islice(TOKEN_RE.finditer(self.text, self._closed), LIVE_MAX_OPEN_WORDS))
+            boundary = words[-1].end() if len(words) == LIVE_MAX_OPEN_WORDS else None
+            if boundary is None or boundary == len(self.text):  # the last word may still grow
+                return completed
+            completed += self._fold_region(self._closed, boundary)
+            self._closed = boundary
+
+    def finish(self) -> list:
+        """Treat the open sentence as complete (end of speech)."""
+        completed = self._fold_region(self._closed, len(self.text))
+        self._closed = len(self.text)
+        return completed
+
+    def _segments(self, start: int, end: int) -> list:
+        return [_Segment(m.group(), m.start()) for m in SENTENCE_RE.finditer(self.text, start, end)]
+
+    def _fold_region(self, start: int, end: int) -> list:
+        completed = []
+        for seg in self._segments(start, end):
+            if not seg.text:
+                continue
+            self.sentence_count += 1
+            self.word_count += seg.words
+            self.token_counts.update(seg.tokens)
+            self.fillers.extend(seg.fillers)
+            self._merge_concepts(self.concepts, seg.concepts)
+            self.salutations |= seg.salutations
+            self.salutation_idx = _first(self.salutation_idx, seg.salutation_idx)
+            self.closing_idx = max(self.closing_idx, seg.closing_idx)
+            self.pos_weighted += seg.pos * seg.words
+            # keep terminal punctuation, as grammar_metric sends sentences
+            stop = seg.end
+            while stop < len(self.text) and self.text[stop] in ".!?":
+                stop += 1
+            completed.append(self.text[seg.end - len(seg.text):stop])
+        return completed
+
+    @staticmethod
+    def _merge_concepts(into: Dict, new: Dict) -> None:
+        for concept, span in new.items():
+            # earlier sentences win; a regex span replaces an extraction-only hit
+            if concept not in into or (into[concept] is None and span is not None):
+                into[concept] = span
+
+    def add_grammar(self, sentences: list) -> None:
+        """Check newly completed sentences (through the sentence-level grammar cache)."""
+        words = sum(len(TranscriptAnalysis(s).tokens) for s in sentences)
+        try:
+            per_sentence = check_sentences(sentences, get_grammar_pool())
+        except Exception:
+            self.grammar_ok = False
+            return
+        self.grammar_errors += sum(count_grammar_errors(m) for m in per_sentence)
+        self.grammar_words += words
+
+    def add_semantic(self, sentences: list) -> None:
+        """Embed newly completed sentences and keep each anchor's best match."""
+        from .semantic import embed_texts, get_anchor_matrix
+        sims = embed_texts(sentences) @ get_anchor_matrix().T
+        best = sims.argmax(axis=0)
+        if self.anchor_best is None:
+            self.anchor_best = [-1.0] * sims.shape[1]
+            self.anchor_sentences = [None] * sims.shape[1]
+        for anchor, row in enumerate(best):
+            if sims[row, anchor] > self.anchor_best[anchor]:
+                self.anchor_best[anchor] = float(sims[row, anchor])
+                self.anchor_sentences[anchor] = sentences[row]
+        self.embedded_sentences += len(sentences)
+
+    def _results(self, duration_seconds: float | None) -> tuple:
+        """(word count, metric details) over completed sentences plus the provisional open one."""
+        open_segments = [s for s in self._segments(self._closed, len(self.text)) if s.text]
+        words = self.word_count + sum(s.words for s in open_segments)
+        new_types = set()
+        for seg in open_segments:
+            new_types.update(t for t in seg.tokens if t not in self.token_counts)
+        concepts = dict(self.concepts)
+        salutations = set(self.salutations)
+        sal_idx, closing_idx = self.salutation_idx, self.closing_idx
+        pos_weighted = self.pos_weighted
+        for seg in open_segments:
+            self._merge_concepts(concepts, seg.concepts)
+            salutations |= seg.salutations
+            sal_idx = _first(sal_idx, seg.salutation_idx)
+            closing_idx = max(closing_idx, seg.closing_idx)
+            pos_weighted += seg.pos * seg.words
+        fillers = self.fillers + [f for seg in open_segments for f in seg.fillers]
+
+        def first_concept(names):
+            indices = [concepts[c][0] for c in names if concepts.get(c)]
+            return min(indices) if indices else -1
+
+        results = {
+            "salutation": salutation_from_phrases(salutations),
+            "keywords": keyword_presence_from_matches(concepts),
+            "flow": flow_from_positions(sal_idx, first_concept(BASIC_CONCEPTS),
+                                        first_concept(GOOD_TO_HAVE_CONCEPTS), closing_idx),
+            "speech_rate": speech_rate_metric(words, duration_seconds),
+            "grammar": grammar_from_errors(self.grammar_errors, self.grammar_words)
+                       if self.grammar_ok else grammar_unavailable(),
+            "vocabulary": vocabulary_from_counts(len(self.token_counts) + len(new_types), words),
+            "clarity": filler_metric_from_spans(fillers, words),
+            "engagement": sentiment_from_scores({"pos": pos_weighted / words if words else 0.0}),
+        }
+        if self.semantic and self.anchor_best is not None:
+            from .semantic import coverage_from_best_matches
+            results["concept"] = coverage_from_best_matches(
+                self.anchor_best, self.anchor_sentences,
+                self.embedded_sentences, mode="live")
+        elif self.semantic:
+            results["concept"] = {"average_similarity": None, "band": "pending", "score": 0, "max": 10}
+        else:
+            results["concept"] = conceptual_coverage(self.text)
+        return words, results
+
+    def snapshot(self, duration_seconds: float | None = None) -> dict:
+        start = time.perf_counter()
+        words, results = self._results(duration_seconds)
+        metrics = [
+            MetricScore(id=metric_id, name=name, raw_score=results[metric_id]["score"],
+                        max_score=results[metric_id]["max"], details=results[metric_id],
+                        feedback=build_feedback(metric_id, results[metric_id])).model_dump()
+            for metric_id, name in METRIC_NAMES
+        ]
+        return {
+            "type": "update",
+            "sequence": self.updates,
+            "total_score": round(sum(m["raw_score"] for m in metrics), 2),
+            "max_total": 110 if self.semantic else 100,
+            "word_count": words,
+            "sentence_count": self.sentence_count,
+            "metrics": metrics,
+            "performance_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    async def update(self, fragment: str, duration_seconds: float | None = None,
+                     final: bool = False) -> dict:
+        """Append a fragment, check newly completed sentences, return the updated snapshot."""
+        loop = asyncio.get_running_loop()
+        # Segment analysis (including VADER) is CPU work; keep it off the event loop
+        completed = await loop.run_in_executor(get_cpu_executor(), self._advance, fragment, final)
+        if completed:
+            checks = [loop.run_in_executor(get_io_executor(), self.add_grammar, completed)]
+            if self.semantic:
+                checks.append(loop.run_in_executor(get_cpu_executor(), self.add_semantic, completed))
+            await asyncio.gather(*checks)
+        self.updates += 1
+        return await loop.run_in_executor(get_cpu_executor(), self.snapshot, duration_seconds)
+
+    def _advance(self, fragment: str, final: bool) -> list:
+        completed = self.append(fragment)
+        if final:
+            completed += self.finish()
+        return completed
@@ -1,13 +1,16 @@
 import re
 from typing import Dict
-from language_tool_python import LanguageTool
 from .constants import (
     SALUTATION_LEVELS,
     MUST_HAVE_KEYWORDS,
     GOOD_TO_HAVE_KEYWORDS,
-    FILLER_WORDS
+    FILLER_WORDS,
+    FILLER_EXCEPTIONS
 )
-from .utils import word_tokens, type_token_ratio, ensure_vader
+from .utils import ensure_vader
+from .analysis import TranscriptAnalysis, analyze
+from .concept_matcher import ConceptMatcher
+from .grammar import check_sentences, get_grammar_pool
 from .extraction import extract_name, extract_age, extract_class, extract_school_class_phrase
 
 # --- Concept pattern configuration ---
@@ -18,21 +21,21 @@ MUST_HAVE_CONCEPTS = {
             r"\bmyself\s+[A-Z][a-zA-Z]+",
             r"\bi am\s+[A-Z][a-zA-Z]+\b"  # occasionally “I am Muskan”
         ],
-        "extraction": lambda text: extract_name(text) is not None
+        "extraction": lambda a: extract_name(a) is not None
     },
     "age": {
         "regex": [
             r"\bI am\s+\d{1,2}\s+years?\s+old\b",
             r"\bI'm\s+\d{1,2}\s+years?\s+old\b",
         ],
-        "extraction": lambda text: extract_age(text) is not None
+        "extraction": lambda a: extract_age(a) is not None
     },
     "class": {
         "regex": [
             r"\bclass\s+\d{1,2}\w?\b",
             r"\bstudying in class\s+\d{1,2}\w?\b"
         ],
-        "extraction": lambda text: extract_class(text) is not None
+        "extraction": lambda a: extract_class(a) is not None
     },
     "school": {
         "regex": [
@@ -42,7 +45,7 @@ MUST_HAVE_CONCEPTS = {
             r"\bAcademy\b",
             r"\bCollege\b"
         ],
-        "extraction": lambda text: extract_school_class_phrase(text) is not None
+        "extraction": lambda a: extract_school_class_phrase(a) is not None
     },
     "family": {
         "regex": [
@@ -142,28 +145,34 @@ GOOD_TO_HAVE_CONCEPTS = {
     }
 }
 
-def _concept_found(text: str, concept_def: dict) -> bool:
-    low = text.lower()
-    # regex patterns
-    for pattern in concept_def.get("regex", []):
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            return True
-    # extraction function if present
-    extractor = concept_def.get("extraction")
-    if extractor and extractor(text):
-        return True
-    return False
-
-def keyword_presence(text: str) -> Dict:
-    must_found = []
-    for concept in MUST_HAVE_CONCEPTS:
-        if _concept_found(text, MUST_HAVE_CONCEPTS[concept]):
-            must_found.append(concept)
-
-    good_found = []
-    for concept in GOOD_TO_HAVE_CONCEPTS:
-        if _concept_found(text, GOOD_TO_HAVE_CONCEPTS[concept]):
-            good_found.append(concept)
+# All concept patterns compiled once, matched in a single pass per transcript
+CONCEPT_MATCHER = ConceptMatcher({
+    concept: definition["regex"]
+    for group in (MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS)
+    for concept, definition in group.items()
+})
+
+def _match_concepts(analysis: TranscriptAnalysis) -> Dict:
+    found = CONCEPT_MATCHER.find(analysis.text)
+    # extraction function if present (no offset available)
+    for group in (MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS):
+        for concept, definition in group.items():
+            extractor = definition.get("extraction")
+            if concept not in found and extractor and extractor(analysis):
+                found[concept] = None
+    return found
+
+def concept_matches(text: str | TranscriptAnalysis) -> Dict:
+    """Concept -> (start, end) of its first regex match, or None if only extraction found it."""
+    return analyze(text).cached("concept_matches", _match_concepts)
+
+def keyword_presence(text: str | TranscriptAnalysis) -> Dict:
+    return keyword_presence_from_matches(concept_matches(text))
+
+def keyword_presence_from_matches(matches: Dict) -> Dict:
+    """Score a concept -> span mapping (e.g. accumulated by a live session)."""
+    must_found = [c for c in MUST_HAVE_CONCEPTS if c in matches]
+    good_found = [c for c in GOOD_TO_HAVE_CONCEPTS if c in matches]
 
     # Each must-have concept = 4 points; each good-to-have concept = 2 points
     must_score = len(must_found) * 4
@@ -187,33 +196,48 @@ def keyword_presence(text: str) -> Dict:
     }
 
 # ---------------- Existing functions (unchanged except import additions) ----------------
-def detect_salutation(text: str) -> Dict:
-    low = text.lower()
-    level = "none"
+def detect_salutation(text: str | TranscriptAnalysis) -> Dict:
+    return salutation_from_phrases(salutation_phrases(analyze(text).lower))
+
+def salutation_phrases(low: str) -> set:
+    """Every salutation phrase present in lowercased text."""
+    found = {p for p in SALUTATION_LEVELS["excellent"] + SALUTATION_LEVELS["good"] if p in low}
+    found.update(p for p in SALUTATION_LEVELS["normal"] if re.search(r'\b' + re.escape(p) + r'\b', low))
+    return found
+
+def salutation_from_phrases(found: set) -> Dict:
+    """Highest level with a phrase present; the first such phrase in list order is reported."""
     score_map = {"none": 0, "normal": 2, "good": 4, "excellent": 5}
-    matched = []
-    for phrase in SALUTATION_LEVELS["excellent"]:
-        if phrase in low:
-            level = "excellent"; matched.append(phrase); break
-    if level == "none":
-        for phrase in SALUTATION_LEVELS["good"]:
-            if phrase in low:
-                level = "good"; matched.append(phrase); break
-    if level == "none":
-        for phrase in SALUTATION_LEVELS["normal"]:
-            if re.search(r'\b' + re.escape(phrase) + r'\b', low):
-                level = "normal"; matched.append(phrase); break
-    return {"level": level, "matched": matched, "score": score_map[level], "max": 5}
-
-def flow_order(text: str) -> Dict:
-    norm = text.lower()
+    for level in ("excellent", "good", "normal"):
+        for phrase in SALUTATION_LEVELS[level]:
+            if phrase in found:
+                return {"level": level, "matched": [phrase], "score": score_map[level], "max": 5}
+    return {"level": "none", "matched": [], "score": score_map["none"], "max": 5}
+
+# Phrases whose first offset marks the salutation / last offset marks the closing
+SALUTATION_PHRASES = SALUTATION_LEVELS["excellent"] + SALUTATION_LEVELS["good"] + SALUTATION_LEVELS["normal"]
+CLOSING_PHRASES = ["thank you", "thanks"]
+BASIC_CONCEPTS = ["name", "age", "class", "school"]
+
+def flow_order(text: str | TranscriptAnalysis) -> Dict:
+    a = analyze(text)
+    norm = a.lower
+    matches = concept_matches(a)
     def first_index(candidates):
         indices = [norm.find(c) for c in candidates if norm.find(c) != -1]
         return min(indices) if indices else -1
-    sal_idx = first_index(SALUTATION_LEVELS["excellent"] + SALUTATION_LEVELS["good"] + SALUTATION_LEVELS["normal"])
-    basic_idx = first_index(["name", "age", "class", "school"])
-    additional_idx = first_index(list(GOOD_TO_HAVE_CONCEPTS.keys()))
-    closing_idx = max(norm.rfind("thank you"), norm.rfind("thanks"))
+    def first_concept(concepts):
+        # reuse offsets from the single concept-matching pass
+        indices = [matches[c][0] for c in concepts if matches.get(c)]
+        return min(indices) if indices else -1
+    sal_idx = first_index(SALUTATION_PHRASES)
+    basic_idx = first_concept(BASIC_CONCEPTS)
+    additional_idx = first_concept(GOOD_TO_HAVE_CONCEPTS)
+    closing_idx = max(norm.rfind(c) for c in CLOSING_PHRASES)
+    return flow_from_positions(sal_idx, basic_idx, additional_idx, closing_idx)
+
+def flow_from_positions(sal_idx: int, basic_idx: int, additional_idx: int, closing_idx: int) -> Dict:
+    """Score section offsets (-1 = absent) for the expected order."""
     order_components = {
         "salutation": sal_idx,
         "basic_details": basic_idx,
@@ -238,22 +262,46 @@ def speech_rate_metric(word_count: int, duration_seconds: float | None) -> Dict:
     else: score, band = 2, "too slow"
     return {"wpm": round(wpm,2), "band": band, "score": score, "max": 10}
 
-def grammar_metric(text: str) -> Dict:
-    words = word_tokens(text)
-    wc = len(words)
+def grammar_metric(text: str | TranscriptAnalysis) -> Dict:
+    a = analyze(text)
+    return grammar_from_matches(grammar_matches(a), a.word_count)
+
+def grammar_matches(a: TranscriptAnalysis) -> list | None:
+    """Per-sentence LanguageTool matches, or None when LanguageTool is unavailable."""
     try:
-        tool = LanguageTool('en-US')
-        matches = tool.check(text)
+        # Per-sentence cached checks; only changed / unseen sentences reach LanguageTool
+        return check_sentences(grammar_sentences(a), get_grammar_pool())
     except Exception:
-        return {
-            "errors": 0, "errors_per_100_words": 0.0,
-            "grammar_score_raw": 1.0, "band": ">0.9",
-            "score": 10, "max": 10,
-            "note": "LanguageTool unavailable; default high score."
-        }
-    def issue_type(match):
-        return getattr(match, "rule_issue_type", "other")
-    error_count = len([m for m in matches if issue_type(m) != 'whitespace'])
+        return None
+
+def grammar_from_matches(per_sentence: list | None, wc: int) -> Dict:
+    if per_sentence is None:
+        return grammar_unavailable()
+    return grammar_from_errors(sum(count_grammar_errors(m) for m in per_sentence), wc)
+
+def grammar_sentences(a: TranscriptAnalysis) -> list:
+    """Sentences with their terminal punctuation, as LanguageTool should see them."""
+    text = a.text
+    sentences = []
+    for start, end in a.sentence_spans:
+        while end < len(text) and text[end] in ".!?":
+            end += 1
+        sentences.append(text[start:end])
+    return sentences
+
+def grammar_unavailable() -> Dict:
+    return {
+        "errors": 0, "errors_per_100_words": 0.0,
+        "grammar_score_raw": 1.0, "band": ">0.9",
+        "score": 10, "max": 10, "unavailable": True,
+        "note": "LanguageTool unavailable; default high score."
+    }
+
+def count_grammar_errors(matches: list) -> int:
+    """LanguageTool matches that count as errors (whitespace issues are ignored)."""
+    return len([m for m in matches if getattr(m, "rule_issue_type", "other") != 'whitespace'])
+
+def grammar_from_errors(error_count: int, wc: int) -> Dict:
     errors_per_100 = (error_count / wc * 100) if wc else 0
     grammar_score_raw = 1 - min(errors_per_100 / 10, 1)
     if grammar_score_raw > 0.9: score, band = 10, ">0.9"
@@ -270,9 +318,13 @@ def grammar_metric(text: str) -> Dict:
         "max": 10
     }
 
-def vocabulary_metric(text: str) -> Dict:
-    words = word_tokens(text)
-    ttr = type_token_ratio(words)
+def vocabulary_metric(text: str | TranscriptAnalysis) -> Dict:
+    a = analyze(text)
+    # distinct / total, from the shared token counts
+    return vocabulary_from_counts(len(a.token_counts), a.word_count)
+
+def vocabulary_from_counts(distinct: int, total: int) -> Dict:
+    ttr = distinct / total if total else 0.0
     if ttr >= 0.9: score, band = 10, "0.9–1.0"
     elif ttr >= 0.7: score, band = 8, "0.7–0.89"
     elif ttr >= 0.5: score, band = 6, "0.5–0.69"
@@ -280,13 +332,48 @@ def vocabulary_metric(text: str) -> Dict:
     else: score, band = 2, "0–0.29"
     return {"ttr": round(ttr,3), "band": band, "score": score, "max": 10}
 
-def filler_words_metric(text: str) -> Dict:
-    words = word_tokens(text)
-    wc = len(words)
-    low = text.lower()
-    filler_count = 0
-    for fw in FILLER_WORDS:
-        filler_count += len(re.findall(r'\b' + re.escape(fw) + r'\b', low))
+# First token -> filler token tuples (longest first), built once at import
+FILLER_INDEX: Dict[str, list] = {}
+for _fw in FILLER_WORDS:
+    _parts = tuple(_fw.split())
+    FILLER_INDEX.setdefault(_parts[0], []).append(_parts)
+for _candidates in FILLER_INDEX.values():
+    _candidates.sort(key=len, reverse=True)
+
+def find_fillers(text: str | TranscriptAnalysis) -> list:
+    """
+    One linear pass over the token stream. Multi-word fillers are matched
+    longest-first and consume their tokens, so nothing is counted twice.
+    Returns [{"filler", "start", "end"}] with character offsets into the text.
+    """
+    a = analyze(text)
+    tokens, spans = a.tokens, a.token_spans
+    found = []
+    i, n = 0, len(tokens)
+    while i < n:
+        step = 1
+        for parts in FILLER_INDEX.get(tokens[i], ()):
+            size = len(parts)
+            if tokens[i:i + size] != parts:
+                continue
+            filler = " ".join(parts)
+            if i and tokens[i - 1] in FILLER_EXCEPTIONS.get(filler, ()):
+                continue
+            found.append({"filler": filler, "start": spans[i][0], "end": spans[i + size - 1][1]})
+            step = size
+            break
+        i += step
+    return found
+
+def filler_words_metric(text: str | TranscriptAnalysis) -> Dict:
+    a = analyze(text)
+    return filler_metric_from_spans(find_fillers(a), a.word_count)
+
+def filler_metric_from_spans(spans: list, wc: int) -> Dict:
+    filler_count = len(spans)
+    per_filler: Dict[str, int] = {}
+    for hit in spans:
+        per_filler[hit["filler"]] = per_filler.get(hit["filler"], 0) + 1
     rate = (filler_count / wc * 100) if wc else 0
     if rate <= 3: score, band = 15, "0–3"
     elif rate <= 6: score, band = 12, "4–6"
@@ -295,15 +382,25 @@ def filler_words_metric(text: str) -> Dict:
     else: score, band = 3, "13+"
     return {
         "filler_count": filler_count,
+        "filler_counts": per_filler,
+        "filler_spans": spans,
         "rate_percent": round(rate,2),
         "band": band,
         "score": score,
         "max": 15
     }
 
-def sentiment_metric(text: str) -> Dict:
-    sia = ensure_vader()
-    scores = sia.polarity_scores(text)
+def sentiment_metric(text: str | TranscriptAnalysis) -> Dict:
+    return sentiment_from_scores(sentiment_scores(text))
+
+def sentiment_scores(text: str | TranscriptAnalysis) -> Dict:
+    """VADER polarity scores of the whole transcript."""
+    if isinstance(text, TranscriptAnalysis):
+        text = text.text
+    return ensure_vader().polarity_scores(text)
+
+def sentiment_from_scores(scores: Dict) -> Dict:
+    """Band VADER polarity scores (e.g. from polarity_scores_many)."""
     pos = scores.get("pos", 0.0)
     if pos >= 0.9: score, band = 15, ">=0.9"
     elif pos >= 0.7: score, band = 12, "0.7–0.89"
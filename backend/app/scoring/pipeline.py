@@ -1,51 +1,89 @@
 from typing import List
 from app.models import Rubric, ScoreResponse, CriterionScore
-from .keyword_extractor import keyword_match, keyword_score
-from .semantic import semantic_similarity, band
+from .keyword_extractor import KeywordMatcher, keyword_score
 from .weighting import length_score, combine
-from .feedback import build_feedback
-
-def score_transcript(transcript: str, rubric: Rubric) -> ScoreResponse:
-    word_count = len(transcript.split())
-    criterion_scores: List[CriterionScore] = []
-    total_weighted = 0.0
-    active_weight_sum = 0.0
-
-    for c in rubric.criteria:
-        if not c.enabled:
-            continue
-        found, missing = keyword_match(transcript, c.keywords)
-        k_score = keyword_score(found, len(c.keywords))
-        s_score = semantic_similarity(transcript, c.description)
-        l_score = length_score(word_count, c.min_words, c.max_words)
-        combined = combine(k_score, s_score, l_score, c.scoring_config)
-        weighted = combined * c.weight
-        alignment_band = band(s_score)
-        feedback = build_feedback(found, missing, s_score, l_score,
-                                  c.min_words, c.max_words, word_count)
-
-        criterion_scores.append(CriterionScore(
-            id=c.id,
-            name=c.name,
-            weight=c.weight,
-            keyword_score=round(k_score, 3),
-            semantic_score=round(s_score, 3),
-            length_score=round(l_score, 3),
-            combined_score=round(combined, 3),
-            weighted_score=round(weighted, 3),
-            keywords_found=found,
-            keywords_missing=missing,
-            feedback=feedback,
-            alignment_band=alignment_band
-        ))
-        total_weighted += weighted
-        active_weight_sum += c.weight
-
-    overall = (total_weighted / active_weight_sum) * 100 if active_weight_sum > 0 else 0.0
-    preview = transcript[:240] + ("..." if len(transcript) > 240 else "")
-    return ScoreResponse(
-        overall_score=round(overall, 2),
-        word_count=word_count,
-        criteria=criterion_scores,
-        transcript_preview=preview
-    )
\ No newline at end of file
+from .feedback import build_feedback, band
+from .pipeline_v2 import ENABLE_SEMANTIC
+from .utils import word_tokens
+
+
+class CompiledRubric:
+    """
+    A rubric prepared once for repeated scoring: one keyword matcher over every
+    criterion's keywords and, with semantic scoring on, a normalized matrix of
+    description embeddings. Scoring a transcript then costs one tokenization,
+    one (cached) transcript encode and one matrix-vector product.
+    """
+
+    def __init__(self, rubric: Rubric, semantic: bool = ENABLE_SEMANTIC):
+        self.rubric = rubric
+        self.criteria = [c for c in rubric.criteria if c.enabled]
+        self.semantic = semantic
+        self.matcher = KeywordMatcher(kw for c in self.criteria for kw in c.keywords)
+        self.description_matrix = None
+        if semantic and self.criteria:
+            from .semantic import get_semantic_model, normalize_rows
+            self.description_matrix = normalize_rows(
+                get_semantic_model().encode([c.description for c in self.criteria])
+            )
+
+    def semantic_scores(self, transcript: str) -> list:
+        if self.description_matrix is None:
+            return [None] * len(self.criteria)
+        from .semantic import embed_texts
+        return (self.description_matrix @ embed_texts([transcript])[0]).tolist()
+
+    def score(self, transcript: str) -> ScoreResponse:
+        word_count = len(transcript.split())
+        present = self.matcher.present(word_tokens(transcript))
+        semantic_scores = self.semantic_scores(transcript)
+        criterion_scores: List[CriterionScore] = []
+        total_weighted = 0.0
+        active_weight_sum = 0.0
+
+        for c, s_score in zip(self.criteria, semantic_scores):
+            found, missing = self.matcher.split(present, c.keywords)
+            k_score = keyword_score(found, len(c.keywords))
+            l_score = length_score(word_count, c.min_words, c.max_words)
+            combined = combine(k_score, s_score, l_score, c.scoring_config)
+            weighted = combined * c.weight
+            alignment_band = band(s_score)
+            feedback = build_feedback(found, missing, s_score, l_score,
+                                      c.min_words, c.max_words, word_count)
+
+            criterion_scores.append(CriterionScore(
+                id=c.id,
+                name=c.name,
+                weight=c.weight,
+                keyword_score=round(k_score, 3),
+                semantic_score=round(s_score or 0.0, 3),
+                length_score=round(l_score, 3),
+                combined_score=round(combined, 3),
+                weighted_score=round(weighted, 3),
+                keywords_found=found,
+                keywords_missing=missing,
+                feedback=feedback,
+                alignment_band=alignment_band
+            ))
+            total_weighted += weighted
+            active_weight_sum += c.weight
+
+        overall = (total_weighted / active_weight_sum) * 100 if active_weight_sum > 0 else 0.0
+        preview = transcript[:240] + ("..." if len(transcript) > 240 else "")
+        return ScoreResponse(
+            overall_score=round(overall, 2),
+            word_count=word_count,
+            criteria=criterion_scores,
+            transcript_preview=preview
+        )
+
+
+def get_compiled_rubric() -> CompiledRubric:
+    """Currently active compiled rubric (hot-reloaded by the rubric registry)."""
+    from .rubric_loader import get_rubric_registry
+    return get_rubric_registry().current().compiled
+
+
+def score_transcript(transcript: str, rubric: Rubric | CompiledRubric) -> ScoreResponse:
+    compiled = rubric if isinstance(rubric, CompiledRubric) else CompiledRubric(rubric)
+    return compiled.score(transcript)
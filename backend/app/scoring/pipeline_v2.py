@@ -1,27 +1,48 @@
-import time
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from app.models import EvaluationResponse, MetricScore, ExtractedDetails
 from .metrics import (
     detect_salutation,
     keyword_presence,
     flow_order,
     speech_rate_metric,
-    grammar_metric,
+    grammar_matches,
+    grammar_from_matches,
     vocabulary_metric,
     filler_words_metric,
-    sentiment_metric
+    sentiment_scores,
+    sentiment_from_scores
 )
 from .extraction import (
     extract_name, extract_age,
     extract_class, extract_school_class_phrase
 )
-from .utils import word_tokens, sentence_split
+from .analysis import TranscriptAnalysis
+from .utils import polarity_scores_many
+from .executors import get_cpu_executor, get_io_executor
+from .telemetry import StageTimer
+from .registry import LIGHT_INPUTS, METRICS, InputSpec, MetricSpec
 
 # Simple toggle (environment variable)
 ENABLE_SEMANTIC = os.getenv("ENABLE_SEMANTIC", "false").lower() == "true"
+PIPELINE_VERSION = "2.1.1" if ENABLE_SEMANTIC else "2.1.1-lite"
+# Threads used to run per-transcript metrics in evaluate_batch_v2
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+# Default latency budget (ms) for the heavy metrics; 0 = no deadline
+SCORING_DEADLINE_MS = float(os.getenv("SCORING_DEADLINE_MS", "0"))
 
 if ENABLE_SEMANTIC:
-    from .semantic import conceptual_coverage  # heavy
+    from .semantic import (  # heavy
+        SEMANTIC_MODE, EMBEDDING_BACKEND, conceptual_coverage, conceptual_coverage_many,
+        anchor_similarities, coverage_from_anchor_similarities
+    )
+    # Distinct result-cache keys per mode / backend
+    if SEMANTIC_MODE == "chunked":
+        PIPELINE_VERSION += "-chunked"
+    if EMBEDDING_BACKEND != "torch":
+        PIPELINE_VERSION += f"-{EMBEDDING_BACKEND}"
 else:
     # Lightweight stub metric
     def conceptual_coverage(transcript: str):
@@ -35,7 +56,19 @@ else:
             "note": "Semantic metric disabled"
         }
 
+    def conceptual_coverage_many(transcripts: list):
+        return [conceptual_coverage(t) for t in transcripts]
+
+def validation_error(txt: str) -> str | None:
+    if not txt:
+        return "Transcript is empty."
+    if len(txt.split()) < 10:
+        return "Transcript too short for meaningful scoring (>=10 words required)."
+    return None
+
 def build_feedback(metric_id: str, details: dict) -> str:
+    if details.get("timed_out"):
+        return "Skipped: not finished within the latency budget."
     if metric_id == "salutation":
         lvl = details["level"]
         return "No greeting detected." if lvl == "none" else f"Greeting level: {lvl.capitalize()}."
@@ -64,66 +97,246 @@ def build_feedback(metric_id: str, details: dict) -> str:
         if details.get("band") == "disabled":
             return "Semantic coverage disabled."
         return f"Conceptual coverage {details['average_similarity']} ({details['band']})."
-    return ""
-
-def evaluate_transcript_v2(transcript: str, duration_seconds: float | None = None) -> EvaluationResponse:
-    start = time.time()
-    words = word_tokens(transcript)
-    sentences = sentence_split(transcript)
-    wc = len(words)
-    sc = len(sentences)
-    preview = transcript[:240] + ("..." if len(transcript) > 240 else "")
+    spec = METRICS.get(metric_id)
+    return spec.feedback(details) if spec and spec.feedback else ""
+
+# Built-in shared inputs and metrics, in response order; plugins register more on METRICS
+# (read the live set from METRICS, not from METRIC_NAMES). The heavy inputs are timed under
+# their metric's stage, so grammar / engagement / concept timings keep covering the engine work.
+METRICS.register_input(InputSpec("grammar_matches", "io", grammar_matches, stage="grammar"))
+METRICS.register_input(InputSpec("sentiment", "cpu", sentiment_scores, stage="engagement"))
+if ENABLE_SEMANTIC:
+    METRICS.register_input(InputSpec("embeddings", "cpu", lambda a: anchor_similarities(a.text), stage="concept"))
 
-    sal = detect_salutation(transcript)
-    kw = keyword_presence(transcript)
-    fl = flow_order(transcript)
-    sr = speech_rate_metric(wc, duration_seconds)
-    gr = grammar_metric(transcript)
-    vb = vocabulary_metric(transcript)
-    clr = filler_words_metric(transcript)
-    sg = sentiment_metric(transcript)
-    cc = conceptual_coverage(transcript)
+METRICS.register(MetricSpec("salutation", "Salutation Level", 5, ("text",),
+                            lambda a, d, x: detect_salutation(a)))
+METRICS.register(MetricSpec("keywords", "Keyword Presence", 30, ("text",),
+                            lambda a, d, x: keyword_presence(a)))
+METRICS.register(MetricSpec("flow", "Flow Order", 5, ("text",),
+                            lambda a, d, x: flow_order(a)))
+METRICS.register(MetricSpec("speech_rate", "Speech Rate (WPM)", 10, ("tokens", "duration"),
+                            lambda a, d, x: speech_rate_metric(a.word_count, d)))
+METRICS.register(MetricSpec("grammar", "Grammar Quality", 10, ("sentences", "grammar_matches"),
+                            lambda a, d, x: grammar_from_matches(x["grammar_matches"], a.word_count)))
+METRICS.register(MetricSpec("vocabulary", "Vocabulary Richness (TTR)", 10, ("tokens",),
+                            lambda a, d, x: vocabulary_metric(a)))
+METRICS.register(MetricSpec("clarity", "Clarity (Filler Rate)", 15, ("tokens",),
+                            lambda a, d, x: filler_words_metric(a)))
+METRICS.register(MetricSpec("engagement", "Engagement (Sentiment)", 15, ("sentiment",),
+                            lambda a, d, x: sentiment_from_scores(x["sentiment"])))
+if ENABLE_SEMANTIC:
+    METRICS.register(MetricSpec("concept", "Conceptual Coverage", 10, ("embeddings",),
+                                lambda a, d, x: coverage_from_anchor_similarities(x["embeddings"])))
+else:
+    # Reported for a stable response shape, not counted in max_total
+    METRICS.register(MetricSpec("concept", "Conceptual Coverage", 10, ("text",),
+                                lambda a, d, x: conceptual_coverage(a.text), in_total=False))
+
+# Built-in metrics: response order and display names
+METRIC_NAMES = [(spec.id, spec.name) for spec in METRICS.all()]
+
+def timed_out_metric(metric_id: str, deadline_ms: float) -> dict:
+    """Fallback for a heavy metric that missed the deadline: 0 points, excluded from max_total."""
+    return {
+        "timed_out": True,
+        "band": "timed_out",
+        "score": 0,
+        "max": METRICS.get(metric_id).max_score,
+        "note": f"Not finished within {deadline_ms:g} ms; excluded from max_total."
+    }
+
+def _resolve_deadline(deadline_ms: float | None) -> float | None:
+    deadline_ms = SCORING_DEADLINE_MS if deadline_ms is None else deadline_ms
+    return deadline_ms if deadline_ms and deadline_ms > 0 else None
+
+def _extract_details(analysis: TranscriptAnalysis) -> ExtractedDetails:
+    cls = extract_class(analysis)
+    school_phrase = extract_school_class_phrase(analysis)
+    return ExtractedDetails(
+        name=extract_name(analysis),
+        age=extract_age(analysis),
+        school_class=school_phrase or (f"Class {cls}" if cls else None)
+    )
 
+def _assemble_response(analysis: TranscriptAnalysis, duration_seconds: float | None,
+                       specs: list, results: dict, timer: StageTimer) -> EvaluationResponse:
+    # Partial results are marked explicitly so caches / analytics never mistake them for full ones
+    selected = [spec.id for spec in specs] if len(specs) < len(METRICS.ids()) else None
+    transcript = analysis.text
+    preview = transcript[:240] + ("..." if len(transcript) > 240 else "")
     metrics = [
-        MetricScore(id="salutation", name="Salutation Level", raw_score=sal["score"], max_score=sal["max"], details=sal, feedback=build_feedback("salutation", sal)),
-        MetricScore(id="keywords", name="Keyword Presence", raw_score=kw["score"], max_score=kw["max"], details=kw, feedback=build_feedback("keywords", kw)),
-        MetricScore(id="flow", name="Flow Order", raw_score=fl["score"], max_score=fl["max"], details=fl, feedback=build_feedback("flow", fl)),
-        MetricScore(id="speech_rate", name="Speech Rate (WPM)", raw_score=sr["score"], max_score=sr["max"], details=sr, feedback=build_feedback("speech_rate", sr)),
-        MetricScore(id="grammar", name="Grammar Quality", raw_score=gr["score"], max_score=gr["max"], details=gr, feedback=build_feedback("grammar", gr)),
-        MetricScore(id="vocabulary", name="Vocabulary Richness (TTR)", raw_score=vb["score"], max_score=vb["max"], details=vb, feedback=build_feedback("vocabulary", vb)),
-        MetricScore(id="clarity", name="Clarity (Filler Rate)", raw_score=clr["score"], max_score=clr["max"], details=clr, feedback=build_feedback("clarity", clr)),
-        MetricScore(id="engagement", name="Engagement (Sentiment)", raw_score=sg["score"], max_score=sg["max"], details=sg, feedback=build_feedback("engagement", sg)),
-        MetricScore(id="concept", name="Conceptual Coverage", raw_score=cc["score"], max_score=cc["max"], details=cc, feedback=build_feedback("concept", cc)),
+        MetricScore(id=spec.id, name=spec.name, raw_score=results[spec.id]["score"],
+                    max_score=results[spec.id]["max"], details=results[spec.id],
+                    feedback=build_feedback(spec.id, results[spec.id]))
+        for spec in specs
     ]
 
     total = sum(m.raw_score for m in metrics)
 
-    from .extraction import extract_name, extract_age, extract_class, extract_school_class_phrase
-    name = extract_name(transcript)
-    age = extract_age(transcript)
-    cls = extract_class(transcript)
-    school_phrase = extract_school_class_phrase(transcript)
-    extracted = ExtractedDetails(
-        name=name,
-        age=age,
-        school_class=school_phrase or (f"Class {cls}" if cls else None)
-    )
-    perf_ms = int((time.time() - start) * 1000)
+    extracted = timer.run("extraction", _extract_details, analysis)
+    timer.timings["total"] = round(timer.elapsed_ms(), 3)
 
-    # Adjust max_total when semantic disabled
-    max_total = 110 if ENABLE_SEMANTIC else 100
+    # max_total covers the requested metrics, minus the semantic stub and any that timed out
+    timed_out = [m.id for m in metrics if m.details.get("timed_out")]
+    max_total = sum(spec.max_score for spec in specs if spec.in_total and spec.id not in timed_out)
+    speech_rate = results.get("speech_rate")
 
     return EvaluationResponse(
         total_score=round(total, 2),
         max_total=max_total,
-        word_count=wc,
-        sentence_count=sc,
+        word_count=analysis.word_count,
+        sentence_count=analysis.sentence_count,
         duration_seconds=duration_seconds,
-        wpm=sr.get("wpm"),
+        wpm=speech_rate.get("wpm") if speech_rate else None,
         metrics=metrics,
         extracted=extracted,
         transcript_preview=preview,
-        version="2.1.1" if ENABLE_SEMANTIC else "2.1.1-lite",
-        performance_ms=perf_ms,
-        notes="Semantic disabled" if not ENABLE_SEMANTIC else "Full metric set"
+        version=PIPELINE_VERSION,
+        performance_ms=int(timer.timings["total"]),
+        notes="Semantic disabled" if not ENABLE_SEMANTIC else "Full metric set",
+        timings=dict(timer.timings),
+        timed_out=timed_out,
+        selected_metrics=selected
     )
+
+def _plan(metrics, precomputed: dict) -> tuple:
+    """(selected specs, specs still to compute, shared inputs those need)."""
+    specs = METRICS.select(metrics)
+    todo = [spec for spec in specs if not precomputed.get(spec.id)]
+    return specs, todo, METRICS.inputs_for(todo)
+
+def _executor(cost: str):
+    return get_io_executor() if cost == "io" else get_cpu_executor()
+
+def _score(analysis: TranscriptAnalysis, duration_seconds: float | None, todo: list,
+           values: dict, missing: dict, results: dict, timer: StageTimer) -> None:
+    """Run each metric whose inputs are available; `missing` maps unavailable input -> deadline."""
+    for spec in todo:
+        lost = [missing[i] for i in spec.inputs if i in missing]
+        if lost:
+            results[spec.id] = timed_out_metric(spec.id, lost[0])
+        else:
+            results[spec.id] = timer.run(spec.id, spec.compute, analysis, duration_seconds, values)
+
+def evaluate_transcript_v2(transcript: str, duration_seconds: float | None = None,
+                           precomputed: dict | None = None, deadline_ms: float | None = None,
+                           metrics=None) -> EvaluationResponse:
+    """
+    Score one transcript on the requested metric ids (all when None).
+    `precomputed` maps metric id -> details for metrics already computed in
+    bulk (e.g. batched semantic coverage). Only the shared inputs the
+    remaining metrics need are computed; several heavy inputs run
+    concurrently on their executors. With a deadline (argument or
+    SCORING_DEADLINE_MS), a metric whose inputs are not ready when it
+    expires is reported as timed out.
+    """
+    precomputed = precomputed or {}
+    deadline_ms = _resolve_deadline(deadline_ms)
+    timer = StageTimer()
+    specs, todo, inputs = _plan(metrics, precomputed)
+    # Built once; every metric reads tokens / sentences / extraction from it
+    analysis = timer.run("analysis", TranscriptAnalysis, transcript)
+    results, values, missing = {}, {}, {}
+    if deadline_ms or len(inputs) > 1:
+        futures = {_executor(spec.cost).submit(timer.wrap(spec.stage or spec.id, spec.compute), analysis): spec.id
+                   for spec in inputs}
+        # Light metrics run inline while the shared inputs compute
+        _score(analysis, duration_seconds, [s for s in todo if set(s.inputs) <= LIGHT_INPUTS], {}, {},
+               results, timer)
+        timeout = max(0.0, (deadline_ms - timer.elapsed_ms()) / 1000) if deadline_ms else None
+        done, pending = wait(futures, timeout=timeout)
+        for future in pending:
+            future.cancel()  # a started check keeps running; its result is dropped
+            missing[futures[future]] = deadline_ms
+        for future in done:
+            values[futures[future]] = future.result()
+    else:
+        for spec in inputs:
+            values[spec.id] = timer.run(spec.stage or spec.id, spec.compute, analysis)
+    _score(analysis, duration_seconds, [s for s in todo if s.id not in results], values, missing, results, timer)
+    results.update({k: v for k, v in precomputed.items() if v})
+    return _assemble_response(analysis, duration_seconds, specs, results, timer)
+
+async def evaluate_transcript_v2_async(transcript: str, duration_seconds: float | None = None,
+                                      deadline_ms: float | None = None, metrics=None) -> EvaluationResponse:
+    """
+    Same result as evaluate_transcript_v2 without blocking the event loop:
+    the shared inputs the requested metrics need (LanguageTool I/O, VADER /
+    embeddings CPU) run concurrently on dedicated bounded executors, and the
+    analysis, light metrics and response assembly run on a worker thread.
+    """
+    deadline_ms = _resolve_deadline(deadline_ms)
+    timer = StageTimer()
+    specs, todo, inputs = _plan(metrics, {})
+    loop = asyncio.get_running_loop()
+    analysis = await asyncio.to_thread(timer.run, "analysis", TranscriptAnalysis, transcript)
+    tasks = {
+        loop.run_in_executor(_executor(spec.cost), timer.wrap(spec.stage or spec.id, spec.compute),
+                             analysis): spec.id
+        for spec in inputs
+    }
+    results = {}
+    light = asyncio.ensure_future(asyncio.to_thread(
+        _score, analysis, duration_seconds, [s for s in todo if set(s.inputs) <= LIGHT_INPUTS], {}, {},
+        results, timer))
+    values, missing = {}, {}
+    if tasks:
+        timeout = max(0.0, (deadline_ms - timer.elapsed_ms()) / 1000) if deadline_ms else None
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+            missing[tasks[task]] = deadline_ms
+        for task in done:
+            values[tasks[task]] = task.result()
+    await light
+
+    def finish() -> EvaluationResponse:
+        _score(analysis, duration_seconds, [s for s in todo if s.id not in results], values, missing, results, timer)
+        return _assemble_response(analysis, duration_seconds, specs, results, timer)
+
+    return await asyncio.to_thread(finish)
+
+def _bulk_engagement(transcripts: list) -> list:
+    return [sentiment_from_scores(scores) for scores in polarity_scores_many(transcripts)]
+
+def evaluate_batch_v2(items: list, max_workers: int = BATCH_WORKERS, metrics=None) -> list:
+    """
+    Score (transcript, duration_seconds[, deadline_ms]) items on the requested
+    metric ids (all when None). Semantic coverage is encoded in one batch and
+    VADER scores come from one polarity_scores_many call (when those metrics
+    are requested); remaining metrics run in a thread pool. The bulk step is
+    bounded by the smallest item deadline: whatever it has not finished by then
+    (or failed) is computed per item, within what is left of each item's
+    budget. Results keep input order; a failed item yields its Exception
+    instead of an EvaluationResponse.
+    """
+    start = time.perf_counter()
+    wanted = {spec.id for spec in METRICS.select(metrics)}
+    transcripts = [item[0] for item in items]
+    deadlines = [_resolve_deadline(item[2] if len(item) > 2 else None) for item in items]
+    bulk = {}
+    if "concept" in wanted and ENABLE_SEMANTIC:
+        bulk["concept"] = get_cpu_executor().submit(conceptual_coverage_many, transcripts)
+    if "engagement" in wanted:
+        bulk["engagement"] = get_cpu_executor().submit(_bulk_engagement, transcripts)
+    budget = min(filter(None, deadlines), default=None)
+    done, pending = wait(bulk.values(), timeout=budget / 1000 if budget else None)
+    for future in pending:
+        future.cancel()  # a started encode keeps running; its result is dropped
+    precomputed = {
+        metric_id: future.result() if future in done and not future.exception() else [None] * len(items)
+        for metric_id, future in bulk.items()
+    }
+    spent_ms = (time.perf_counter() - start) * 1000
+
+    def run(index: int):
+        transcript, duration = items[index][:2]
+        deadline = deadlines[index] and max(0.001, deadlines[index] - spent_ms)
+        try:
+            return evaluate_transcript_v2(transcript, duration, {k: v[index] for k, v in precomputed.items()},
+                                          deadline or 0, metrics=metrics)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return list(pool.map(run, range(len(items))))
@@ -0,0 +1,98 @@
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+# Inputs every metric can read for free from TranscriptAnalysis / the request
+LIGHT_INPUTS = frozenset({"text", "tokens", "sentences", "duration"})
+
+
+class InputSpec(NamedTuple):
+    """A shared, expensive input computed at most once per evaluation."""
+    id: str
+    cost: str  # "cpu" | "io": which executor computes it
+    compute: Callable  # (TranscriptAnalysis) -> value
+    stage: Optional[str] = None  # telemetry stage it is timed under (default: its id)
+
+
+class MetricSpec(NamedTuple):
+    """
+    A scoring metric. compute(analysis, duration_seconds, inputs) returns the
+    details dict (with "score" and "max"); `inputs` maps each declared shared
+    input id to its value. Metrics with in_total=False are reported but not
+    counted in max_total (e.g. the disabled semantic stub).
+    """
+    id: str
+    name: str
+    max_score: float
+    inputs: tuple
+    compute: Callable
+    in_total: bool = True
+    feedback: Optional[Callable] = None  # (details) -> str, for metrics outside build_feedback
+
+
+class MetricRegistry:
+    """Metric and shared-input plugins, in response order."""
+
+    def __init__(self):
+        self._metrics: Dict[str, MetricSpec] = {}
+        self._inputs: Dict[str, InputSpec] = {}
+        self.version = 0  # bumped on every change; derived tables (compact schema) rebuild on it
+
+    def register_input(self, spec: InputSpec) -> InputSpec:
+        self._inputs[spec.id] = spec
+        return spec
+
+    def register(self, spec: MetricSpec) -> MetricSpec:
+        unknown = set(spec.inputs) - LIGHT_INPUTS - self._inputs.keys()
+        if unknown:
+            raise ValueError(f"Metric {spec.id} needs unregistered inputs: {', '.join(sorted(unknown))}")
+        self._metrics[spec.id] = spec
+        self.version += 1
+        return spec
+
+    def unregister(self, metric_id: str) -> None:
+        if self._metrics.pop(metric_id, None) is not None:
+            self.version += 1
+
+    def get(self, metric_id: str) -> MetricSpec | None:
+        return self._metrics.get(metric_id)
+
+    def all(self) -> list:
+        return list(self._metrics.values())
+
+    def ids(self) -> list:
+        return list(self._metrics)
+
+    def cost(self, spec: MetricSpec) -> str:
+        """light | cpu | io: the most expensive shared input the metric reads."""
+        costs = {self._inputs[i].cost for i in spec.inputs if i in self._inputs}
+        return "io" if "io" in costs else "cpu" if costs else "light"
+
+    def select(self, metric_ids: Iterable[str] | None = None) -> list:
+        """Specs for the requested ids (all when None), in registry order; ValueError on unknown ids."""
+        if metric_ids is None:
+            return self.all()
+        wanted = set(metric_ids)
+        unknown = wanted - self._metrics.keys()
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}.")
+        return [spec for spec in self._metrics.values() if spec.id in wanted]
+
+    def inputs_for(self, specs: Iterable[MetricSpec]) -> list:
+        """Shared-input specs the given metrics need, each once."""
+        needed = {}
+        for spec in specs:
+            for input_id in spec.inputs:
+                if input_id in self._inputs:
+                    needed[input_id] = self._inputs[input_id]
+        return list(needed.values())
+
+
+METRICS = MetricRegistry()
+
+
+def parse_metrics(metrics: str | None) -> tuple | None:
+    """?metrics=a,b -> sorted metric ids (None = every metric); ValueError on unknown ids."""
+    if not metrics:
+        return None
+    ids = tuple(sorted({m.strip() for m in metrics.split(",") if m.strip()}))
+    METRICS.select(ids)
+    return ids or None
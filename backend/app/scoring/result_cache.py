@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from app.models import EvaluationResponse
+from .cache import LRUCache
+
+# Result cache configuration (environment variables)
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")  # memory | sqlite | none
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+# Seconds a result stays valid; 0 = never expire
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "3600")) or None
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "result_cache.sqlite3")
+# SQLite access times are buffered and written with the next put or after this many hits
+ACCESS_FLUSH_SIZE = 256
+
+
+def cache_key(transcript: str, duration_seconds: float | None, version: str, semantic: bool,
+              metrics: tuple | None = None) -> str:
+    """Content hash of everything that determines an evaluation result (metrics=None: every metric)."""
+    normalized = " ".join(transcript.split())
+    payload = [normalized, duration_seconds, version, semantic]
+    if metrics is not None:
+        payload.append(list(metrics))  # full-set keys stay unchanged
+    payload = json.dumps(payload)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cacheable(result: EvaluationResponse) -> bool:
+    """Degraded results (a timed-out metric, or a fallback score while an engine is down) are not reused."""
+    return not result.timed_out and not any(m.details.get("unavailable") for m in result.metrics)
+
+
+class MemoryResultCache:
+    """In-process TTL + LRU cache; hits return a copy, so callers cannot alter the stored result."""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl: float | None = RESULT_CACHE_TTL):
+        self._lru = LRUCache(maxsize, ttl)
+
+    def get(self, key: str) -> EvaluationResponse | None:
+        result = self._lru.get(key)
+        return result.model_copy(deep=True) if result is not None else None
+
+    def put(self, key: str, result: EvaluationResponse) -> None:
+        self._lru.put(key, result)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "ttl": self._lru.ttl, **self._lru.stats()}
+
+
+class SQLiteResultCache:
+    """
+    On-disk TTL + LRU cache that survives restarts. Hits are read-only:
+    access times are buffered and written in one statement with the next put
+    (before eviction) or every ACCESS_FLUSH_SIZE hits; expired rows are
+    deleted by put.
+    """
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, maxsize: int = RESULT_CACHE_SIZE,
+                 ttl: float | None = RESULT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._touched = {}  # key -> last access time not yet written
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> EvaluationResponse | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= ACCESS_FLUSH_SIZE:
+                self._write_access_times()
+                self._conn.commit()
+        return EvaluationResponse.model_validate_json(row[0])
+
+    def _write_access_times(self) -> None:
+        touched, self._touched = self._touched, {}
+        self._conn.executemany("UPDATE results SET accessed = ? WHERE key = ?",
+                               [(at, key) for key, at in touched.items()])
+
+    def put(self, key: str, result: EvaluationResponse) -> None:
+        now = time.time()
+        with self._lock:
+            self._write_access_times()  # so eviction sees recent hits
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, result.model_dump_json(), now + self.ttl if self.ttl is not None else float("inf"), now),
+            )
+            self._conn.execute("DELETE FROM results WHERE expires <= ?", (now,))
+            # LRU eviction: drop least recently accessed rows beyond maxsize
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"backend": "sqlite", "ttl": self.ttl, "size": size, "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def get_result_cache():
+    """Configured result cache, or None when RESULT_CACHE_BACKEND=none."""
+    if RESULT_CACHE_BACKEND == "sqlite":
+        return SQLiteResultCache()
+    if RESULT_CACHE_BACKEND == "memory":
+        return MemoryResultCache()
+    return None
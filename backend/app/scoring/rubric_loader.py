@@ -1,30 +1,148 @@
+import hashlib
 import json
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
-import pandas as pd
+from typing import NamedTuple, Optional
 from app.models import Rubric, RubricCriterion, ScoringConfig
 
-BASE = Path(__file__).parent.parent
+BASE = Path(__file__).parent.parent.parent  # backend/
 RUBRIC_JSON = BASE / "rubric_samples" / "rubric.json"
 RUBRIC_XLSX = BASE / "rubric_samples" / "rubric.xlsx"
+# Seconds between checks of the rubric file for edits (0 disables the watcher)
+RUBRIC_RELOAD_INTERVAL = float(os.getenv("RUBRIC_RELOAD_INTERVAL", "5"))
 
-def load_rubric() -> Rubric:
+def _rubric_source() -> Path:
     if RUBRIC_JSON.exists():
-        data = json.loads(RUBRIC_JSON.read_text())
-        return Rubric(**data)
+        return RUBRIC_JSON
     if RUBRIC_XLSX.exists():
-        df = pd.read_excel(RUBRIC_XLSX)
-        criteria = []
-        for _, row in df.iterrows():
-            criteria.append(RubricCriterion(
-                id=str(row['id']),
-                name=str(row['name']),
-                description=str(row['description']),
-                keywords=[k.strip() for k in str(row['keywords']).split(',') if k.strip() != '' and not pd.isna(k)],
-                weight=float(row['weight']),
-                min_words=int(row['min_words']) if not pd.isna(row['min_words']) else None,
-                max_words=int(row['max_words']) if not pd.isna(row['max_words']) else None,
-                enabled=bool(row.get('enabled', True)),
-                scoring_config=ScoringConfig()
-            ))
-        return Rubric(criteria=criteria)
-    raise FileNotFoundError("No rubric.json or rubric.xlsx found. Provide one in rubric_samples/")
\ No newline at end of file
+        return RUBRIC_XLSX
+    raise FileNotFoundError("No rubric.json or rubric.xlsx found. Provide one in rubric_samples/")
+
+def _parse_excel(path: Path) -> Rubric:
+    import pandas as pd  # only needed to convert Excel rubrics
+    df = pd.read_excel(path)
+    criteria = []
+    for row in df.to_dict("records"):
+        criteria.append(RubricCriterion(
+            id=str(row['id']),
+            name=str(row['name']),
+            description=str(row['description']),
+            keywords=[k.strip() for k in str(row['keywords']).split(',') if k.strip() != '' and not pd.isna(k)],
+            weight=float(row['weight']),
+            min_words=int(row['min_words']) if not pd.isna(row['min_words']) else None,
+            max_words=int(row['max_words']) if not pd.isna(row['max_words']) else None,
+            enabled=bool(row.get('enabled', True)),
+            scoring_config=ScoringConfig()
+        ))
+    return Rubric(criteria=criteria)
+
+def _parse(path: Path, raw: bytes) -> Rubric:
+    if path.suffix == ".json":
+        return Rubric(**json.loads(raw))
+    return _parse_excel(path)
+
+def load_rubric() -> Rubric:
+    path = _rubric_source()
+    return _parse(path, path.read_bytes())
+
+
+class RubricSnapshot(NamedTuple):
+    version: str
+    rubric: Rubric
+    compiled: object  # CompiledRubric
+    path: Path
+    mtime: float
+
+
+def _compile(rubric: Rubric):
+    from .pipeline import CompiledRubric
+    return CompiledRubric(rubric)
+
+
+class RubricRegistry:
+    """
+    Holds the parsed + compiled rubric in memory. `current()` does no file I/O;
+    a watcher thread reloads when the file's mtime and content hash change and
+    swaps the snapshot atomically, so in-flight requests keep the version they
+    started with. A rubric that fails to parse leaves the previous one active.
+    """
+
+    def __init__(self, compile_fn=_compile, interval: float = RUBRIC_RELOAD_INTERVAL):
+        self._compile = compile_fn
+        self.interval = interval
+        self._snapshot: Optional[RubricSnapshot] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def current(self) -> RubricSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self) -> bool:
+        """Reload if the rubric file changed; returns True when a new version is active."""
+        with self._lock:
+            path = _rubric_source()
+            mtime = path.stat().st_mtime
+            old = self._snapshot
+            if old and old.path == path and old.mtime == mtime:
+                return False
+            raw = path.read_bytes()
+            version = hashlib.sha256(raw).hexdigest()[:12]
+            if old and old.path == path and old.version == version:
+                self._snapshot = old._replace(mtime=mtime)
+                return False
+            try:
+                rubric = _parse(path, raw)
+                compiled = self._compile(rubric)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                if old is None:
+                    raise
+                return False
+            self._snapshot = RubricSnapshot(version, rubric, compiled, path, mtime)
+            self.last_error = None
+            if old is not None:
+                self.reloads += 1
+            return True
+
+    def start(self) -> None:
+        if self._thread or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="rubric-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "source": snapshot.path.name if snapshot else None,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_rubric_registry() -> RubricRegistry:
+    return RubricRegistry()
@@ -1,40 +1,91 @@
+import hashlib
+import os
 from functools import lru_cache
-from sentence_transformers import SentenceTransformer
+from pathlib import Path
 import numpy as np
+from .cache import LRUCache
+from .constants import CONCEPT_ANCHORS
+from .embedding_backends import EMBEDDING_BACKEND, load_backend
+from .utils import sentence_split
+
+SEMANTIC_MODEL_NAME = os.getenv("SEMANTIC_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+# Local model directory (e.g. baked into the image); when set, no network access is attempted
+SEMANTIC_MODEL_PATH = os.getenv("SEMANTIC_MODEL_PATH")
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
+# Optional directory for the precomputed anchor embedding artifact (.npy)
+SEMANTIC_CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR")
+# document: one embedding per transcript | chunked: best-matching sentence window per anchor
+SEMANTIC_MODE = os.getenv("SEMANTIC_MODE", "document").lower()
+# Sentences per sliding window and cap on windows encoded per transcript (chunked mode)
+SEMANTIC_CHUNK_SENTENCES = int(os.getenv("SEMANTIC_CHUNK_SENTENCES", "1"))
+SEMANTIC_MAX_CHUNKS = int(os.getenv("SEMANTIC_MAX_CHUNKS", "48"))
 
 @lru_cache(maxsize=1)
 def get_semantic_model():
-    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    """Configured embedding backend (EMBEDDING_BACKEND); exposes encode(texts)."""
+    return load_backend(EMBEDDING_BACKEND, SEMANTIC_MODEL_PATH or SEMANTIC_MODEL_NAME,
+                        offline=bool(SEMANTIC_MODEL_PATH))
 
 def cosine(a, b):
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-9))
 
-CONCEPT_ANCHORS = [
-    "A clear greeting",
-    "States name and class or educational level",
-    "Mentions school",
-    "Shares family or personal background",
-    "Includes hobby or interest",
-    "Mentions aspiration or goal",
-    "Provides unique or fun fact",
-    "Polite closing thanking audience"
-]
+def normalize_rows(matrix) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return matrix / (np.linalg.norm(matrix, axis=-1, keepdims=True) + 1e-9)
 
-def conceptual_coverage(transcript: str) -> dict:
-    """
-    Computes average semantic similarity between transcript and concept anchors.
-    Score bands → points (0–10):
-        ≥0.80 → 10
-        0.70–0.79 → 8
-        0.60–0.69 → 6
-        0.50–0.59 → 4
-        <0.50 → 2
-    """
-    model = get_semantic_model()
-    texts = [transcript] + CONCEPT_ANCHORS
-    embeddings = model.encode(texts)
-    t_embed = embeddings[0]
-    sims = [cosine(t_embed, emb) for emb in embeddings[1:]]
+def _anchor_artifact() -> Path | None:
+    if not SEMANTIC_CACHE_DIR:
+        return None
+    # Keyed by backend + model + anchor text so edits never reuse a stale artifact
+    digest = hashlib.sha256("\n".join([EMBEDDING_BACKEND, SEMANTIC_MODEL_PATH or SEMANTIC_MODEL_NAME] + CONCEPT_ANCHORS).encode("utf-8")).hexdigest()[:16]
+    return Path(SEMANTIC_CACHE_DIR) / f"concept_anchors-{digest}.npy"
+
+@lru_cache(maxsize=1)
+def get_anchor_matrix() -> np.ndarray:
+    """L2-normalized CONCEPT_ANCHORS embeddings (anchors × dim), computed once."""
+    artifact = _anchor_artifact()
+    if artifact and artifact.exists():
+        return np.load(artifact)
+    matrix = normalize_rows(get_semantic_model().encode(CONCEPT_ANCHORS))
+    if artifact:
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        np.save(artifact, matrix)
+    return matrix
+
+# Transcript embeddings keyed by content hash
+_EMBEDDING_CACHE = LRUCache(SEMANTIC_CACHE_SIZE)
+
+def _content_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def embed_texts(texts: list) -> np.ndarray:
+    """Normalized embeddings for texts; only cache misses are encoded, in one batch."""
+    keys = [_content_key(t) for t in texts]
+    vectors = {}
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key in vectors or key in pending:
+            continue
+        cached = _EMBEDDING_CACHE.get(key)
+        if cached is None:
+            pending[key] = text
+        else:
+            vectors[key] = cached
+    if pending:
+        encoded = normalize_rows(get_semantic_model().encode(list(pending.values())))
+        for key, vector in zip(pending, encoded):
+            _EMBEDDING_CACHE.put(key, vector)
+            vectors[key] = vector
+    return np.vstack([vectors[k] for k in keys])
+
+def semantic_similarity(a: str, b: str) -> float:
+    vectors = embed_texts([a, b])
+    return float(vectors[0] @ vectors[1])
+
+def embedding_cache_stats() -> dict:
+    return _EMBEDDING_CACHE.stats()
+
+def _coverage_from_similarities(sims: list) -> dict:
     avg = float(np.mean(sims))
     if avg >= 0.80:
         score, band = 10, "≥0.80"
@@ -53,4 +104,106 @@ def conceptual_coverage(transcript: str) -> dict:
         "band": band,
         "score": score,
         "max": 10
-    }
\ No newline at end of file
+    }
+
+def transcript_chunks(transcript: str, window: int = SEMANTIC_CHUNK_SENTENCES,
+                      max_chunks: int = SEMANTIC_MAX_CHUNKS) -> list:
+    """
+    Sliding windows of `window` sentences, deduplicated in order. Beyond
+    `max_chunks`, windows are sampled evenly so the whole transcript stays covered.
+    """
+    sentences = sentence_split(transcript)
+    if not sentences:
+        return [transcript.strip()]
+    window = max(1, min(window, len(sentences)))
+    windows = [". ".join(sentences[i:i + window]) for i in range(len(sentences) - window + 1)]
+    chunks = list(dict.fromkeys(windows))
+    if max_chunks > 0 and len(chunks) > max_chunks:
+        picks = np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int)
+        chunks = [chunks[i] for i in dict.fromkeys(picks.tolist())]
+    return chunks
+
+def _chunked_from_similarities(chunks: list, sims: np.ndarray) -> dict:
+    """Score each anchor by its best chunk in a (chunks × anchors) similarity matrix."""
+    best = sims.argmax(axis=0)
+    return coverage_from_best_matches(sims[best, np.arange(sims.shape[1])].tolist(),
+                                      [chunks[i] for i in best], len(chunks))
+
+def coverage_from_best_matches(similarities: list, matched_sentences: list, chunks: int,
+                               mode: str = "chunked") -> dict:
+    """Coverage from each anchor's best similarity and the sentence that produced it."""
+    result = _coverage_from_similarities(similarities)
+    result["mode"] = mode
+    result["chunks"] = chunks
+    result["matched_sentences"] = matched_sentences
+    return result
+
+def conceptual_coverage(transcript: str) -> dict:
+    """
+    Computes average semantic similarity between transcript and concept anchors.
+    In chunked mode each anchor takes its best-matching sentence window instead
+    of one (truncated) whole-transcript embedding.
+    Score bands → points (0–10):
+        ≥0.80 → 10
+        0.70–0.79 → 8
+        0.60–0.69 → 6
+        0.50–0.59 → 4
+        <0.50 → 2
+    """
+    return coverage_from_anchor_similarities(anchor_similarities(transcript))
+
+def anchor_similarities(transcript: str) -> tuple:
+    """
+    (chunks, cosines) between the transcript and every concept anchor:
+    chunks is None and cosines a vector in document mode; in chunked mode
+    cosines is a (chunks × anchors) matrix.
+    """
+    if SEMANTIC_MODE == "chunked":
+        chunks = transcript_chunks(transcript)
+        return chunks, embed_texts(chunks) @ get_anchor_matrix().T
+    t_embed = embed_texts([transcript])[0]
+    # Normalized vectors: one matrix-vector product gives every cosine
+    return None, get_anchor_matrix() @ t_embed
+
+def coverage_from_anchor_similarities(similarities: tuple) -> dict:
+    chunks, sims = similarities
+    if chunks is not None:
+        return _chunked_from_similarities(chunks, sims)
+    return _coverage_from_similarities(sims.tolist())
+
+def conceptual_coverage_many(transcripts: list) -> list:
+    """conceptual_coverage for a batch: one encode call, one (texts × anchors) product."""
+    if not transcripts:
+        return []
+    if SEMANTIC_MODE == "chunked":
+        per_transcript = [transcript_chunks(t) for t in transcripts]
+        sims = embed_texts([c for chunks in per_transcript for c in chunks]) @ get_anchor_matrix().T
+        results, offset = [], 0
+        for chunks in per_transcript:
+            results.append(_chunked_from_similarities(chunks, sims[offset:offset + len(chunks)]))
+            offset += len(chunks)
+        return results
+    sims = embed_texts(transcripts) @ get_anchor_matrix().T
+    return [_coverage_from_similarities(row.tolist()) for row in sims]
+
+def coverage_parity(reference, candidate, transcripts: list) -> dict:
+    """
+    Compares two embedding backends on conceptual_coverage: anchor similarities,
+    score bands and transcript-embedding cosine. Used to validate quantized models.
+    """
+    ref_anchors = normalize_rows(reference.encode(CONCEPT_ANCHORS))
+    cand_anchors = normalize_rows(candidate.encode(CONCEPT_ANCHORS))
+    ref_vecs = normalize_rows(reference.encode(transcripts))
+    cand_vecs = normalize_rows(candidate.encode(transcripts))
+    ref_sims = ref_vecs @ ref_anchors.T
+    cand_sims = cand_vecs @ cand_anchors.T
+    bands_equal = [
+        _coverage_from_similarities(r.tolist())["band"] == _coverage_from_similarities(c.tolist())["band"]
+        for r, c in zip(ref_sims, cand_sims)
+    ]
+    return {
+        "transcripts": len(transcripts),
+        "band_agreement": round(sum(bands_equal) / max(1, len(bands_equal)), 3),
+        "max_similarity_delta": round(float(np.abs(ref_sims - cand_sims).max(initial=0.0)), 4),
+        "mean_embedding_cosine": round(float((ref_vecs * cand_vecs).sum(axis=1).mean()), 4) if transcripts else None,
+    }
@@ -0,0 +1,162 @@
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+# Prometheus text exposition format, without the prometheus_client dependency
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WORD_BUCKETS = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_num(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is a bisect plus two adds under a lock."""
+
+    def __init__(self, name: str, help: str, buckets: tuple, labelnames: Tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}  # key -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class StatsGauges:
+    """Gauges read at scrape time from a component's stats() dict (numeric fields only)."""
+
+    def __init__(self, prefix: str, help: str, source: Callable[[], dict | None]):
+        self.prefix, self.help, self.source = prefix, help, source
+
+    def render(self) -> list:
+        try:
+            stats = self.source()
+        except Exception:
+            stats = None
+        lines = []
+        for key, value in (stats or {}).items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{self.prefix}_{key}"
+            lines += [f"# HELP {name} {self.help} ({key})", f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._collectors = []
+
+    def register(self, collector):
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        lines = []
+        for collector in self._collectors:
+            lines += collector.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "scoring_stage_seconds", "Time spent in each evaluation stage.", LATENCY_BUCKETS, ("stage",)))
+TRANSCRIPT_WORDS = REGISTRY.register(Histogram(
+    "scoring_transcript_words", "Words per evaluated transcript.", WORD_BUCKETS))
+EVALUATIONS = REGISTRY.register(Counter(
+    "scoring_evaluations_total", "Evaluations by source (computed or cache).", ("source",)))
+METRIC_TIMEOUTS = REGISTRY.register(Counter(
+    "scoring_metric_timeouts_total", "Heavy metrics that missed the request deadline.", ("metric",)))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "http_request_seconds", "HTTP request latency by route.", LATENCY_BUCKETS, ("route",)))
+
+
+def observe_evaluation(result) -> None:
+    """Record stage timings (ms) and transcript length of an EvaluationResponse."""
+    EVALUATIONS.inc(source="computed")
+    TRANSCRIPT_WORDS.observe(result.word_count)
+    for metric in result.timed_out:
+        METRIC_TIMEOUTS.inc(metric=metric)
+    for stage, ms in (result.timings or {}).items():
+        STAGE_SECONDS.observe(ms / 1000, stage=stage)
+
+
+class StageTimer:
+    """Monotonic per-stage timings in milliseconds."""
+    __slots__ = ("timings", "_start")
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    def run(self, stage: str, fn, *args):
+        """fn(*args) timed under `stage`; repeated runs of a stage add up."""
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed, 3)
+
+    def wrap(self, stage: str, fn):
+        """fn timed under `stage`, for running on an executor."""
+        return lambda *args: self.run(stage, fn, *args)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
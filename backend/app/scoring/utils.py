@@ -1,12 +1,14 @@
 import re
-import nltk
+from functools import lru_cache
+
+NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
 
 def sentence_split(text: str) -> list:
     # Simple sentence split (avoid heavy deps)
     return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
 
 def normalize(text: str) -> str:
-    return re.sub(r'[^a-zA-Z0-9\s]', ' ', text.lower())
+    return NON_ALNUM_RE.sub(' ', text.lower())
 
 def word_tokens(text: str) -> list:
     return [w for w in normalize(text).split() if w]
@@ -17,11 +19,21 @@ def type_token_ratio(words: list) -> float:
     distinct = len(set(words))
     return distinct / len(words)
 
+VADER_MISSING = ("VADER lexicon not installed. Install it at build time: "
+                 "python -c \"import nltk; nltk.download('vader_lexicon')\"")
+
+@lru_cache(maxsize=1)
 def ensure_vader():
+    """
+    Process-wide VADER analyzer: the lexicon is parsed once and shared.
+    Never downloads at request time; a missing lexicon fails fast.
+    """
+    from nltk.sentiment import SentimentIntensityAnalyzer
     try:
-        from nltk.sentiment import SentimentIntensityAnalyzer
         return SentimentIntensityAnalyzer()
-    except LookupError:
-        nltk.download('vader_lexicon')
-        from nltk.sentiment import SentimentIntensityAnalyzer
-        return SentimentIntensityAnalyzer()
\ No newline at end of file
+    except LookupError as exc:
+        raise RuntimeError(VADER_MISSING) from exc
+
+def polarity_scores_many(texts: list) -> list:
+    sia = ensure_vader()
+    return [sia.polarity_scores(t) for t in texts]
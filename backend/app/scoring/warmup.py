@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+
+class EngineStatus:
+    __slots__ = ("name", "required", "state", "load_ms", "error", "info")
+
+    def __init__(self, name: str, required: bool):
+        self.name = name
+        self.required = required
+        self.state = "pending"  # pending | loading | ready | failed
+        self.load_ms = None
+        self.error = None
+        self.info = None
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "load_ms": self.load_ms,
+            "error": self.error,
+            "info": self.info,
+        }
+
+
+class EngineWarmup:
+    """
+    Loads every engine in parallel in the background and records per-engine
+    state and load time. `ready` turns true once all engines have finished
+    and no required engine failed; optional engines (with a scoring fallback)
+    may fail without blocking readiness.
+    """
+
+    def __init__(self, engines: Dict[str, Callable], required: Dict[str, bool] | None = None):
+        required = required or {}
+        self._engines = engines
+        self.status = {name: EngineStatus(name, required.get(name, True)) for name in engines}
+        self._thread = None
+
+    def _load(self, name: str) -> None:
+        status = self.status[name]
+        status.state = "loading"
+        start = time.perf_counter()
+        try:
+            status.info = self._engines[name]()
+            status.state = "ready"
+        except Exception as exc:
+            status.error = f"{type(exc).__name__}: {exc}"
+            status.state = "failed"
+        status.load_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    def run(self) -> None:
+        with ThreadPoolExecutor(max_workers=max(1, len(self._engines)), thread_name_prefix="warmup") as pool:
+            list(pool.map(self._load, self._engines))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="engine-warmup", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            s.state == "ready" or (s.state == "failed" and not s.required)
+            for s in self.status.values()
+        )
+
+    def report(self) -> dict:
+        return {"ready": self.ready, "engines": {n: s.as_dict() for n, s in self.status.items()}}
+
+
+def _warm_grammar() -> dict:
+    from .grammar import GrammarUnavailable, get_grammar_pool
+    pool = get_grammar_pool()
+    pool.start()
+    if pool.stats()["alive"] == 0:
+        raise GrammarUnavailable("No LanguageTool instance started; grammar falls back to default score.")
+    for _ in range(pool.size):
+        pool.check("This is a warmup sentence.")  # first check JIT-compiles the server
+    return pool.stats()
+
+
+def _warm_sentiment() -> dict:
+    from .utils import ensure_vader
+    ensure_vader().polarity_scores("Warmup sentence.")
+    return {"lexicon": "vader"}
+
+
+def _warm_semantic() -> dict:
+    from .semantic import EMBEDDING_BACKEND, SEMANTIC_MODEL_NAME, SEMANTIC_MODEL_PATH, embed_texts, get_anchor_matrix
+    anchors = get_anchor_matrix()
+    embed_texts(["Warmup sentence."])
+    return {"model": SEMANTIC_MODEL_PATH or SEMANTIC_MODEL_NAME, "backend": EMBEDDING_BACKEND,
+            "anchors": int(anchors.shape[0])}
+
+
+def _warm_rubric() -> dict:
+    from .rubric_loader import get_rubric_registry
+    registry = get_rubric_registry()
+    registry.refresh()
+    return {"version": registry.current().version}
+
+
+def _warm_workers() -> dict:
+    from .workers import get_worker_pool
+    pool = get_worker_pool()
+    pool.start()
+    return pool.stats()
+
+
+def scoring_engines(semantic: bool, workers: int) -> EngineWarmup:
+    """Engines this process needs; with scoring workers, they preload their own models."""
+    engines = {"rubric": _warm_rubric}
+    required = {"rubric": False, "grammar": False}
+    if workers > 0:
+        engines["workers"] = _warm_workers
+    else:
+        engines["grammar"] = _warm_grammar
+        engines["sentiment"] = _warm_sentiment
+        if semantic:
+            engines["semantic"] = _warm_semantic
+    return EngineWarmup(engines, required)
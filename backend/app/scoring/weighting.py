@@ -8,6 +8,12 @@ def length_score(word_count: int, min_words, max_words) -> float:
     return 1.0
 
 def combine(keyword_score, semantic_score, length_score, cfg):
+    if semantic_score is None:
+        # Semantic disabled: renormalize over the remaining components
+        active = cfg.keyword_weight + cfg.length_weight
+        if active <= 0:
+            return 0.0
+        return (cfg.keyword_weight * keyword_score + cfg.length_weight * length_score) / active
     return (
         cfg.keyword_weight * keyword_score +
         cfg.semantic_weight * semantic_score +
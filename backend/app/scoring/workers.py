@@ -0,0 +1,189 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from app.models import EvaluationResponse
+
+# Process-pool execution mode (environment variables); 0 = score in-process
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0"))
+SCORING_WORKER_START_METHOD = os.getenv("SCORING_WORKER_START_METHOD", "spawn")
+# Longest a caller waits for one pooled job (seconds)
+WORKER_JOB_TIMEOUT = float(os.getenv("WORKER_JOB_TIMEOUT", "120"))
+# How often the collector checks worker liveness (seconds)
+REAP_INTERVAL = 0.5
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised for jobs that were running on a worker process that died."""
+
+
+def preload_engines() -> None:
+    """Load every heavy engine once so a worker's first job pays no cold start."""
+    from .pipeline_v2 import ENABLE_SEMANTIC
+    from .grammar import get_grammar_pool
+    from .utils import ensure_vader
+    ensure_vader()
+    get_grammar_pool().start()
+    if ENABLE_SEMANTIC:
+        from .semantic import get_anchor_matrix
+        get_anchor_matrix()
+
+
+def _worker_main(jobs, results) -> None:
+    from .pipeline_v2 import evaluate_transcript_v2
+    preload_engines()
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, transcript, duration_seconds, deadline_ms, metrics, submitted = job
+        if deadline_ms is not None:
+            # CLOCK_MONOTONIC is system-wide, so queueing time counts against the budget
+            deadline_ms = max(0.001, deadline_ms - (time.monotonic() - submitted) * 1000)
+        try:
+            result = evaluate_transcript_v2(transcript, duration_seconds, deadline_ms=deadline_ms, metrics=metrics)
+            results.put((job_id, True, result.model_dump()))
+        except Exception as exc:
+            results.put((job_id, False, f"{type(exc).__name__}: {exc}"))
+
+
+def _resolve(future: Future, outcome) -> None:
+    """Set a result or exception, unless the caller already cancelled (timed out or disconnected)."""
+    if future.done() or not future.set_running_or_notify_cancel():
+        return
+    if isinstance(outcome, BaseException):
+        future.set_exception(outcome)
+    else:
+        future.set_result(outcome)
+
+
+class WorkerPool:
+    """
+    Fixed set of scoring processes, each with its own job queue and preloaded
+    models. Jobs go to the worker with the fewest outstanding jobs; a collector
+    thread resolves futures from the shared result queue and restarts workers
+    that die (their in-flight jobs fail with WorkerCrashed).
+    """
+
+    def __init__(self, size: int = SCORING_WORKERS, start_method: str = SCORING_WORKER_START_METHOD):
+        self.size = max(1, size)
+        self._ctx = mp.get_context(start_method)
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending = {}  # job_id -> (future, worker index)
+        self._load = [0] * self.size
+        self._queues = []
+        self._procs = []
+        self._results = None
+        self._collector = None
+        self._running = False
+        self.restarts = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._results = self._ctx.Queue()
+            for i in range(self.size):
+                self._queues.append(self._ctx.Queue())
+                self._procs.append(None)
+                self._spawn(i)
+        self._collector = threading.Thread(target=self._collect, name="scoring-collector", daemon=True)
+        self._collector.start()
+
+    def _spawn(self, index: int) -> None:
+        proc = self._ctx.Process(target=_worker_main, args=(self._queues[index], self._results),
+                                 name=f"scoring-worker-{index}", daemon=True)
+        proc.start()
+        self._procs[index] = proc
+
+    def submit(self, transcript: str, duration_seconds: float | None = None,
+               deadline_ms: float | None = None, metrics: tuple | None = None) -> Future:
+        self.start()
+        future = Future()
+        with self._lock:
+            index = min(range(self.size), key=self._load.__getitem__)
+            job_id = next(self._ids)
+            self._load[index] += 1
+            self._pending[job_id] = (future, index)
+            # Under the lock: a reaped worker's queue is replaced under it too
+            self._queues[index].put((job_id, transcript, duration_seconds, deadline_ms, metrics, time.monotonic()))
+        return future
+
+    def evaluate(self, transcript: str, duration_seconds: float | None = None,
+                 deadline_ms: float | None = None, metrics: tuple | None = None) -> EvaluationResponse:
+        return self.submit(transcript, duration_seconds, deadline_ms, metrics).result(timeout=WORKER_JOB_TIMEOUT)
+
+    def _collect(self) -> None:
+        next_reap = time.monotonic() + REAP_INTERVAL
+        while self._running:
+            # Liveness is checked on a timer, not only when results stop arriving
+            if time.monotonic() >= next_reap:
+                self._reap_dead_workers()
+                next_reap = time.monotonic() + REAP_INTERVAL
+            try:
+                job_id, ok, payload = self._results.get(timeout=REAP_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                entry = self._pending.pop(job_id, None)
+                if entry:
+                    self._load[entry[1]] -= 1
+            if entry is None:
+                continue
+            try:
+                outcome = EvaluationResponse.model_validate(payload) if ok else RuntimeError(payload)
+            except Exception as exc:  # one bad payload must not stop the collector
+                outcome = exc
+            _resolve(entry[0], outcome)
+
+    def _reap_dead_workers(self) -> None:
+        for index, proc in enumerate(self._procs):
+            if proc.is_alive() or not self._running:
+                continue
+            with self._lock:
+                lost = [(job_id, fut) for job_id, (fut, i) in self._pending.items() if i == index]
+                for job_id, _ in lost:
+                    del self._pending[job_id]
+                self._load[index] = 0
+                # Jobs still queued for the dead worker are dropped with it
+                self._queues[index] = self._ctx.Queue()
+                self._spawn(index)
+                self.restarts += 1
+            for _, fut in lost:
+                _resolve(fut, WorkerCrashed(f"Scoring worker {index} exited (code {proc.exitcode})."))
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        for q in self._queues:
+            q.put(None)
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        if self._collector:
+            self._collector.join(timeout=2)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.size,
+                "alive": sum(1 for p in self._procs if p is not None and p.is_alive()),
+                "load": list(self._load),
+                "restarts": self.restarts,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_worker_pool() -> WorkerPool:
+    return WorkerPool()
@@ -0,0 +1,59 @@
+"""
+Microbenchmark: single-pass ConceptMatcher vs the previous per-regex loop.
+Usage (from backend/):
+    python -m benchmarks.bench_concepts [--repeat 20]
+"""
+import argparse
+import re
+import time
+from app.scoring.metrics import CONCEPT_MATCHER, MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS
+
+SEED_TRANSCRIPTS = {
+    "rich": ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+             "I love playing cricket and my dream is to become a data scientist. "
+             "A fun fact about me is that I collect old coins. Thank you. "),
+    "sparse": "The weather today was quite pleasant and we walked along the river near the old bridge. ",
+}
+SIZES = [100, 1000, 10000]
+
+
+def per_regex_loop(text: str) -> dict:
+    """Reference: one re.search per pattern, as keyword_presence used to do."""
+    found = {}
+    for group in (MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS):
+        for concept, definition in group.items():
+            for pattern in definition["regex"]:
+                m = re.search(pattern, text, flags=re.IGNORECASE)
+                if m and (concept not in found or m.start() < found[concept][0]):
+                    found[concept] = m.span()
+    return found
+
+
+def make_transcript(seed: str, words: int) -> str:
+    tokens = seed.split()
+    return " ".join((tokens * (words // len(tokens) + 1))[:words])
+
+
+def time_ms(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(f"{'words':>6} {'seed':>7} {'loop ms':>9} {'matcher ms':>11} {'speedup':>8}")
+    for words in SIZES:
+        for label, seed in SEED_TRANSCRIPTS.items():
+            text = make_transcript(seed, words)
+            assert per_regex_loop(text) == CONCEPT_MATCHER.find(text), "matcher disagrees with reference"
+            loop_ms = time_ms(per_regex_loop, text, args.repeat)
+            matcher_ms = time_ms(CONCEPT_MATCHER.find, text, args.repeat)
+            print(f"{words:>6} {label:>7} {loop_ms:>9.3f} {matcher_ms:>11.3f} {loop_ms / matcher_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Pipeline benchmark: per-stage and end-to-end latency percentiles vs transcript
+length, throughput vs concurrency, and peak memory. Writes JSON that can be
+compared across commits.
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline [--sizes 10,100,1000,5000,20000] [--repeat 20]
+        [--concurrency 1,4,8] [--grammar stub|languagetool] [--out FILE]
+        [--compare BASELINE.json] [--threshold 0.15]
+With --compare, exits non-zero when any p50 latency (or throughput) regressed by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from app.scoring.grammar import clear_grammar_cache
+from app.scoring.pipeline import CompiledRubric, score_transcript
+from app.scoring.pipeline_v2 import ENABLE_SEMANTIC, PIPELINE_VERSION, evaluate_transcript_v2
+from app.scoring.rubric_loader import load_rubric
+from benchmarks import languagetool_stub
+from benchmarks.generator import make_transcript
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentiles(values: list) -> dict:
+    arr = np.asarray(values, dtype=float)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3),
+            "mean": round(float(arr.mean()), 3), "n": len(values)}
+
+
+def repeats_for(words: int, repeat: int) -> int:
+    # Keep long transcripts affordable while still yielding percentiles
+    return max(3, min(repeat, int(repeat * 1000 / max(words, 1))))
+
+
+def bench_size(words: int, repeat: int, rubric: CompiledRubric, warm_caches: bool = False) -> dict:
+    text = make_transcript(words, seed=words)
+    evaluate_transcript_v2(text, 60)  # warm pools
+    end_to_end, scoring, stages = [], [], {}
+    for _ in range(repeats_for(words, repeat)):
+        if not warm_caches:
+            clear_grammar_cache()  # otherwise repeats measure sentence-cache hits
+        start = time.perf_counter()
+        result = evaluate_transcript_v2(text, 60)
+        end_to_end.append((time.perf_counter() - start) * 1000)
+        for stage, ms in result.timings.items():
+            stages.setdefault(stage, []).append(ms)
+        start = time.perf_counter()
+        score_transcript(text, rubric)
+        scoring.append((time.perf_counter() - start) * 1000)
+
+    if not warm_caches:
+        clear_grammar_cache()
+    tracemalloc.start()
+    evaluate_transcript_v2(text, 60)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "words": words,
+        "end_to_end_ms": percentiles(end_to_end),
+        "score_transcript_ms": percentiles(scoring),
+        "stages_ms": {stage: percentiles(v) for stage, v in stages.items()},
+        "peak_alloc_kb": round(peak / 1024, 1),
+    }
+
+
+def bench_concurrency(workers: int, words: int, requests: int, warm_caches: bool = False) -> dict:
+    texts = [make_transcript(words, seed=i) for i in range(requests)]
+    latencies = []
+
+    def run(text):
+        if not warm_caches:
+            clear_grammar_cache()
+        start = time.perf_counter()
+        evaluate_transcript_v2(text, 60)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, texts))
+    elapsed = time.perf_counter() - start
+    return {"workers": workers, "words": words, "requests": requests,
+            "throughput_rps": round(requests / elapsed, 2), "latency_ms": percentiles(latencies)}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Regressions as (metric, baseline, current) where p50 grew / throughput fell beyond threshold."""
+    regressions = []
+    base_sizes = {s["words"]: s for s in baseline.get("sizes", [])}
+    for size in current.get("sizes", []):
+        base = base_sizes.get(size["words"])
+        if not base:
+            continue
+        series = {"end_to_end": (size["end_to_end_ms"], base["end_to_end_ms"]),
+                  "score_transcript": (size["score_transcript_ms"], base["score_transcript_ms"])}
+        for stage, stats in size["stages_ms"].items():
+            if stage in base["stages_ms"]:
+                series[f"stage.{stage}"] = (stats, base["stages_ms"][stage])
+        for name, (now, before) in series.items():
+            # ignore sub-0.1 ms deltas: timer noise on microsecond stages
+            if now["p50"] > before["p50"] * (1 + threshold) and now["p50"] - before["p50"] > 0.1:
+                regressions.append((f"{size['words']}w {name} p50 ms", before["p50"], now["p50"]))
+    base_conc = {c["workers"]: c for c in baseline.get("concurrency", [])}
+    for conc in current.get("concurrency", []):
+        base = base_conc.get(conc["workers"])
+        if base and conc["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append((f"{conc['workers']} workers throughput rps",
+                                base["throughput_rps"], conc["throughput_rps"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,100,1000,5000,20000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--concurrency-words", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--grammar", choices=["stub", "languagetool"], default="stub")
+    parser.add_argument("--stub-base-ms", type=float, default=languagetool_stub.DEFAULT_BASE_MS)
+    parser.add_argument("--stub-per-100-words-ms", type=float, default=languagetool_stub.DEFAULT_PER_100_WORDS_MS)
+    parser.add_argument("--warm-caches", action="store_true", help="Keep the grammar sentence cache between repeats")
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    if args.grammar == "stub":
+        languagetool_stub.install(args.stub_base_ms, args.stub_per_100_words_ms)
+    rubric = CompiledRubric(load_rubric())
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pipeline_version": PIPELINE_VERSION,
+            "semantic": ENABLE_SEMANTIC,
+            "grammar": args.grammar,
+            "args": vars(args),
+        },
+        "sizes": [],
+        "concurrency": [],
+    }
+    print(f"{'words':>6} {'e2e p50':>9} {'e2e p95':>9} {'rubric p50':>11} {'peak KB':>9}  slowest stage")
+    for words in sizes:
+        row = bench_size(words, args.repeat, rubric, args.warm_caches)
+        report["sizes"].append(row)
+        stages = {k: v for k, v in row["stages_ms"].items() if k != "total"}
+        slowest = max(stages, key=lambda k: stages[k]["p50"])
+        print(f"{words:>6} {row['end_to_end_ms']['p50']:>9.2f} {row['end_to_end_ms']['p95']:>9.2f} "
+              f"{row['score_transcript_ms']['p50']:>11.2f} {row['peak_alloc_kb']:>9.1f}  "
+              f"{slowest} ({stages[slowest]['p50']:.2f} ms)")
+    for workers in levels:
+        row = bench_concurrency(workers, args.concurrency_words, args.requests, args.warm_caches)
+        report["concurrency"].append(row)
+        print(f"concurrency {workers:>2}: {row['throughput_rps']:>8.1f} req/s, p95 {row['latency_ms']['p95']:.2f} ms")
+    report["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{report['meta']['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"wrote {out}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.threshold)
+        for name, before, now in regressions:
+            print(f"REGRESSION {name}: {before} -> {now}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Deterministic synthetic transcripts for benchmarks, built from the sentences
+in docs/SAMPLE_TRANSCRIPTS.md so metric hit rates stay realistic at any length.
+"""
+import random
+import re
+from pathlib import Path
+
+SAMPLES = Path(__file__).resolve().parents[2] / "docs" / "SAMPLE_TRANSCRIPTS.md"
+FILLERS = ["um", "uh", "you know", "like", "basically", "actually"]
+
+
+def seed_sentences(path: Path = SAMPLES) -> list:
+    """Sentences of every quoted transcript in the samples document."""
+    sentences = []
+    for quoted in re.findall(r'"([^"]+)"', path.read_text(encoding="utf-8")):
+        sentences += [s.strip() + "." for s in re.split(r"[.!?]+", quoted) if s.strip()]
+    return sentences
+
+
+def make_transcript(words: int, seed: int = 0, filler_rate: float = 0.02,
+                    sentences: list | None = None) -> str:
+    """
+    A transcript of exactly `words` words: seed sentences sampled with a fixed
+    RNG, with fillers inserted at `filler_rate`, opening with the first sample
+    sentence and closing with a thank-you when there is room.
+    """
+    rng = random.Random(seed)
+    pool = sentences or seed_sentences()
+    out = pool[0].split()
+    while len(out) < words:
+        for token in rng.choice(pool).split():
+            if rng.random() < filler_rate:
+                out.extend((rng.choice(FILLERS) + ",").split())
+            out.append(token)
+    out = out[:words]
+    if words >= 4:
+        out[-2:] = ["Thank", "you."]
+    return " ".join(out)
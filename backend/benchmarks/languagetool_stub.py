@@ -0,0 +1,51 @@
+"""
+Offline stand-in for LanguageTool: deterministic matches and a simulated
+service time, so pipeline benchmarks run without Java or network access.
+"""
+import re
+import time
+from app.scoring.grammar import GrammarPool
+
+LOWERCASE_I_RE = re.compile(r"\bi\b")
+REPEATED_WORD_RE = re.compile(r"\b(\w+) \1\b", re.IGNORECASE)
+
+# Simulated LanguageTool cost; bench_pipeline's --stub-* defaults use the same values
+DEFAULT_BASE_MS = 5.0
+DEFAULT_PER_100_WORDS_MS = 2.0
+
+
+class StubMatch:
+    __slots__ = ("ruleId", "rule_issue_type", "offset", "errorLength")
+
+    def __init__(self, rule_id: str, issue_type: str, offset: int, length: int):
+        self.ruleId = rule_id
+        self.rule_issue_type = issue_type
+        self.offset = offset
+        self.errorLength = length
+
+
+class StubLanguageTool:
+    """check() sleeps base_ms + per_100_words_ms scaled by length, like a local server."""
+
+    def __init__(self, base_ms: float = DEFAULT_BASE_MS, per_100_words_ms: float = DEFAULT_PER_100_WORDS_MS):
+        self.base_ms = base_ms
+        self.per_100_words_ms = per_100_words_ms
+
+    def check(self, text: str) -> list:
+        time.sleep((self.base_ms + self.per_100_words_ms * len(text.split()) / 100) / 1000)
+        matches = [StubMatch("I_LOWERCASE", "typographical", m.start(), 1) for m in LOWERCASE_I_RE.finditer(text)]
+        matches += [StubMatch("ENGLISH_WORD_REPEAT_RULE", "duplication", m.start(), len(m.group()))
+                    for m in REPEATED_WORD_RE.finditer(text)]
+        return matches
+
+    def close(self) -> None:
+        pass
+
+
+def install(base_ms: float = DEFAULT_BASE_MS, per_100_words_ms: float = DEFAULT_PER_100_WORDS_MS,
+            size: int = 2) -> GrammarPool:
+    """Route grammar_metric through a pool of stand-ins; returns the pool."""
+    from app.scoring import live, metrics
+    pool = GrammarPool(size=size, factory=lambda: StubLanguageTool(base_ms, per_100_words_ms))
+    metrics.get_grammar_pool = live.get_grammar_pool = lambda: pool
+    return pool
@@ -0,0 +1,93 @@
+"""
+Export the sentence-transformer to ONNX, quantize it to int8 and check parity
+against the PyTorch model before it is deployed with EMBEDDING_BACKEND=onnx.
+Usage (from backend/; needs torch, transformers, sentence-transformers, onnx,
+onnxruntime and tokenizers):
+    python -m scripts.export_onnx [--model NAME_OR_PATH] [--out DIR] [--transcripts FILE]
+Exits non-zero when the quantized model changes coverage bands beyond --min-agreement.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from app.scoring.embedding_backends import ONNX_MODEL_DIR, ONNX_MODEL_FILE, OnnxBackend, TorchBackend
+from app.scoring.semantic import SEMANTIC_MODEL_NAME, coverage_parity
+
+PARITY_TRANSCRIPTS = [
+    "Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+    "I love playing cricket and my dream is to become a data scientist. Thank you.",
+    "Good morning. I am Priya from class 6. I live with my parents and my younger brother. "
+    "In my free time I enjoy painting. A fun fact about me is that I can solve a Rubik's cube.",
+    "Hi. My name is Sam. I like games.",
+    "The weather today was quite pleasant and we walked along the river near the old bridge.",
+    "Good afternoon respected teachers and my dear friends. I study at Green Valley Public School. "
+    "My goal is to become a doctor and help people in my village. Thank you for listening.",
+]
+INPUTS = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def export(model_id: str, out: Path) -> Path:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    out.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModel.from_pretrained(model_id).eval()
+    sample = tokenizer(["A sample sentence for tracing."], return_tensors="pt")
+    fp32 = out / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[name] for name in INPUTS), str(fp32),
+            input_names=INPUTS, output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in INPUTS + ["last_hidden_state"]},
+            opset_version=14,
+        )
+    int8 = out / ONNX_MODEL_FILE
+    quantize_dynamic(str(fp32), str(int8), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(str(out))  # writes tokenizer.json
+    return int8
+
+
+def encode_ms(backend, texts: list, repeat: int) -> float:
+    backend.encode(texts)  # warm
+    start = time.perf_counter()
+    for _ in range(repeat):
+        backend.encode(texts)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=SEMANTIC_MODEL_NAME)
+    parser.add_argument("--out", default=ONNX_MODEL_DIR)
+    parser.add_argument("--transcripts", help="Optional file with one transcript per line for the parity check")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    int8 = export(args.model, Path(args.out))
+    transcripts = PARITY_TRANSCRIPTS
+    if args.transcripts:
+        transcripts = [line.strip() for line in Path(args.transcripts).read_text().splitlines() if line.strip()]
+
+    reference = TorchBackend(args.model)
+    candidate = OnnxBackend(args.out)
+    report = coverage_parity(reference, candidate, transcripts)
+    torch_ms = encode_ms(reference, transcripts, args.repeat)
+    onnx_ms = encode_ms(candidate, transcripts, args.repeat)
+    report.update({
+        "model_file": str(int8),
+        "model_mb": round(int8.stat().st_size / 2**20, 1),
+        "torch_encode_ms": round(torch_ms, 2),
+        "onnx_encode_ms": round(onnx_ms, 2),
+        "speedup": round(torch_ms / onnx_ms, 2) if onnx_ms else None,
+    })
+    print(json.dumps(report, indent=2))
+    if report["band_agreement"] < args.min_agreement:
+        sys.exit(f"Band agreement {report['band_agreement']} below {args.min_agreement}; do not deploy.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Offline bulk scoring: stream transcripts from JSONL or CSV, score them on a
+process pool (models loaded once per worker) and append results to JSONL or
+Parquet as they complete. Input is never fully loaded: at most
+--workers * --inflight chunks are pending at once, and results are written
+in input order so a checkpoint is just "records done + output size".
+Usage (from backend/):
+    python -m scripts.score_bulk INPUT.jsonl|INPUT.csv OUTPUT.jsonl|OUTPUT_DIR [--format jsonl|parquet]
+        [--mode v2|rubric] [--workers N] [--chunk-size 32] [--resume]
+Records need a transcript field (--text-field) and may carry --id-field and
+--duration-field. After a crash, rerun with --resume to continue from the
+last checkpoint. Parquet output (needs pyarrow) is a directory of part files.
+"""
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from app.scoring.pipeline_v2 import METRICS, validation_error
+
+_ENGINE = None  # per-process scorer, set by init_worker
+
+
+def read_records(path: Path, fmt: str | None = None):
+    """Lazily yield input records (dicts) from a JSONL or CSV file."""
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            csv.field_size_limit(2**31 - 1)  # transcripts exceed the 128 KiB default
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(records, size: int, start: int = 0):
+    """(first index, [records]) chunks; indices count input records from `start`."""
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def _duration(value) -> float | None:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def init_worker(mode: str) -> None:
+    """Load the scorer and its engines once per process."""
+    global _ENGINE
+    if mode == "rubric":
+        from app.scoring.pipeline import CompiledRubric
+        from app.scoring.rubric_loader import load_rubric
+        _ENGINE = CompiledRubric(load_rubric())
+    else:
+        from app.scoring.workers import preload_engines
+        preload_engines()
+        _ENGINE = "v2"
+
+
+def _v2_row(result) -> dict:
+    return {"total_score": result.total_score, "max_total": result.max_total,
+            "word_count": result.word_count,
+            "scores": {m.id: m.raw_score for m in result.metrics},
+            "timed_out": result.timed_out}
+
+
+def _rubric_row(result) -> dict:
+    return {"total_score": result.overall_score, "word_count": result.word_count,
+            "scores": {c.id: c.weighted_score for c in result.criteria}}
+
+
+def score_chunk(start: int, records: list, fields: tuple) -> list:
+    """Score one chunk; one output row per input record, failures included."""
+    text_field, id_field, duration_field = fields
+    rows, todo = [], []
+    for i, record in enumerate(records):
+        text = (record.get(text_field) or "").strip()
+        row = {"index": start + i, "id": record.get(id_field, start + i), "error": validation_error(text)}
+        rows.append(row)
+        if row["error"] is None:
+            todo.append((row, text, _duration(record.get(duration_field))))
+    if not todo:
+        return rows
+
+    if _ENGINE == "v2":
+        from app.scoring.pipeline_v2 import evaluate_batch_v2
+        # one thread per process: the pool already spans the cores
+        results = evaluate_batch_v2([(text, duration) for _, text, duration in todo], max_workers=1)
+        to_row = _v2_row
+    else:
+        results = []
+        for _, text, _ in todo:
+            try:
+                results.append(_ENGINE.score(text))
+            except Exception as exc:
+                results.append(exc)
+        to_row = _rubric_row
+    for (row, _, _), result in zip(todo, results):
+        if isinstance(result, Exception):
+            row["error"] = f"{type(result).__name__}: {result}"
+        else:
+            row.update(to_row(result), result=result.model_dump())
+    return rows
+
+
+def _errors(rows: list) -> int:
+    return sum(1 for r in rows if r["error"])
+
+
+class JsonlSink:
+    """Appends rows as JSON lines; every written row is durable after checkpoint()."""
+
+    def __init__(self, path: Path, state: dict | None = None):
+        self.path = path
+        if state:
+            # drop rows written after the last checkpoint
+            with open(path, "r+b") as f:
+                f.truncate(state["bytes"])
+        self._file = open(path, "ab" if state else "wb")
+        self.pending = self.pending_errors = 0
+
+    def write(self, rows: list) -> None:
+        self._file.write(b"".join(json.dumps(r, default=str).encode() + b"\n" for r in rows))
+        self.pending += len(rows)
+        self.pending_errors += _errors(rows)
+
+    def checkpoint(self) -> tuple:
+        """(rows, error rows made durable since the last call, sink state to resume from)."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        durable, self.pending = self.pending, 0
+        errors, self.pending_errors = self.pending_errors, 0
+        return durable, errors, {"bytes": self._file.tell()}
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Writes rows into numbered part files of --part-rows rows each; a part is
+    durable once closed, so resume deletes any part past the checkpoint.
+    """
+
+    def __init__(self, path: Path, columns: list, part_rows: int, state: dict | None = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow (pip install pyarrow)")
+        self.pa, self.pq = pa, pq
+        self.path, self.columns, self.part_rows = path, columns, part_rows
+        self.parts = state["parts"] if state else 0
+        path.mkdir(parents=True, exist_ok=True)
+        for stale in path.glob("part-*.parquet"):
+            if int(stale.stem.split("-")[1]) >= self.parts:
+                stale.unlink()
+        self._buffer = []
+        self._closed_rows = self._closed_errors = 0
+
+    def write(self, rows: list) -> None:
+        self._buffer.extend(rows)
+        while len(self._buffer) >= self.part_rows:
+            self._flush(self._buffer[:self.part_rows])
+            self._buffer = self._buffer[self.part_rows:]
+
+    def _flush(self, rows: list) -> None:
+        pa = self.pa
+        # explicit types keep every part's schema identical, even all-error parts
+        table = pa.table({
+            "index": pa.array([r["index"] for r in rows], pa.int64()),
+            "id": pa.array([str(r["id"]) for r in rows], pa.string()),
+            "error": pa.array([r["error"] for r in rows], pa.string()),
+            "total_score": pa.array([r.get("total_score") for r in rows], pa.float64()),
+            "word_count": pa.array([r.get("word_count") for r in rows], pa.int64()),
+            **{f"score_{c}": pa.array([r.get("scores", {}).get(c) for r in rows], pa.float64())
+               for c in self.columns},
+            "result_json": pa.array([json.dumps(r["result"], default=str) if "result" in r else None
+                                     for r in rows], pa.string()),
+        })
+        tmp = self.path / f".part-{self.parts:05d}.tmp"
+        self.pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, self.path / f"part-{self.parts:05d}.parquet")
+        self.parts += 1
+        self._closed_rows += len(rows)
+        self._closed_errors += _errors(rows)
+
+    def checkpoint(self) -> tuple:
+        durable, self._closed_rows = self._closed_rows, 0
+        errors, self._closed_errors = self._closed_errors, 0
+        return durable, errors, {"parts": self.parts}
+
+    def finish(self) -> None:
+        if self._buffer:
+            self._flush(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        pass
+
+
+def load_checkpoint(path: Path, expected: dict) -> dict | None:
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text())
+    mismatched = [k for k, v in expected.items() if state.get(k) != v]
+    if mismatched:
+        sys.exit(f"Checkpoint {path} was written for a different run ({', '.join(mismatched)})")
+    return state
+
+
+def save_checkpoint(path: Path, state: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def score_columns(mode: str) -> list:
+    if mode == "rubric":
+        from app.scoring.rubric_loader import load_rubric
+        return [c.id for c in load_rubric().criteria]
+    return METRICS.ids()
+
+
+def run(args) -> dict:
+    """Score args.input into args.output; returns the final checkpoint state."""
+    output = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{output}.checkpoint.json")
+    identity = {"input": str(Path(args.input).resolve()), "mode": args.mode, "format": args.format}
+    state = load_checkpoint(checkpoint_path, identity) if args.resume else None
+    done = resumed_at = state["records_done"] if state else 0
+    errors = state["errors"] if state else 0
+    if state and state.get("complete"):
+        return state
+
+    if args.format == "parquet":
+        sink = ParquetSink(output, score_columns(args.mode), args.part_rows, state and state["sink"])
+    else:
+        sink = JsonlSink(output, state and state["sink"])
+    records = islice(read_records(Path(args.input), args.input_format), done, None)
+    chunks = chunked(records, args.chunk_size, start=done)
+    fields = (args.text_field, args.id_field, args.duration_field)
+
+    pool = None
+    if args.workers > 0:
+        os.environ.setdefault("GRAMMAR_POOL_SIZE", "1")  # one LanguageTool JVM per worker process
+        pool = ProcessPoolExecutor(args.workers, mp_context=mp.get_context(args.start_method),
+                                   initializer=init_worker, initargs=(args.mode,))
+    else:
+        init_worker(args.mode)
+
+    start = last_report = last_checkpoint = time.monotonic()
+    scored_now = errors_now = 0
+    inflight = deque()
+    max_inflight = max(1, args.workers) * args.inflight
+
+    def checkpoint(complete: bool = False) -> dict:
+        nonlocal done, errors
+        durable, durable_errors, sink_state = sink.checkpoint()
+        done += durable
+        errors += durable_errors
+        cp = {**identity, "records_done": done, "errors": errors, "sink": sink_state, "complete": complete}
+        save_checkpoint(checkpoint_path, cp)
+        return cp
+
+    try:
+        while True:
+            while pool and len(inflight) < max_inflight and (chunk := next(chunks, None)):
+                inflight.append(pool.submit(score_chunk, *chunk, fields))
+            if pool:
+                if not inflight:
+                    break
+                rows = inflight.popleft().result()  # input order; head-of-line wait is bounded by one chunk
+            else:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                rows = score_chunk(*chunk, fields)
+            sink.write(rows)
+            scored_now += len(rows)
+            errors_now += _errors(rows)  # checkpointed only once the sink makes them durable
+            now = time.monotonic()
+            if now - last_checkpoint >= args.checkpoint_seconds:
+                checkpoint()
+                last_checkpoint = now
+            if args.progress and now - last_report >= args.progress:
+                rate = scored_now / (now - start)
+                print(f"{resumed_at + scored_now:,} records ({scored_now:,} this run, {errors_now:,} errors) "
+                      f"{rate:,.1f} rec/s",
+                      file=sys.stderr, flush=True)
+                last_report = now
+        sink.finish()
+        final = checkpoint(complete=True)
+    except BaseException:
+        # keep what is durable so --resume continues from here
+        checkpoint()
+        raise
+    finally:
+        sink.close()
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    elapsed = time.monotonic() - start
+    print(f"scored {scored_now:,} records in {elapsed:.1f}s ({scored_now / max(elapsed, 1e-9):,.1f} rec/s), "
+          f"{final['records_done']:,} total, {final['errors']:,} errors -> {output}", file=sys.stderr)
+    return final
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="Default: from the file extension")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--mode", choices=["v2", "rubric"], default="v2",
+                        help="v2: evaluate_transcript_v2 metrics; rubric: score_transcript on the rubric")
+    parser.add_argument("--text-field", default="transcript")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--duration-field", default="duration_seconds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 = score in-process")
+    parser.add_argument("--start-method", default="spawn")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Records per worker task")
+    parser.add_argument("--inflight", type=int, default=2, help="Pending chunks per worker")
+    parser.add_argument("--part-rows", type=int, default=50000, help="Rows per Parquet part file")
+    parser.add_argument("--checkpoint", help="Default: OUTPUT.checkpoint.json")
+    parser.add_argument("--checkpoint-seconds", type=float, default=5.0)
+    parser.add_argument("--progress", type=float, default=10.0, help="Seconds between progress lines; 0 = quiet")
+    parser.add_argument("--resume", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import pytest
+from app.scoring.analysis import TranscriptAnalysis
+from app.scoring.utils import word_tokens, sentence_split
+from app.scoring.extraction import extract_name
+
+def test_transcript_analysis_matches_helpers():
+    txt = "Hello everyone! My name is Priya. I am 14 years old... Thank you."
+    a = TranscriptAnalysis(txt)
+    assert list(a.tokens) == word_tokens(txt)
+    assert a.sentences == sentence_split(txt)
+    assert a.token_counts["i"] == 1
+    assert extract_name(a) == "Priya"
+    assert "extract_name" in a._cache
+    with pytest.raises(AttributeError):
+        a.text = "changed"
+
+def test_spans_survive_length_changing_lowercase():
+    from app.scoring.metrics import find_fillers
+    a = TranscriptAnalysis("İstanbul trip: um I went there.")
+    assert [a.text[s:e] for s, e in a.token_spans] == ["İstanbul", "trip", "um", "I", "went", "there"]
+    assert len(a.lower) == len(a.text)
+    assert find_fillers(a) == [{"filler": "um", "start": 15, "end": 17}]
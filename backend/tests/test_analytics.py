@@ -0,0 +1,98 @@
+import random
+import threading
+import numpy as np
+from app.scoring.analytics import CohortStore, MUST_CONCEPTS, evaluation_facts
+from app.scoring.pipeline_v2 import evaluate_transcript_v2
+from app.scoring.registry import METRICS
+
+METRIC_IDS = METRICS.ids()
+
+
+def synthetic(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        found = rng.sample(MUST_CONCEPTS, rng.randrange(len(MUST_CONCEPTS) + 1))
+        metrics = [(m, rng.randrange(0, 16), {"band": rng.choice(["low", "mid", "high"]), "must_found": found})
+                   for m in METRIC_IDS]
+        rows.append(evaluation_facts(metrics, 1000.0 + i, f"s{i % 7}", f"class{i % 3}"))
+    return rows
+
+
+def test_summary_matches_numpy_reference():
+    rows = synthetic(1000)
+    store = CohortStore(capacity=16)
+    store.add_many(rows[:10])
+    store.add_many(rows[10:])
+    report = store.cohort("class1", percentiles=(50, 90))
+    assert report["source"] == "summary"
+
+    subset = [r for r in rows if r[2] == "class1"]
+    scores = np.array([r[3] for r in subset])
+    assert report["count"] == len(subset)
+    grammar = METRIC_IDS.index("grammar")
+    assert report["metrics"]["grammar"]["mean"] == round(scores[:, grammar].mean(), 3)
+    assert report["metrics"]["grammar"]["p90"] == np.percentile(scores[:, grammar], 90, method="inverted_cdf")
+    assert report["total_score"]["p50"] == np.percentile(scores.sum(axis=1), 50, method="inverted_cdf")
+    assert report["metrics"]["grammar"]["bands"] == {
+        b: sum(1 for r in subset if r[4][grammar] == b) for b in ("low", "mid", "high")}
+    missing = {c["concept"]: c["missing"] for c in report["missing_concepts"]}
+    for concept in MUST_CONCEPTS:
+        bit = 1 << MUST_CONCEPTS.index(concept)
+        assert missing[concept] == sum(1 for r in subset if not r[5] & bit)
+    rates = [c["rate"] for c in report["missing_concepts"]]
+    assert rates == sorted(rates, reverse=True)
+
+
+def test_filtered_scan_agrees_with_summary():
+    store = CohortStore()
+    store.add_many(synthetic(500))
+    summary = store.cohort("class2")
+    scan = store.cohort("class2", since=0)
+    assert scan["source"] == "scan"
+    assert {k: v for k, v in summary.items() if k not in ("source", "performance_ms")} == \
+           {k: v for k, v in scan.items() if k not in ("source", "performance_ms")}
+    assert store.cohort(student="s3", until=1100)["count"] == sum(1 for i in range(100) if i % 7 == 3)
+    assert store.cohort("no such class")["count"] == 0
+
+
+def test_add_evaluation_response():
+    result = evaluate_transcript_v2("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 "
+                                    "at Riverdale School. I love playing cricket. Thank you.", 40)
+    store = CohortStore()
+    store.add(result, school_class="8A")
+    report = store.cohort("8A")
+    assert report["count"] == 1
+    assert report["total_score"]["p50"] == round(result.total_score)
+    assert store.classes_overview() == [{"school_class": "8A", "count": 1, "mean_total": round(result.total_score, 3)}]
+
+
+def test_appends_never_wait_for_the_lock():
+    store = CohortStore()
+    rows = synthetic(1000)
+    with store._lock:  # e.g. a long scan in another thread
+        adder = threading.Thread(target=store.add_many, args=(rows,))
+        adder.start()
+        adder.join(timeout=1)
+        assert not adder.is_alive()
+    assert store.cohort()["count"] == 1000
+
+
+def test_hydrate_from_history(tmp_path):
+    from app.scoring.history import HistoryStore
+    result = evaluate_transcript_v2("Good morning, myself Priya from Sunrise Academy. My dream is to be a doctor. "
+                                    "I like painting. Thank you.", 30)
+    history = HistoryStore(str(tmp_path / "h.sqlite3"), flush_ms=5)
+    for _ in range(3):
+        history.record(result, "t", school_class="6B")
+    degraded = result.model_copy(update={"timed_out": ["grammar"]})
+    history.record(degraded, "t", school_class="6B")  # not counted live, so not hydrated
+    history.record(result, "t", school_class="6B", cached=True)  # resubmission served from the result cache
+    partial = evaluate_transcript_v2("Good morning, myself Priya from Sunrise Academy. I like painting. Thank you.",
+                                     30, metrics=("clarity", "vocabulary"))
+    history.record(partial, "t", school_class="6B")
+    history.flush()
+    store = CohortStore()
+    store.hydrate(history, until=float("inf"), batch_size=2)
+    assert store.cohort("6B")["count"] == 3 and not store.loading
+    history.close()
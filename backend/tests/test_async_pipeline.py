@@ -0,0 +1,34 @@
+import asyncio
+from app.scoring.pipeline_v2 import evaluate_transcript_v2, evaluate_transcript_v2_async
+from app.scoring.executors import AdmissionLimiter
+
+def test_async_pipeline_matches_sync():
+    transcript = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+                  "I love playing cricket and my dream is to become a data scientist. Thank you.")
+    sync = evaluate_transcript_v2(transcript, 40)
+    result = asyncio.run(evaluate_transcript_v2_async(transcript, 40))
+    assert result.total_score == sync.total_score
+    assert [m.id for m in result.metrics] == [m.id for m in sync.metrics]
+
+def test_admission_limiter_rejects_when_full():
+    limiter = AdmissionLimiter(limit=1)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+    assert limiter.stats()["rejected"] == 1
+
+def test_weighted_admission_and_batch_shedding(monkeypatch):
+    limiter = AdmissionLimiter(limit=4)
+    assert limiter.try_acquire(3) and not limiter.try_acquire(2) and limiter.try_acquire(1)
+    limiter.release(4)
+    assert limiter.stats()["in_flight"] == 0
+
+    from fastapi.testclient import TestClient
+    from app import main
+    monkeypatch.setattr(main, "admission", AdmissionLimiter(limit=1))
+    monkeypatch.setattr(main, "get_result_cache", lambda: None)
+    main.admission.try_acquire()  # server already at capacity
+    item = {"transcript": "Hello everyone, my name is Arjun. I love playing cricket with my friends. Thank you."}
+    response = TestClient(main.app).post("/api/v2/evaluate/batch", json={"items": [item, item]})
+    assert response.status_code == 503 and response.headers["retry-after"]
@@ -0,0 +1,31 @@
+from app.scoring.pipeline_v2 import evaluate_batch_v2, evaluate_transcript_v2
+
+def test_batch_matches_single_evaluation():
+    a = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+         "I love playing cricket. Thank you.")
+    b = "Good morning, myself Priya from Sunrise Academy. My dream is to be a doctor. Thank you."
+    results = evaluate_batch_v2([(a, 40), (b, None)], max_workers=2)
+    assert len(results) == 2
+    assert results[0].extracted.name == "Arjun"
+    assert results[1].extracted.name == "Priya"
+    assert results[0].total_score == evaluate_transcript_v2(a, 40).total_score
+
+def test_bulk_sentiment_failure_falls_back_per_item(monkeypatch):
+    def broken(texts):
+        raise RuntimeError("vader unavailable")
+    monkeypatch.setattr("app.scoring.pipeline_v2.polarity_scores_many", broken)
+    text = "Hello everyone, my name is Arjun. I love playing cricket. Thank you."
+    results = evaluate_batch_v2([(text, 30)], max_workers=1)
+    assert results[0].total_score == evaluate_transcript_v2(text, 30).total_score
+
+def test_batch_deadline_bounds_bulk_precompute(monkeypatch):
+    import time
+    def slow(texts):
+        time.sleep(0.5)
+        raise RuntimeError("too late")
+    monkeypatch.setattr("app.scoring.pipeline_v2.polarity_scores_many", slow)
+    text = "Hello everyone, my name is Arjun. I love playing cricket. Thank you."
+    start = time.perf_counter()
+    results = evaluate_batch_v2([(text, 30, 150), (text, 30, 150)], max_workers=2)
+    assert time.perf_counter() - start < 0.45
+    assert all(r.total_score >= 0 and set(r.timed_out) <= {"grammar", "engagement"} for r in results)
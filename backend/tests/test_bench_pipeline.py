@@ -0,0 +1,25 @@
+from benchmarks.bench_pipeline import compare
+from benchmarks.generator import make_transcript
+from benchmarks.languagetool_stub import StubLanguageTool
+
+def test_generator_is_deterministic_and_exact_length():
+    for words in (10, 137, 2000):
+        text = make_transcript(words, seed=3)
+        assert len(text.split()) == words
+        assert text == make_transcript(words, seed=3)
+    assert make_transcript(50, seed=1) != make_transcript(50, seed=2)
+
+def test_stub_languagetool_matches():
+    tool = StubLanguageTool(base_ms=0, per_100_words_ms=0)
+    matches = tool.check("i think the the plan works")
+    assert sorted(m.ruleId for m in matches) == ["ENGLISH_WORD_REPEAT_RULE", "I_LOWERCASE"]
+
+def test_compare_flags_regressions_only():
+    def report(p50, rps):
+        stats = {"p50": p50}
+        return {"sizes": [{"words": 100, "end_to_end_ms": stats, "score_transcript_ms": stats,
+                           "stages_ms": {"grammar": stats}}],
+                "concurrency": [{"workers": 4, "throughput_rps": rps}]}
+    assert compare(report(10.0, 100), report(10.0, 100), 0.15) == []
+    names = [name for name, _, _ in compare(report(13.0, 70), report(10.0, 100), 0.15)]
+    assert "100w end_to_end p50 ms" in names and "4 workers throughput rps" in names
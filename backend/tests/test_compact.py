@@ -0,0 +1,93 @@
+import gzip
+import json
+from app.scoring import compact
+from app.scoring.compact import METRIC_BANDS, encode_body, get_schema, parse_fields, to_compact
+from app.scoring.metrics import (
+    grammar_from_errors, salutation_from_phrases, sentiment_from_scores, speech_rate_metric,
+    vocabulary_from_counts, filler_metric_from_spans, SALUTATION_PHRASES
+)
+from app.scoring.pipeline_v2 import evaluate_transcript_v2, timed_out_metric
+from app.scoring.semantic import _coverage_from_similarities
+
+TEXT = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+        "I love playing cricket and my dream is to become a data scientist. Thank you.")
+
+
+def test_every_metric_band_has_a_code():
+    produced = {
+        "salutation": {salutation_from_phrases({p})["level"] for p in SALUTATION_PHRASES} | {"none"},
+        "speech_rate": {speech_rate_metric(w, 60)["band"] for w in range(0, 300, 5)}
+                       | {speech_rate_metric(100, None)["band"]},
+        "grammar": {grammar_from_errors(e, 20)["band"] for e in range(0, 30)},
+        "vocabulary": {vocabulary_from_counts(d, 100)["band"] for d in range(0, 101)},
+        "clarity": {filler_metric_from_spans([{"filler": "um"}] * n, 100)["band"] for n in range(0, 30)},
+        "engagement": {sentiment_from_scores({"pos": p / 100})["band"] for p in range(0, 101)},
+        "concept": {_coverage_from_similarities([s / 100])["band"] for s in range(0, 101)} | {"disabled"},
+    }
+    for metric_id, bands in produced.items():
+        assert bands <= set(METRIC_BANDS[metric_id]), (metric_id, bands - set(METRIC_BANDS[metric_id]))
+    assert timed_out_metric("grammar", 10)["band"] in METRIC_BANDS["grammar"]
+
+
+def test_compact_decodes_to_full_response():
+    result = evaluate_transcript_v2(TEXT, 40)
+    out = to_compact(result)
+    schema = get_schema()
+    assert out["sv"] == schema["schema_version"]
+    assert out["t"] == result.total_score and out["x"] == ["Arjun", 13, result.extracted.school_class]
+    for entry, entry_schema, metric in zip(out["m"], schema["metrics"], result.metrics):
+        assert entry_schema["id"] == metric.id and entry[0] == metric.raw_score
+        band = metric.details.get("band", metric.details.get("level"))
+        if entry_schema["bands"]:
+            assert entry_schema["bands"][entry[1]] == band
+    must, _ = schema["concepts"]["bitmask_order"]
+    found = [c for i, c in enumerate(must) if out["c"][0] >> i & 1]
+    assert sorted(found) == sorted(result.metrics[1].details["must_found"])
+    assert len(json.dumps(out)) * 5 < len(result.model_dump_json())
+
+
+def test_field_selection():
+    result = evaluate_transcript_v2(TEXT, 40)
+    assert set(to_compact(result, parse_fields("total_score,feedback"))) == {"sv", "t", "fb"}
+    try:
+        parse_fields("total_score,nope")
+        assert False, "unknown field accepted"
+    except ValueError as exc:
+        assert "nope" in str(exc)
+
+
+def test_encoding_negotiation(monkeypatch):
+    body = b'{"x": "' + b"a" * 4000 + b'"}'
+    assert encode_body(b"{}", "gzip") == (b"{}", None)  # below COMPRESS_MIN_BYTES
+    encoded, encoding = encode_body(body, "br, gzip;q=0.8")
+    assert encoding == "gzip" and gzip.decompress(encoded) == body
+    assert encode_body(body, "gzip;q=0")[1] is None
+    monkeypatch.setattr(compact, "zstandard", None)
+    assert encode_body(body, "zstd, gzip")[1] == "gzip"  # zstd only when installed
+
+
+def test_api_documents_both_batch_formats_and_compresses_off_loop(monkeypatch):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from app import main
+    client = TestClient(main.app)
+    batch = client.get("/openapi.json").json()["paths"]["/api/v2/evaluate/batch"]["post"]
+    content = batch["responses"]["200"]["content"]
+    assert content["application/json"]["schema"]["$ref"].endswith("/BatchEvaluationResponse")
+    assert content[compact.COMPACT_MEDIA_TYPE]["schema"]["required"] == ["sv", "r", "ok", "fail", "ms"]
+
+    loops = []
+
+    def encode(body, accept_encoding):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return encode_body(body, accept_encoding)
+
+    monkeypatch.setattr(main, "encode_body", encode)
+    monkeypatch.setattr(main, "get_result_cache", lambda: None)
+    response = client.post("/api/v2/evaluate", json={"transcript": TEXT, "duration_seconds": 40},
+                           headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and response.json()["total_score"] > 0
+    assert loops == [None]  # compressed in a worker thread, not on the event loop
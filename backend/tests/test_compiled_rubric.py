@@ -0,0 +1,18 @@
+from app.models import Rubric, RubricCriterion
+from app.scoring.keyword_extractor import keyword_match
+from app.scoring.pipeline import CompiledRubric
+
+def test_compiled_rubric_matches_per_criterion_keywords():
+    rubric = Rubric(criteria=[
+        RubricCriterion(id="intro", name="Intro", description="States name.", keywords=["name", "Role", "fun fact"]),
+        RubricCriterion(id="goal", name="Goal", description="Mentions goals.", keywords=["goal", "future", "e-mail"]),
+        RubricCriterion(id="off", name="Off", description="Disabled.", keywords=["name"], enabled=False),
+    ])
+    transcript = "Hello, my name is Alex. A fun fact: my future goal is a product role."
+    compiled = CompiledRubric(rubric, semantic=False)
+    result = compiled.score(transcript)
+    assert [c.id for c in result.criteria] == ["intro", "goal"]
+    for crit, score in zip(rubric.criteria, result.criteria):
+        found, missing = keyword_match(transcript, crit.keywords)
+        assert (score.keywords_found, score.keywords_missing) == (found, missing)
+    assert result.criteria[0].alignment_band == "disabled"
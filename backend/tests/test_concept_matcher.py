@@ -0,0 +1,14 @@
+import re
+from app.scoring.metrics import CONCEPT_MATCHER, MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS, flow_order
+
+def test_concept_matcher_matches_per_regex_search():
+    txt = ("Hello everyone, my name is Arjun. I'm 13 years old studying in class 8 at Riverdale School. "
+           "I love playing cricket and my dream is to become a data scientist. My goal is a fun fact. Thank you.")
+    expected = {}
+    for group in (MUST_HAVE_CONCEPTS, GOOD_TO_HAVE_CONCEPTS):
+        for concept, definition in group.items():
+            spans = [m.span() for p in definition["regex"] if (m := re.search(p, txt, re.IGNORECASE))]
+            if spans:
+                expected[concept] = min(spans)
+    assert CONCEPT_MATCHER.find(txt) == expected
+    assert flow_order(txt)["positions"]["basic_details"] == expected["name"][0]
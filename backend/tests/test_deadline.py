@@ -0,0 +1,38 @@
+import asyncio
+import time
+from app.scoring import metrics
+from app.scoring.grammar import GrammarPool, clear_grammar_cache
+from app.scoring.pipeline_v2 import evaluate_transcript_v2, evaluate_transcript_v2_async
+
+TEXT = "Hello everyone, my name is Asha. I study in class 7 at Hill School. I like chess. Thank you."
+
+class SlowTool:
+    def check(self, text):
+        time.sleep(0.5)
+        return []
+
+def slow_grammar(monkeypatch):
+    clear_grammar_cache()
+    pool = GrammarPool(size=1, factory=SlowTool)
+    monkeypatch.setattr(metrics, "get_grammar_pool", lambda: pool)
+
+def test_slow_metric_times_out_within_budget(monkeypatch):
+    slow_grammar(monkeypatch)
+    start = time.perf_counter()
+    result = evaluate_transcript_v2(TEXT, 30, deadline_ms=100)
+    assert time.perf_counter() - start < 0.3
+    assert result.timed_out == ["grammar"]
+    grammar = next(m for m in result.metrics if m.id == "grammar")
+    assert grammar.raw_score == 0 and grammar.details["timed_out"]
+    assert result.max_total == 90
+
+def test_async_deadline(monkeypatch):
+    slow_grammar(monkeypatch)
+    result = asyncio.run(evaluate_transcript_v2_async(TEXT, 30, deadline_ms=100))
+    assert result.timed_out == ["grammar"] and result.max_total == 90
+
+def test_generous_deadline_matches_unbounded():
+    clear_grammar_cache()
+    bounded = evaluate_transcript_v2(TEXT, 30, deadline_ms=30000)
+    unbounded = evaluate_transcript_v2(TEXT, 30)
+    assert bounded.timed_out == [] and bounded.total_score == unbounded.total_score
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from app.scoring.embedding_backends import load_backend, mean_pool
+from app.scoring.semantic import CONCEPT_ANCHORS, coverage_parity
+
+class HashBackend:
+    """Deterministic stand-in: a fixed random vector per text, optionally perturbed."""
+    def __init__(self, noise=0.0):
+        self.noise = noise
+
+    def encode(self, texts):
+        out = []
+        for t in texts:
+            rng = np.random.default_rng(sum(map(ord, t)))
+            v = rng.normal(size=32)
+            out.append(v + self.noise * np.random.default_rng(len(t)).normal(size=32))
+        return np.array(out, dtype=np.float32)
+
+def test_mean_pool_ignores_padding():
+    hidden = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]])
+    mask = np.array([[1, 1, 0]])
+    assert mean_pool(hidden, mask).tolist() == [[2.0, 2.0]]
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        load_backend("tensorflow", "any-model")
+
+def test_parity_identical_backends():
+    texts = ["Hello, I am Asha from class 7.", "I love chess. Thank you."]
+    report = coverage_parity(HashBackend(), HashBackend(), texts)
+    assert report["band_agreement"] == 1.0
+    assert report["max_similarity_delta"] == 0.0
+    assert report["mean_embedding_cosine"] == pytest.approx(1.0, abs=1e-4)
+
+def test_parity_detects_drift():
+    texts = ["Hello, I am Asha from class 7."] + CONCEPT_ANCHORS
+    report = coverage_parity(HashBackend(), HashBackend(noise=5.0), texts)
+    assert report["max_similarity_delta"] > 0.1
+    assert report["mean_embedding_cosine"] < 0.9
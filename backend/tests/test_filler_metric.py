@@ -4,4 +4,12 @@ def test_filler_words_metric():
     txt = "Um well I mean like you know I like coding."
     res = filler_words_metric(txt)
     assert "filler_count" in res
-    assert res["score"] in [15,12,9,6,3]
\ No newline at end of file
+    assert res["score"] in [15,12,9,6,3]
+
+def test_filler_counts_and_spans():
+    txt = "Um well I mean like you know I like coding."
+    res = filler_words_metric(txt)
+    # "like" after "I" is a verb, not a filler
+    assert res["filler_counts"] == {"um": 1, "well": 1, "i mean": 1, "like": 1, "you know": 1}
+    assert res["filler_count"] == 5
+    assert [txt[s["start"]:s["end"]] for s in res["filler_spans"]] == ["Um", "well", "I mean", "like", "you know"]
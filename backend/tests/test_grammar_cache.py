@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+from app.scoring.grammar import GrammarPool, check_sentences, clear_grammar_cache
+from app.scoring.metrics import grammar_sentences
+from app.scoring.analysis import TranscriptAnalysis
+
+class CountingTool:
+    """Flags every lowercase standalone 'i'; records each text it is asked to check."""
+    calls = []
+    def check(self, text):
+        CountingTool.calls.append(text)
+        return [SimpleNamespace(ruleId="I_LOWERCASE", rule_issue_type="typographical", offset=i, errorLength=1)
+                for i in range(len(text)) if text[i] == "i" and text[i - 1:i] in ("", " ") and text[i + 1:i + 2] == " "]
+
+def setup_function():
+    clear_grammar_cache()
+    CountingTool.calls = []
+
+def test_only_misses_are_checked_and_matches_map_back():
+    pool = GrammarPool(size=2, factory=CountingTool)
+    first = check_sentences(["Hello there.", "Then i left.", "Thank you."], pool, chunk_sentences=1)
+    assert [len(m) for m in first] == [0, 1, 0]
+    assert first[1][0].offset == len("Then ")
+    checked = len(CountingTool.calls)
+    again = check_sentences(["Hello  there.", "Then i left.", "Now i stay.", "Then i left."], pool)
+    assert [len(m) for m in again] == [0, 1, 1, 1]
+    assert CountingTool.calls[checked:] == ["Now i stay."]
+
+def test_chunked_offsets_split_per_sentence():
+    pool = GrammarPool(size=1, factory=CountingTool)
+    result = check_sentences(["i came.", "Then i went.", "All good."], pool, chunk_sentences=8)
+    assert len(CountingTool.calls) == 1
+    assert [[m.offset for m in ms] for ms in result] == [[0], [5], []]
+
+def test_grammar_sentences_keep_punctuation():
+    a = TranscriptAnalysis("Hello there!  My name is Asha. Thanks")
+    assert grammar_sentences(a) == ["Hello there!", "My name is Asha.", "Thanks"]
@@ -0,0 +1,47 @@
+import pytest
+from app.scoring.grammar import GrammarPool, GrammarUnavailable
+
+class FakeTool:
+    def __init__(self):
+        self.crash = False
+    def check(self, text):
+        if self.crash:
+            raise RuntimeError("server died")
+        return []
+
+def test_grammar_pool_reuses_and_restarts_instances():
+    created = []
+    def factory():
+        created.append(FakeTool())
+        return created[-1]
+    pool = GrammarPool(size=1, lease_timeout=0.1, factory=factory, restart_backoff=0)
+    assert pool.check("Hello there.") == []
+    assert pool.check("Hello again.") == []
+    assert len(created) == 1
+    created[0].crash = True
+    with pytest.raises(RuntimeError):
+        pool.check("Boom.")
+    assert pool.check("Recovered.") == []
+    assert len(created) == 2
+    assert pool.stats()["restarts"] == 1
+
+def test_grammar_pool_bounded_wait():
+    pool = GrammarPool(size=1, lease_timeout=0.05, factory=FakeTool)
+    with pool.lease():
+        with pytest.raises(GrammarUnavailable):
+            pool.check("No instance free.")
+        assert pool.stats()["in_use"] == 1
+
+def test_grammar_pool_closes_instances_leased_across_close():
+    closed = []
+    class ClosableTool(FakeTool):
+        def close(self):
+            closed.append(self)
+    pool = GrammarPool(size=2, lease_timeout=0.5, factory=ClosableTool)
+    with pool.lease() as leased:
+        pool.close()
+        assert len(closed) == 1  # the idle one
+    assert closed[-1] is leased and pool.stats()["alive"] == 0
+    pool.start()  # a restart gets a fresh, full queue instead of blocking
+    assert pool.check("Back again.") == [] and pool.stats()["idle"] == 2
+    pool.close()
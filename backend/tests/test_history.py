@@ -0,0 +1,72 @@
+import json
+from app.models import EvaluationResponse, ExtractedDetails
+from app.scoring.history import HistoryStore, stream_page, transcript_hash
+
+
+def response(score, name=None):
+    return EvaluationResponse(total_score=score, max_total=100, word_count=20, sentence_count=2,
+                              duration_seconds=None, wpm=None, metrics=[],
+                              extracted=ExtractedDetails(name=name, school_class="Class 8"),
+                              transcript_preview="")
+
+
+def page(store, **kwargs):
+    limit = kwargs.get("limit", 100)
+    return json.loads("".join(stream_page(store.query(**kwargs), limit, kwargs.get("full", False))))
+
+
+def test_batched_writes_and_filters(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.sqlite3"), batch_size=4, flush_ms=10)
+    for i in range(10):
+        store.record(response(i, name="Arjun" if i % 2 else "Priya"), f"transcript {i}")
+    store.record(response(50), "hello  world", student="s-1", school_class="7B")
+    store.flush()
+    assert store.stats()["written"] == 11 and store.stats()["batches"] >= 3
+
+    arjun = page(store, student="Arjun")
+    assert [r["total_score"] for r in arjun["items"]] == [9, 7, 5, 3, 1]  # newest first
+    assert page(store, school_class="7B")["items"][0]["student"] == "s-1"
+    by_hash = page(store, transcript_hash=transcript_hash("hello world"), full=True)
+    assert by_hash["count"] == 1 and by_hash["items"][0]["result"]["total_score"] == 50
+    assert store.get(by_hash["items"][0]["id"]) is not None
+    store.close()
+
+
+def test_keyset_pagination_covers_every_row_once(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.sqlite3"), batch_size=100, flush_ms=5)
+    for i in range(25):
+        store.record(response(i), f"t{i}")
+    store.flush()
+    seen, cursor = [], None
+    while True:
+        result = page(store, limit=10, cursor=cursor)
+        seen += [r["total_score"] for r in result["items"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(range(24, -1, -1))
+    store.close()
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.sqlite3"), queue_size=2)
+    store.start = lambda: None  # no writer: the queue fills up
+    assert [store.record(response(i), "t") for i in range(3)] == [True, True, False]
+    assert store.stats()["dropped"] == 1
+
+
+def test_older_files_gain_the_cached_column(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "h.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE evaluations (id INTEGER PRIMARY KEY, created REAL NOT NULL, student TEXT, "
+                 "class TEXT, transcript_hash TEXT NOT NULL, total_score REAL NOT NULL, max_total REAL NOT NULL, "
+                 "word_count INTEGER NOT NULL, version TEXT NOT NULL, result TEXT NOT NULL)")
+    conn.close()
+    store = HistoryStore(path, flush_ms=5)
+    store.record(response(1), "t")
+    store.record(response(2), "t", cached=True)
+    store.flush()
+    assert [r["cached"] for r in page(store)["items"]] == [1, 0]
+    assert [len(rows) for rows in store.scan()] == [1]  # cache hits are not rehydrated into analytics
+    store.close()
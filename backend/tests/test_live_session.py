@@ -0,0 +1,80 @@
+import asyncio
+from app.scoring.live import LIVE_MAX_OPEN_WORDS, LiveSession
+from app.scoring.pipeline_v2 import evaluate_transcript_v2
+
+TRANSCRIPT = ("Hello everyone, um, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+              "I love playing cricket and, you know, my dream is to become a data scientist. "
+              "A fun fact about me is that I collect old coins. Thank you.")
+
+def stream(text, size):
+    async def run():
+        session = LiveSession(semantic=False)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        for piece in pieces[:-1]:
+            await session.update(piece, 60)
+        return session, await session.update(pieces[-1], 60, final=True)
+    return asyncio.run(run())
+
+def test_live_matches_full_evaluation():
+    full = {m.id: m for m in evaluate_transcript_v2(TRANSCRIPT, 60).metrics}
+    for size in (1, 7, 40):
+        session, snap = stream(TRANSCRIPT, size)
+        assert snap["word_count"] == len(TRANSCRIPT.split())
+        for metric in snap["metrics"]:
+            if metric["id"] != "engagement":  # per-sentence approximation
+                assert metric["details"] == full[metric["id"]].details, (size, metric["id"])
+
+def test_only_completed_sentences_are_folded():
+    async def run():
+        session = LiveSession(semantic=False)
+        await session.update("Hello everyone, my name is Ar")
+        assert session.sentence_count == 0 and session.word_count == 0
+        snap = await session.update("jun. I like")
+        assert session.sentence_count == 1
+        assert snap["word_count"] == 8  # provisional open sentence counted
+        keywords = next(m for m in snap["metrics"] if m["id"] == "keywords")
+        assert "name" in keywords["details"]["must_found"]
+    asyncio.run(run())
+
+def test_unpunctuated_text_is_segmented():
+    words = ("so I was thinking um that we could go to the park and play cricket with my friends " * 30).split()
+    async def run():
+        session = LiveSession(semantic=False)
+        for word in words:
+            snap = await session.update(word + " ")
+            assert len(session.text[session._closed:].split()) <= LIVE_MAX_OPEN_WORDS
+        return session, snap
+    session, snap = asyncio.run(run())
+    assert session.sentence_count == len(words) // LIVE_MAX_OPEN_WORDS
+    assert snap["word_count"] == len(words)
+    clarity = next(m for m in snap["metrics"] if m["id"] == "clarity")
+    full = next(m for m in evaluate_transcript_v2(" ".join(words)).metrics if m.id == "clarity")
+    assert clarity["details"]["filler_count"] == full.details["filler_count"]
+
+def test_live_rejects_bad_duration():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app).websocket_connect("/api/v2/live") as ws:
+        for bad in ("soon", -3, True):
+            ws.send_json({"text": "Hello everyone.", "duration_seconds": bad})
+            assert ws.receive_json()["type"] == "error"
+        ws.send_json({"text": "Hello everyone.", "duration_seconds": 2})
+        assert ws.receive_json()["type"] == "update"
+
+
+def test_live_sessions_hold_an_admission_slot(monkeypatch):
+    import pytest
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+    from app import main
+    from app.scoring.executors import AdmissionLimiter
+    monkeypatch.setattr(main, "admission", AdmissionLimiter(limit=1))
+    client = TestClient(main.app)
+    with client.websocket_connect("/api/v2/live") as ws:
+        ws.send_json({"text": "Hello everyone.", "duration_seconds": 2})
+        assert ws.receive_json()["type"] == "update" and main.admission.stats()["in_flight"] == 1
+        with client.websocket_connect("/api/v2/live") as rejected:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                rejected.receive_json()
+            assert closed.value.code == 1013
+    assert main.admission.stats()["in_flight"] == 0
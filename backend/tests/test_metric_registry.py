@@ -0,0 +1,84 @@
+import pytest
+from app.scoring import metrics
+from app.scoring.analytics import CohortStore, countable
+from app.scoring.compact import get_schema, to_compact
+from app.scoring.pipeline_v2 import evaluate_batch_v2, evaluate_transcript_v2
+from app.scoring.registry import METRICS, InputSpec, MetricRegistry, MetricSpec, parse_metrics
+
+TEXT = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+        "Um, I love playing cricket and my dream is to become a data scientist. Thank you.")
+
+
+def forbid_heavy_engines(monkeypatch):
+    def fail(*args):
+        raise AssertionError("heavy engine used for a light-only selection")
+    monkeypatch.setattr(metrics, "get_grammar_pool", fail)
+    monkeypatch.setattr(metrics, "ensure_vader", fail)
+
+
+def test_subset_matches_full_evaluation(monkeypatch):
+    full = {m.id: m for m in evaluate_transcript_v2(TEXT, 40).metrics}
+    forbid_heavy_engines(monkeypatch)
+    result = evaluate_transcript_v2(TEXT, 40, metrics=parse_metrics("vocabulary, clarity"))
+    assert [m.id for m in result.metrics] == ["vocabulary", "clarity"]  # registry order
+    assert result.max_total == 25
+    assert result.total_score == full["vocabulary"].raw_score + full["clarity"].raw_score
+    assert set(result.timings) == {"analysis", "vocabulary", "clarity", "extraction", "total"}
+    assert result.performance_ms < 50
+
+
+def test_batch_subset_skips_bulk_sentiment(monkeypatch):
+    forbid_heavy_engines(monkeypatch)
+    monkeypatch.setattr("app.scoring.pipeline_v2.polarity_scores_many", metrics.ensure_vader)
+    results = evaluate_batch_v2([(TEXT, 40), (TEXT, None)], max_workers=2, metrics=("speech_rate",))
+    assert [r.wpm for r in results] == [51.0, None] and results[1].max_total == 10
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        parse_metrics("clarity,nope")
+    assert parse_metrics("") is None
+
+
+def test_plugin_registration_and_input_sharing():
+    registry = MetricRegistry()
+    registry.register_input(InputSpec("letters", "cpu", lambda a: len(a.text)))
+    first = registry.register(MetricSpec("a", "A", 5, ("letters",), lambda a, d, x: {"score": 1, "max": 5}))
+    second = registry.register(MetricSpec("b", "B", 5, ("letters", "tokens"), lambda a, d, x: {"score": 2, "max": 5}))
+    light = registry.register(MetricSpec("c", "C", 5, ("tokens",), lambda a, d, x: {"score": 3, "max": 5}))
+    assert [i.id for i in registry.inputs_for([first, second, light])] == ["letters"]  # computed once
+    assert [registry.cost(s) for s in (first, light)] == ["cpu", "light"]
+    with pytest.raises(ValueError, match="missing"):
+        registry.register(MetricSpec("d", "D", 5, ("missing",), lambda a, d, x: {}))
+
+
+def test_plugin_registered_after_import():
+    before = get_schema()["schema_version"]
+    METRICS.register(MetricSpec("length", "Length", 5, ("tokens",),
+                                lambda a, d, x: {"score": min(5, a.word_count // 10), "max": 5},
+                                feedback=lambda details: f"Length score {details['score']}."))
+    try:
+        result = evaluate_transcript_v2(TEXT, 40, metrics=("length", "clarity"))
+        assert [m.id for m in result.metrics] == ["clarity", "length"]
+        assert result.max_total == 20 and result.metrics[1].feedback == "Length score 3."
+        assert result.selected_metrics == ["clarity", "length"] and not countable(result)
+
+        full = evaluate_transcript_v2(TEXT, 40)
+        assert full.selected_metrics is None and countable(full)  # plugins never turn analytics off
+        schema = get_schema()
+        assert schema["schema_version"] != before and schema["metrics"][-1]["id"] == "length"
+        assert "mi" not in to_compact(full)
+        store = CohortStore()
+        store.add(full, school_class="8A")
+        assert store.cohort("8A")["metrics"]["length"]["mean"] == 3
+    finally:
+        METRICS.unregister("length")
+    assert get_schema()["schema_version"] == before
+
+
+def test_compact_subset_indexes():
+    result = evaluate_transcript_v2(TEXT, 40, metrics=("clarity", "vocabulary"))
+    out = to_compact(result)
+    assert [get_schema()["metrics"][i]["id"] for i in out["mi"]] == ["vocabulary", "clarity"]
+    assert "c" not in out  # no keywords metric, no concept bitmasks
+    assert "mi" not in to_compact(evaluate_transcript_v2(TEXT, 40))
@@ -0,0 +1,55 @@
+from benchmarks.languagetool_stub import StubLanguageTool
+from app.scoring.pipeline_v2 import evaluate_transcript_v2
+from app.scoring import metrics
+from app.scoring.grammar import GrammarPool
+from app.scoring.result_cache import MemoryResultCache, SQLiteResultCache, cache_key, cacheable
+
+TRANSCRIPT = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+              "I love playing cricket. Thank you.")
+
+def test_cache_key_ignores_whitespace_only_changes():
+    assert cache_key(TRANSCRIPT, 40, "2.1.1", False) == cache_key("  " + TRANSCRIPT.replace(" ", "  "), 40, "2.1.1", False)
+    assert cache_key(TRANSCRIPT, 40, "2.1.1", False) != cache_key(TRANSCRIPT, 41, "2.1.1", False)
+    assert cache_key(TRANSCRIPT, 40, "2.1.1", False) != cache_key(TRANSCRIPT, 40, "2.1.1", True)
+
+def test_results_scored_without_languagetool_are_not_cacheable(monkeypatch):
+    pool = GrammarPool(size=1, factory=lambda: StubLanguageTool(base_ms=0, per_100_words_ms=0))
+    monkeypatch.setattr(metrics, "get_grammar_pool", lambda: pool)
+    assert cacheable(evaluate_transcript_v2(TRANSCRIPT, 40))
+
+    def down():
+        raise RuntimeError("pool still warming up")
+    monkeypatch.setattr(metrics, "get_grammar_pool", down)
+    degraded = evaluate_transcript_v2(TRANSCRIPT, 40)
+    grammar = next(m for m in degraded.metrics if m.id == "grammar")
+    assert grammar.details["unavailable"] and not cacheable(degraded)
+
+def test_memory_cache_expires():
+    cache = MemoryResultCache(maxsize=4, ttl=-1)
+    cache.put("k", evaluate_transcript_v2(TRANSCRIPT, 40))
+    assert cache.get("k") is None
+    assert cache.stats()["misses"] == 1
+
+def test_memory_cache_hits_are_copies_and_ttl_none_never_expires():
+    cache = MemoryResultCache(maxsize=4, ttl=None)
+    cache.put("k", evaluate_transcript_v2(TRANSCRIPT, 40))
+    cache.get("k").metrics[0].details["score"] = -1
+    assert cache.get("k").metrics[0].details["score"] != -1
+
+def test_sqlite_hits_defer_access_writes(tmp_path):
+    cache = SQLiteResultCache(str(tmp_path / "cache.sqlite3"), maxsize=2, ttl=None)
+    result = evaluate_transcript_v2(TRANSCRIPT, 40)
+    cache.put("a", result)
+    cache.put("b", result)
+    assert cache.get("a") == result and cache.get("a") == result
+    assert not cache._conn.in_transaction  # hits wrote nothing
+    cache.put("c", result)  # flushes the hit on "a" first, so "b" is evicted
+    assert cache.get("b") is None and cache.get("a") == result
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    result = evaluate_transcript_v2(TRANSCRIPT, 40)
+    SQLiteResultCache(path, maxsize=4, ttl=60).put("k", result)
+    reopened = SQLiteResultCache(path, maxsize=4, ttl=60)
+    assert reopened.get("k") == result
+    assert reopened.stats()["hits"] == 1
@@ -0,0 +1,30 @@
+import json
+import os
+from app.scoring import rubric_loader
+from app.scoring.rubric_loader import RubricRegistry
+
+def _write(path, weight, mtime):
+    path.write_text(json.dumps({"criteria": [
+        {"id": "intro", "name": "Intro", "description": "States name.", "keywords": ["name"], "weight": weight}
+    ]}))
+    os.utime(path, (mtime, mtime))
+
+def test_registry_reloads_on_change_and_keeps_old_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "rubric.json"
+    monkeypatch.setattr(rubric_loader, "RUBRIC_JSON", path)
+    _write(path, 0.5, 1000)
+    registry = RubricRegistry(compile_fn=lambda rubric: rubric, interval=0)
+    first = registry.current()
+    assert first.rubric.criteria[0].weight == 0.5
+    assert registry.refresh() is False  # unchanged mtime: no re-read
+
+    _write(path, 0.7, 2000)
+    assert registry.refresh() is True
+    assert registry.current().rubric.criteria[0].weight == 0.7
+    assert first.rubric.criteria[0].weight == 0.5  # in-flight snapshot untouched
+
+    path.write_text("{not json")
+    os.utime(path, (3000, 3000))
+    assert registry.refresh() is False
+    assert registry.current().rubric.criteria[0].weight == 0.7
+    assert registry.stats()["last_error"]
@@ -0,0 +1,102 @@
+import json
+import pytest
+from scripts import score_bulk
+
+TEXT = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+        "I love playing cricket and my dream is to become a data scientist. Thank you.")
+
+
+def write_input(path, n):
+    with open(path, "w") as f:
+        for i in range(n):
+            record = {"id": f"t{i}", "transcript": TEXT if i != 3 else "too short"}
+            f.write(json.dumps(record) + "\n")
+
+
+def bulk(tmp_path, out, *extra):
+    return score_bulk.run(score_bulk.parse_args([
+        str(tmp_path / "in.jsonl"), str(out), "--mode", "rubric", "--workers", "0",
+        "--chunk-size", "2", "--checkpoint-seconds", "0", "--progress", "0", *extra]))
+
+
+def read_rows(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_scores_every_record_in_order(tmp_path):
+    write_input(tmp_path / "in.jsonl", 7)
+    state = bulk(tmp_path, tmp_path / "out.jsonl")
+    rows = read_rows(tmp_path / "out.jsonl")
+    assert [r["id"] for r in rows] == [f"t{i}" for i in range(7)]
+    assert rows[3]["error"].startswith("Transcript too short")
+    assert rows[0]["total_score"] == rows[1]["total_score"] > 0
+    assert state["records_done"] == 7 and state["errors"] == 1 and state["complete"]
+
+
+def test_resume_after_crash_matches_clean_run(tmp_path, monkeypatch):
+    write_input(tmp_path / "in.jsonl", 7)
+    bulk(tmp_path, tmp_path / "clean.jsonl")
+
+    real = score_bulk.score_chunk
+
+    def crash_at_4(start, records, fields):
+        if start == 4:
+            raise KeyboardInterrupt
+        return real(start, records, fields)
+
+    monkeypatch.setattr(score_bulk, "score_chunk", crash_at_4)
+    out = tmp_path / "out.jsonl"
+    with pytest.raises(KeyboardInterrupt):
+        bulk(tmp_path, out)
+    assert json.loads((tmp_path / "out.jsonl.checkpoint.json").read_text())["records_done"] == 4
+    with open(out, "a") as f:
+        f.write('{"index": 4, "partial')  # torn write after the checkpoint
+
+    monkeypatch.setattr(score_bulk, "score_chunk", real)
+    state = bulk(tmp_path, out, "--resume")
+    assert state["records_done"] == 7
+    assert read_rows(out) == read_rows(tmp_path / "clean.jsonl")
+
+
+def test_reads_csv(tmp_path):
+    path = tmp_path / "in.csv"
+    path.write_text('id,transcript,duration_seconds\na,"Hello, my name is Sam.",12\n')
+    assert list(score_bulk.read_records(path)) == [
+        {"id": "a", "transcript": "Hello, my name is Sam.", "duration_seconds": "12"}]
+
+
+def test_v2_process_pool(tmp_path):
+    write_input(tmp_path / "in.jsonl", 5)
+    state = score_bulk.run(score_bulk.parse_args([
+        str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), "--workers", "2",
+        "--chunk-size", "2", "--progress", "0"]))
+    rows = read_rows(tmp_path / "out.jsonl")
+    assert [r["index"] for r in rows] == list(range(5))
+    assert state["records_done"] == 5 and state["errors"] == 1
+    assert rows[0]["scores"] == rows[4]["scores"] and rows[0]["max_total"] == 100
+    assert rows[0]["result"]["metrics"]
+
+
+def test_parquet_resume_counts_buffered_errors_once(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    write_input(tmp_path / "in.jsonl", 7)
+    real = score_bulk.score_chunk
+
+    def crash_at_4(start, records, fields):
+        if start == 4:
+            raise KeyboardInterrupt
+        return real(start, records, fields)
+
+    monkeypatch.setattr(score_bulk, "score_chunk", crash_at_4)
+    out = tmp_path / "out"
+    with pytest.raises(KeyboardInterrupt):
+        bulk(tmp_path, out, "--format", "parquet", "--part-rows", "3")
+    # the error row (index 3) was written but still buffered, so it is not durable yet
+    saved = json.loads((tmp_path / "out.checkpoint.json").read_text())
+    assert saved["records_done"] == 3 and saved["errors"] == 0
+
+    monkeypatch.setattr(score_bulk, "score_chunk", real)
+    state = bulk(tmp_path, out, "--format", "parquet", "--part-rows", "3", "--resume")
+    assert state["records_done"] == 7 and state["errors"] == 1
+    ids = [i for part in sorted(out.glob("part-*.parquet")) for i in pq.read_table(part)["id"].to_pylist()]
+    assert ids == [f"t{i}" for i in range(7)]
@@ -0,0 +1,25 @@
+import numpy as np
+from app.scoring.semantic import CONCEPT_ANCHORS, transcript_chunks, _chunked_from_similarities
+
+def test_chunks_dedupe_and_window():
+    text = "Hello everyone. I love chess. I love chess. Thank you!"
+    assert transcript_chunks(text, window=1) == ["Hello everyone", "I love chess", "Thank you"]
+    assert transcript_chunks(text, window=2)[0] == "Hello everyone. I love chess"
+
+def test_chunks_capped_evenly():
+    text = ". ".join(f"Sentence number {i}" for i in range(100))
+    chunks = transcript_chunks(text, window=1, max_chunks=10)
+    assert len(chunks) == 10
+    assert chunks[0] == "Sentence number 0" and chunks[-1] == "Sentence number 99"
+
+def test_best_chunk_per_anchor():
+    chunks = ["Hello everyone", "My goal is to be a doctor"]
+    sims = np.full((2, len(CONCEPT_ANCHORS)), 0.3)
+    sims[0, 0] = 0.9
+    sims[1, 5] = 0.8
+    result = _chunked_from_similarities(chunks, sims)
+    assert result["individual_similarities"][0] == 0.9
+    assert result["individual_similarities"][5] == 0.8
+    assert result["matched_sentences"][0] == "Hello everyone"
+    assert result["matched_sentences"][5] == "My goal is to be a doctor"
+    assert result["chunks"] == 2 and result["mode"] == "chunked"
@@ -4,4 +4,10 @@ def test_sentiment_metric():
     txt = "I am excited and grateful for this opportunity. Thank you everyone."
     res = sentiment_metric(txt)
     assert "pos_probability" in res
-    assert res["score"] in [3,6,9,12,15]
\ No newline at end of file
+    assert res["score"] in [3,6,9,12,15]
+
+def test_vader_loaded_once_and_batch_scores():
+    from app.scoring.utils import ensure_vader, polarity_scores_many
+    assert ensure_vader() is ensure_vader()
+    texts = ["I am excited and grateful.", "This is terrible."]
+    assert polarity_scores_many(texts) == [ensure_vader().polarity_scores(t) for t in texts]
@@ -0,0 +1,34 @@
+from app.scoring.telemetry import Counter, Histogram, Registry, StageTimer, StatsGauges
+from app.scoring.pipeline_v2 import evaluate_transcript_v2
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("demo_seconds", "Demo.", (0.1, 1.0), ("stage",))
+    for v in (0.05, 0.5, 3.0):
+        h.observe(v, stage="grammar")
+    text = "\n".join(h.render())
+    assert 'demo_seconds_bucket{stage="grammar",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="grammar",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="grammar",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="grammar"} 3' in text
+
+def test_registry_counters_and_stats_gauges():
+    registry = Registry()
+    c = registry.register(Counter("demo_total", "Demo.", ("source",)))
+    c.inc(source="cache")
+    c.inc(source="cache")
+    registry.register(StatsGauges("demo_pool", "Pool", lambda: {"alive": 2, "name": "x", "ok": True}))
+    text = registry.render()
+    assert 'demo_total{source="cache"} 2' in text
+    assert "demo_pool_alive 2" in text
+    assert "demo_pool_name" not in text and "demo_pool_ok" not in text
+
+def test_stage_timer_and_pipeline_timings():
+    timer = StageTimer()
+    assert timer.run("double", lambda x: x * 2, 21) == 42
+    assert timer.timings["double"] >= 0
+    text = "Hello everyone, my name is Asha. I study in class 7 at Hill School. I like chess. Thank you."
+    result = evaluate_transcript_v2(text, 30)
+    for stage in ("analysis", "keywords", "grammar", "engagement", "extraction", "total"):
+        assert stage in result.timings
+    assert result.performance_ms == int(result.timings["total"])
+    assert "grammar_matches" not in result.timings  # engine time stays under the grammar stage
@@ -0,0 +1,22 @@
+from app.scoring.warmup import EngineWarmup
+
+def test_warmup_reports_per_engine_state():
+    def broken():
+        raise RuntimeError("no server")
+    warmup = EngineWarmup({"fast": lambda: {"ok": True}, "optional": broken, "required": lambda: None},
+                          required={"optional": False})
+    assert not warmup.ready
+    warmup.start()
+    assert warmup.wait(timeout=5)
+    report = warmup.report()
+    assert report["engines"]["fast"]["state"] == "ready"
+    assert report["engines"]["fast"]["load_ms"] is not None
+    assert report["engines"]["optional"]["state"] == "failed"
+    assert "no server" in report["engines"]["optional"]["error"]
+
+def test_warmup_not_ready_when_required_engine_fails():
+    def broken():
+        raise RuntimeError("lexicon missing")
+    warmup = EngineWarmup({"sentiment": broken})
+    warmup.run()
+    assert not warmup.ready
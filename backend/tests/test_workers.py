@@ -0,0 +1,41 @@
+from app.scoring.pipeline_v2 import evaluate_transcript_v2
+from app.scoring.workers import WorkerCrashed, WorkerPool
+
+def test_worker_pool_scores_in_subprocesses():
+    transcript = ("Hello everyone, my name is Arjun. I am 13 years old studying in class 8 at Riverdale School. "
+                  "I love playing cricket. Thank you.")
+    pool = WorkerPool(size=2)
+    try:
+        futures = [pool.submit(transcript, 40) for _ in range(4)]
+        results = [f.result(timeout=60) for f in futures]
+        assert pool.stats()["load"] == [0, 0]
+    finally:
+        pool.close()
+    expected = evaluate_transcript_v2(transcript, 40)
+    assert all(r.total_score == expected.total_score for r in results)
+    assert results[0].extracted.name == "Arjun"
+
+def test_crashed_worker_fails_its_jobs_and_restarts():
+    pool = WorkerPool(size=1)
+    try:
+        future = pool.submit("Hello everyone, my name is Asha. I study in class 7 at Hill School. Thank you.", 30)
+        pool._procs[0].kill()  # still preloading engines, so the job is in flight
+        try:
+            future.result(timeout=10)
+            assert False, "job on a killed worker resolved"
+        except WorkerCrashed:
+            pass
+        assert pool.stats()["restarts"] == 1 and pool.stats()["load"] == [0]
+    finally:
+        pool.close()
+
+def test_late_result_for_cancelled_job_keeps_collector_alive():
+    transcript = "Hello everyone, my name is Asha. I study in class 7 at Hill School. Thank you."
+    pool = WorkerPool(size=1)
+    try:
+        abandoned = pool.submit(transcript, 30)
+        assert abandoned.cancel()  # what asyncio.wait_for does on a timeout or disconnect
+        assert pool.submit(transcript, 30).result(timeout=60).total_score > 0
+        assert pool._collector.is_alive() and pool.stats()["load"] == [0]
+    finally:
+        pool.close()